@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class MicroBatcher:
+    """
+    Mengumpulkan request yang datang bersamaan menjadi satu batch.
+
+    Request pertama membuka window (`max_wait_ms`); semua request yang masuk
+    selama window itu, sampai `max_batch_size`, diproses dengan satu panggilan
+    `batch_fn` di worker thread. Selama batch berjalan, request baru mengantre
+    dan otomatis membentuk batch berikutnya.
+
+    `runner(fn, items)` menentukan di mana batch dieksekusi (misal
+    `ExecutionPool.run`); default-nya executor bawaan event loop.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 runner: Optional[Callable[..., Awaitable[List[Any]]]] = None):
+        self.batch_fn = batch_fn
+        self.runner = runner
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._arrived: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Batch yang sedang dikumpulkan/dieksekusi worker (sudah keluar dari queue)
+        self._inflight: list = []
+
+        self.batches_total = 0
+        self.items_total = 0
+        self.last_batch_size = 0
+        self.max_batch_size_seen = 0
+        self.errors_total = 0
+        self._wait_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        """Jalankan worker di event loop yang sedang aktif"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._arrived = asyncio.Event()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Request yang belum sempat diproses (mengantre atau batch yang sedang
+        # berjalan saat worker dibatalkan) tidak boleh menggantung
+        pending = self._inflight
+        self._inflight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """Masukkan satu item ke antrean dan tunggu hasilnya"""
+        if not self.running:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        self._arrived.set()
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        self._inflight = batch
+        deadline = time.perf_counter() + self.max_wait
+
+        while True:
+            # Ambil semua yang sudah mengantre tanpa menunggu
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            remaining = deadline - time.perf_counter()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                return batch
+
+            # Tunggu request berikutnya atau window habis. Menunggu Event (bukan
+            # queue.get) supaya item tidak hilang saat timeout bersamaan
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, items: List[Any]) -> List[Any]:
+        if self.runner is not None:
+            return await self.runner(self.batch_fn, items)
+        return await asyncio.get_running_loop().run_in_executor(None, self.batch_fn, items)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # Caller yang sudah disconnect tidak perlu diproses
+            batch = [entry for entry in batch if not entry[1].done()]
+            self._inflight = batch
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+
+            try:
+                results = list(await self._execute(items))
+                # zip() akan memotong diam-diam: caller tanpa hasil menggantung
+                # atau, jika urutan bergeser, menerima hasil milik caller lain
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results "
+                                       f"for {len(batch)} items")
+            except Exception as e:
+                self.errors_total += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._inflight = []
+                continue
+
+            for (_, future, enqueued), result in zip(batch, results):
+                self._wait_total += started - enqueued
+                if not future.done():
+                    future.set_result(result)
+            self._inflight = []
+
+            self.batches_total += 1
+            self.items_total += len(batch)
+            self.last_batch_size = len(batch)
+            self.max_batch_size_seen = max(self.max_batch_size_seen, len(batch))
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "errors_total": self.errors_total,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_batch_size_seen,
+            "avg_batch_size": round(self.items_total / self.batches_total, 2) if self.batches_total else 0.0,
+            "avg_queue_wait_ms": round(self._wait_total / self.items_total * 1000.0, 3) if self.items_total else 0.0,
+        }
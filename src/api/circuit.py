@@ -0,0 +1,74 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana untuk dependency eksternal (LLM).
+
+    closed    : semua panggilan diteruskan
+    open      : setelah `failure_threshold` kegagalan berturut-turut, panggilan
+                dilewati selama `reset_timeout` detik
+    half_open : setelah reset_timeout, satu panggilan percobaan diizinkan;
+                sukses menutup circuit, gagal membukanya lagi
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+        self.opened_total = 0
+        self.short_circuited_total = 0
+
+    def allow(self) -> bool:
+        """True jika panggilan boleh dilakukan sekarang"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+
+            if self.state == "half_open":
+                now = time.monotonic()
+                if not self._trial_in_flight or now - self._trial_started >= self.reset_timeout:
+                    self._trial_in_flight = True
+                    self._trial_started = now
+                    return True
+
+            self.short_circuited_total += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened_total += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_s": self.reset_timeout,
+            "opened_total": self.opened_total,
+            "short_circuited_total": self.short_circuited_total,
+        }
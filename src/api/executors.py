@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class PoolSaturated(Exception):
+    """Pool penuh: semua worker sibuk dan antrean sudah mencapai batas"""
+
+
+class ExecutionPool:
+    """
+    Pool eksekusi untuk kode blocking agar tidak berjalan di event loop.
+
+    `kind="thread"` cocok untuk I/O (panggilan LLM), `kind="process"` untuk
+    komputasi CPU. Jumlah task yang boleh menunggu dibatasi `max_queue`;
+    task di atas batas itu langsung ditolak dengan `PoolSaturated`.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: Optional[int] = None,
+                 max_queue: int = 64, initializer: Optional[Callable] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind}")
+
+        self.name = name
+        self.kind = kind
+        # Minimal 2 worker agar scoring persona dan pace bisa berjalan bersamaan
+        self.max_workers = max_workers or max(2, os.cpu_count() or 1)
+        self.max_queue = max(0, int(max_queue))
+        self.initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed_total = 0
+        self.failed_total = 0
+        self.rejected_total = 0
+        self._latency_total = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: aman meskipun proses induk sudah punya thread/event loop
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-pool",
+                    initializer=self.initializer
+                )
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Jalankan `fn` di pool dan tunggu hasilnya tanpa memblokir event loop"""
+
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected_total += 1
+                raise PoolSaturated(f"{self.name} pool saturated ({self.in_flight} tasks in flight)")
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+
+        # Dihitung selesai saat worker benar-benar selesai, bukan saat pemanggil
+        # berhenti menunggu (client disconnect tetap menempati worker)
+        future.add_done_callback(functools.partial(self._finished, started))
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, started: float, future: Future):
+        # Dipanggil dari thread worker/manajemen executor
+        with self._lock:
+            self.in_flight -= 1
+            self._latency_total += time.perf_counter() - started
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed_total += 1
+            else:
+                self.completed_total += 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        active = min(self.in_flight, self.max_workers)
+        finished = self.completed_total + self.failed_total
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": active,
+            "queued": self.in_flight - active,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": round(active / self.max_workers, 3),
+            "saturated": self.in_flight >= self.max_workers + self.max_queue,
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total,
+            "rejected_total": self.rejected_total,
+            "avg_latency_ms": round(self._latency_total / finished * 1000.0, 3) if finished else 0.0,
+        }
@@ -0,0 +1,219 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+
+# Package `features` ada di src/, satu level di atas src/api
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from features.schema import load_table
+
+
+class FeatureStore:
+    """
+    Tabel fitur per (developer_id, journey_id) dalam array NumPy kolumnar.
+
+    Baris diurutkan berdasarkan (developer_id, journey_id) sehingga lookup
+    cukup binary search (np.searchsorted). Fitur level user (agregasi semua
+    journey) dihitung sekali saat load dengan np.add.reduceat. ID disimpan
+    int32 dan fitur float32 (skema features.schema) agar setiap worker yang
+    memuat store memakai memori sekecil mungkin.
+    """
+
+    FEATURES = [
+        "avg_study_hour", "study_consistency_std", "completion_speed",
+        "avg_exam_score", "submission_fail_rate", "retry_count",
+        "completed_modules", "total_modules_viewed"
+    ]
+
+    # Kolom hitungan (int di schemas.PaceFeatures)
+    COUNT_FEATURES = ["completed_modules", "total_modules_viewed"]
+
+    def __init__(self, clustering_path: Optional[str] = None, pace_path: Optional[str] = None):
+        self.clustering_path = clustering_path or os.path.join(PROCESSED_DIR, "clustering_features.csv")
+        self.pace_path = pace_path or os.path.join(PROCESSED_DIR, "pace_features.csv")
+        self._lock = threading.Lock()
+        self._table = None
+        self.loaded_at = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._table is not None
+
+    def load(self) -> bool:
+        """Baca CSV fitur dan bangun index; tabel lama diganti secara atomik"""
+
+        if not os.path.exists(self.clustering_path) and not os.path.exists(self.pace_path):
+            print(f"[WARN] Feature files not found: {self.clustering_path}, {self.pace_path}")
+            return False
+
+        try:
+            table = self._build(self._read())
+        except Exception as e:
+            print(f"[ERROR] Failed to load feature store: {e}")
+            return False
+
+        with self._lock:
+            self._table = table
+            self.loaded_at = time.time()
+
+        print(f"[OK] Feature store loaded ({len(table['developer_id'])} rows, "
+              f"{len(table['users'])} users, "
+              f"{sum(a.nbytes for a in table.values()) / 1e6:.2f} MB)")
+        return True
+
+    def reload(self) -> bool:
+        return self.load()
+
+    def _read(self) -> pd.DataFrame:
+        keys = ["developer_id", "journey_id"]
+        frames = []
+        wanted = set(keys + self.FEATURES)
+        for table, path in (("clustering_features", self.clustering_path),
+                            ("pace_features", self.pace_path)):
+            if os.path.exists(path):
+                frames.append(load_table(table, path, usecols=lambda c: c in wanted))
+
+        # Kolom yang ada di kedua file diambil dari file pertama (clustering)
+        merged = frames[0]
+        for df in frames[1:]:
+            merged = merged.merge(df, on=keys, how="outer", suffixes=("", "_other"))
+            for col in self.FEATURES:
+                other = f"{col}_other"
+                if other in merged.columns:
+                    merged[col] = merged[col].fillna(merged[other])
+                    merged = merged.drop(columns=other)
+
+        for col in self.FEATURES:
+            if col not in merged.columns:
+                merged[col] = 0.0
+        return merged.drop_duplicates(subset=keys, keep="first")
+
+    def _build(self, df: pd.DataFrame) -> dict:
+        developer = df["developer_id"].to_numpy(dtype=np.int32)
+        journey = df["journey_id"].to_numpy(dtype=np.int32)
+        values = df[self.FEATURES].to_numpy(dtype=np.float32)
+        values = np.nan_to_num(values, nan=0.0)
+
+        order = np.lexsort((journey, developer))
+        developer, journey, values = developer[order], journey[order], values[order]
+
+        # Awal blok baris setiap user
+        users, starts, counts = np.unique(developer, return_index=True, return_counts=True)
+        # Dijumlahkan dalam float64 lalu disimpan float32
+        user_values = (np.add.reduceat(values.astype(np.float64), starts, axis=0)
+                       if len(values) else values[:0].astype(np.float64))
+        # Semua kolom dirata-rata per journey: model pace dan persona dilatih
+        # per journey, jumlah lintas puluhan journey (mis. 4254 modul selesai)
+        # berada di luar distribusi training. Hitungan modul dibulatkan agar
+        # tetap bilangan bulat seperti PaceFeatures
+        count_cols = [self.FEATURES.index(c) for c in self.COUNT_FEATURES]
+        user_values /= counts[:, None]
+        user_values[:, count_cols] = np.round(user_values[:, count_cols])
+        user_values = user_values.astype(np.float32)
+        starts = starts.astype(np.int32)
+        counts = counts.astype(np.int32)
+
+        return {
+            "developer_id": developer,
+            "journey_id": journey,
+            "values": values,
+            "users": users,
+            "user_starts": starts,
+            "user_counts": counts,
+            "user_values": user_values,
+        }
+
+    def _row(self, values: np.ndarray) -> Dict:
+        return {col: float(v) for col, v in zip(self.FEATURES, values)}
+
+    def get(self, developer_id: int, journey_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Fitur satu journey, atau agregasi semua journey user jika journey_id None.
+        Mengembalikan None jika tidak ditemukan.
+        """
+        table = self._table
+        if table is None:
+            return None
+
+        u = int(np.searchsorted(table["users"], developer_id))
+        if u >= len(table["users"]) or table["users"][u] != developer_id:
+            return None
+
+        start = int(table["user_starts"][u])
+        count = int(table["user_counts"][u])
+
+        if journey_id is None:
+            features = self._row(table["user_values"][u])
+            features["journeys"] = count
+            return features
+
+        journeys = table["journey_id"][start:start + count]
+        j = int(np.searchsorted(journeys, journey_id))
+        if j >= count or journeys[j] != journey_id:
+            return None
+
+        features = self._row(table["values"][start + j])
+        features["journeys"] = 1
+        return features
+
+    def get_journeys(self, developer_id: int) -> Dict[int, Dict]:
+        """Fitur per journey_id untuk satu user; dict kosong jika tidak ditemukan"""
+        table = self._table
+        if table is None:
+            return {}
+
+        u = int(np.searchsorted(table["users"], developer_id))
+        if u >= len(table["users"]) or table["users"][u] != developer_id:
+            return {}
+
+        start = int(table["user_starts"][u])
+        end = start + int(table["user_counts"][u])
+        return {
+            int(journey_id): self._row(values)
+            for journey_id, values in zip(table["journey_id"][start:end], table["values"][start:end])
+        }
+
+    def get_many(self, developer_ids: List[int]) -> List[Optional[Dict]]:
+        """Fitur level user untuk banyak user sekaligus (satu searchsorted)"""
+        table = self._table
+        if table is None:
+            return [None] * len(developer_ids)
+
+        ids = np.asarray(developer_ids, dtype=np.int64)
+        idx = np.searchsorted(table["users"], ids)
+        idx_clipped = np.minimum(idx, max(len(table["users"]) - 1, 0))
+        found = (idx < len(table["users"])) & (table["users"][idx_clipped] == ids)
+
+        results = []
+        for u, ok in zip(idx_clipped, found):
+            if not ok:
+                results.append(None)
+                continue
+            features = self._row(table["user_values"][u])
+            features["journeys"] = int(table["user_counts"][u])
+            results.append(features)
+        return results
+
+    def stats(self) -> dict:
+        table = self._table
+        return {
+            "loaded": table is not None,
+            "rows": len(table["developer_id"]) if table is not None else 0,
+            "users": len(table["users"]) if table is not None else 0,
+            "memory_bytes": sum(a.nbytes for a in table.values()) if table is not None else 0,
+            "loaded_at": self.loaded_at,
+        }
+
+
+# Singleton instance
+feature_store = FeatureStore()
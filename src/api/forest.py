@@ -0,0 +1,260 @@
+import numpy as np
+
+
+class CompiledForest:
+    """
+    Random forest sklearn yang dikompilasi sekali menjadi array NumPy kontigu.
+
+    Semua node dari semua tree digabung ke satu array (feature, threshold,
+    left, right, value). Leaf diberi self-loop (left = right = dirinya sendiri)
+    sehingga traversal cukup diulang max_depth kali untuk seluruh baris dan
+    seluruh tree sekaligus, tanpa dispatch Python per estimator.
+    """
+
+    # Batch diproses per potongan agar array sementara (baris x tree) tetap kecil
+    CHUNK_ROWS = 256
+
+    def __init__(self, feature, threshold, left, right, value, roots, depths,
+                 classes, n_features, float32_inputs: bool = True):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.intp)
+        self.right = np.ascontiguousarray(right, dtype=np.intp)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.depths = np.ascontiguousarray(depths, dtype=np.intp)
+        self.classes_ = np.asarray(classes)
+        self.n_features = int(n_features)
+        # True = fitur dibulatkan ke float32 dulu seperti tree sklearn; False =
+        # dibandingkan dalam float64 (model hasil kompilasi aturan, threshold eksak)
+        self.float32_inputs = bool(float32_inputs)
+
+        # children[2i] = kanan, children[2i + 1] = kiri, sehingga langkah traversal
+        # cukup children[2 * node + (x <= threshold)]
+        self.children = np.empty(2 * len(self.left), dtype=np.intp)
+        self.children[0::2] = self.right
+        self.children[1::2] = self.left
+
+        # Tree diurutkan dari yang paling dalam: pada iterasi ke-d hanya
+        # `_active[d]` kolom pertama yang belum pasti sampai di leaf
+        self._by_depth = np.argsort(-self.depths, kind="stable")
+        self._restore = np.argsort(self._by_depth)
+        depths_sorted = self.depths[self._by_depth]
+        self._active = [int((depths_sorted > d).sum()) for d in range(self.max_depth)]
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForest":
+        """Kompilasi RandomForestClassifier / DecisionTreeClassifier yang sudah di-fit"""
+
+        estimators = getattr(model, "estimators_", None) or [model]
+        n_classes = len(model.classes_)
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        depths = []
+        offset = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            feature = np.where(is_leaf, 0, tree.feature)
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            # sklearn >= 1.4 menyimpan fraksi; versi lama menyimpan jumlah sampel
+            # dan menormalisasi saat predict_proba
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            if not np.allclose(normalizer, 1.0):
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+
+            features.append(feature)
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            depths.append(tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            depths=depths,
+            classes=model.classes_,
+            n_features=model.n_features_in_
+        )
+
+    def to_dict(self) -> dict:
+        """Representasi JSON-able; kebalikan from_dict"""
+        return {
+            "feature": self.feature.tolist(),
+            "threshold": self.threshold.tolist(),
+            "left": self.left.tolist(),
+            "right": self.right.tolist(),
+            "value": self.value.tolist(),
+            "roots": self.roots.tolist(),
+            "depths": self.depths.tolist(),
+            "classes": self.classes_.tolist(),
+            "n_features": self.n_features,
+            "float32_inputs": self.float32_inputs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompiledForest":
+        return cls(**data)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def max_depth(self) -> int:
+        return int(self.depths.max()) if len(self.depths) else 0
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Index leaf (global) untuk setiap baris dan tree, shape (n_rows, n_trees)"""
+
+        # sklearn membandingkan fitur dalam float32 terhadap threshold float64
+        if self.float32_inputs:
+            X = np.asarray(X, dtype=np.float32).astype(np.float64).ravel()
+        else:
+            X = np.asarray(X, dtype=np.float64).ravel()
+        n_rows = len(X) // self.n_features
+        row_offset = (np.arange(n_rows) * self.n_features)[:, None]
+        nodes = np.repeat(self.roots[self._by_depth][None, :], n_rows, axis=0)
+
+        for n_active in self._active:
+            active = nodes[:, :n_active]
+            go_left = X[row_offset + self.feature[active]] <= self.threshold[active]
+            nodes[:, :n_active] = self.children[2 * active + go_left]
+
+        # Kembalikan ke urutan tree asli
+        return nodes[:, self._restore]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Rata-rata probabilitas leaf dari semua tree, shape (n_rows, n_classes)"""
+
+        X = np.atleast_2d(X)
+        proba = np.empty((len(X), self.value.shape[1]))
+
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            leaves = self.apply(X[start:start + self.CHUNK_ROWS])
+
+            # Reduksi di sumbu tree (bukan sumbu terakhir) dijumlahkan berurutan,
+            # sama seperti akumulasi per estimator di sklearn
+            proba[start:start + self.CHUNK_ROWS] = self.value[leaves].sum(axis=1)
+
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """c(n): rata-rata panjang path BST gagal, sama dengan sklearn.ensemble._iforest"""
+
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+    result[n_samples == 2] = 1.0
+    large = n_samples > 2
+    result[large] = (
+        2.0 * (np.log(n_samples[large] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[large] - 1.0) / n_samples[large]
+    )
+    return result
+
+
+class CompiledIsolationForest:
+    """
+    IsolationForest sklearn yang dievaluasi dengan traversal CompiledForest.
+
+    Nilai setiap leaf adalah panjang path-nya (kedalaman + c(n_samples)), jadi
+    rata-rata "probabilitas" CompiledForest sama dengan rata-rata panjang path
+    yang dipakai sklearn untuk menghitung anomaly score.
+    """
+
+    def __init__(self, forest: CompiledForest, max_samples: int, offset: float):
+        self.forest = forest
+        self.max_samples = int(max_samples)
+        self.offset_ = float(offset)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledIsolationForest":
+        subsample_features = model._max_features != model.n_features_in_
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        depths = []
+        offset = 0
+
+        for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Tree dilatih pada subset kolom: petakan kembali ke index fitur asli
+            feature = np.where(is_leaf, 0, tree.feature)
+            if subsample_features:
+                feature = np.asarray(estimator_features)[feature]
+
+            # Jumlah node pada path (root = 1), dihitung dari parent ke child
+            path_nodes = np.ones(n_nodes)
+            for node in range(n_nodes):
+                if not is_leaf[node]:
+                    path_nodes[tree.children_left[node]] = path_nodes[node] + 1
+                    path_nodes[tree.children_right[node]] = path_nodes[node] + 1
+            path_length = path_nodes + average_path_length(tree.n_node_samples) - 1.0
+
+            features.append(feature)
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(path_length[:, None])
+            roots.append(offset)
+            depths.append(tree.max_depth)
+            offset += n_nodes
+
+        forest = CompiledForest(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            depths=depths,
+            classes=np.array([0]),
+            n_features=model.n_features_in_
+        )
+        return cls(forest, model._max_samples, model.offset_)
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Sama dengan IsolationForest.score_samples (semakin kecil = semakin anomali)"""
+
+        X = np.atleast_2d(X)
+        depths = np.empty(len(X))
+        value = self.forest.value[:, 0]
+        for start in range(0, len(X), self.forest.CHUNK_ROWS):
+            leaves = self.forest.apply(X[start:start + self.forest.CHUNK_ROWS])
+            depths[start:start + self.forest.CHUNK_ROWS] = value[leaves].sum(axis=1)
+
+        # Urutan operasi sama dengan sklearn: total path / (n_trees * c(max_samples))
+        denominator = self.forest.n_trees * average_path_length(np.array([self.max_samples]))[0]
+        if denominator == 0:
+            return -np.ones(len(X))
+        return -(2.0 ** (-depths / denominator))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """1 = inlier, -1 = outlier"""
+        return np.where(self.decision_function(X) < 0, -1, 1)
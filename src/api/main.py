@@ -1,14 +1,62 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+from typing import Annotated
+import asyncio
+import json
+import os
+import time
 import uvicorn
 
 from schemas import (
-    PaceRequest, PaceResponse,
+    PaceFeatures, PaceRequest, PaceResponse,
+    PaceBatchRequest, PaceBatchResponse,
+    PersonaFeatures, PersonaRequest, PersonaResponse,
+    PersonaBatchRequest, PersonaBatchResponse,
     AdviceRequest, AdviceResponse,
+    InsightsQuery, InsightsResponse,
+    EventsRequest, EventsResponse, EventScore, IngestResponse,
     HealthResponse
 )
-from services import pace_service, advice_service
+from services import (
+    pace_service, persona_service, advice_service, AdviceStreamInterrupted,
+    init_scoring_worker, score_pace_batch, score_persona_batch, score_events
+)
+from batching import MicroBatcher
+from feature_store import feature_store, BASE_DIR
+from features import IncrementalFeatureStore, aggregate_features
+from executors import ExecutionPool, PoolSaturated
+
+PACE_BATCH_MAX = int(os.getenv("PACE_BATCH_MAX", "10000"))
+PERSONA_BATCH_MAX = int(os.getenv("PERSONA_BATCH_MAX", "10000"))
+EVENTS_MAX = int(os.getenv("EVENTS_MAX", "200000"))
+
+# Scoring pace (CPU) di pool sendiri; advice memakai client async di event loop
+scoring_pool = ExecutionPool(
+    "scoring",
+    kind=os.getenv("SCORING_POOL_KIND", "thread"),
+    max_workers=int(os.getenv("SCORING_POOL_SIZE", "0")) or None,
+    max_queue=int(os.getenv("SCORING_POOL_QUEUE", "256")),
+    initializer=init_scoring_worker,
+)
+
+# Fitur live dari event (POST /api/v1/features/events), di-snapshot berkala
+live_features = IncrementalFeatureStore(
+    snapshot_path=os.getenv("FEATURE_SNAPSHOT_PATH",
+                            os.path.join(BASE_DIR, "data", "cache", "live_features.json")),
+    history=feature_store.get,
+)
+FEATURE_SNAPSHOT_INTERVAL_S = float(os.getenv("FEATURE_SNAPSHOT_INTERVAL_S", "60"))
+snapshot_task = None
+
+# Request /pace/analyze yang datang bersamaan digabung menjadi satu batch
+pace_batcher = MicroBatcher(
+    score_pace_batch,
+    max_batch_size=int(os.getenv("PACE_MICROBATCH_MAX_SIZE", "64")),
+    max_wait_ms=float(os.getenv("PACE_MICROBATCH_WINDOW_MS", "2")),
+    runner=scoring_pool.run,
+)
 
 app = FastAPI(
     title="Learning Pace API",
@@ -30,18 +78,53 @@ app.add_middleware(
 async def startup():
     print("Starting Learning Pace API...")
     pace_service.load_model()
+    persona_service.load_model()
+    feature_store.load()
+    live_features.load_snapshot()
+    pace_batcher.start()
+    
+    global snapshot_task
+    snapshot_task = asyncio.create_task(_snapshot_loop())
     print("API ready at http://localhost:8000/docs")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    await asyncio.get_running_loop().run_in_executor(None, live_features.save_snapshot)
+    await pace_batcher.stop()
+    scoring_pool.shutdown()
+    await advice_service.close()
+    advice_service.cache.close()
+
+
+async def _snapshot_loop():
+    """Simpan state fitur live ke disk secara berkala (hanya jika berubah)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(FEATURE_SNAPSHOT_INTERVAL_S)
+        await loop.run_in_executor(None, live_features.save_snapshot)
+
+
 @app.get("/")
 async def root():
     return {
         "name": "Learning Pace API",
         "version": "2.0.0",
         "endpoints": {
+            "persona": "/api/v1/persona/predict",
+            "persona_batch": "/api/v1/persona/batch",
             "pace": "/api/v1/pace/analyze",
+            "pace_batch": "/api/v1/pace/batch",
             "advice": "/api/v1/advice/generate",
-            "health": "/health"
+            "advice_stream": "/api/v1/advice/stream",
+            "insights": "/api/v1/insights/{user_id}",
+            "health": "/health",
+            "metrics": "/metrics",
+            "features_reload": "/api/v1/features/reload",
+            "features_score": "/api/v1/features/score",
+            "features_events": "/api/v1/features/events"
         }
     }
 
@@ -55,6 +138,131 @@ async def health():
     )
 
 
+@app.get("/metrics")
+async def metrics():
+    """Statistik runtime: micro-batcher pace, saturasi pool dan cache advice"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "pace_batcher": pace_batcher.stats(),
+        "pools": {
+            "advice": advice_service.stats(),
+            "scoring": scoring_pool.stats()
+        },
+        "advice_cache": advice_service.cache.stats(),
+        "feature_store": feature_store.stats(),
+        "live_features": live_features.stats()
+    }
+
+
+def _stored_features(user_id: int, journey_id=None):
+    """
+    Fitur live (event yang sudah di-ingest) digabung dengan feature store CSV
+    per (developer_id, journey_id). Journey live sudah di-seed dari baris CSV-nya
+    (IncrementalFeatureStore.history), jadi aman menggantikan baris itu; agregat
+    user dihitung ulang dari keduanya, bukan salah satu saja.
+    """
+    if journey_id is not None:
+        return live_features.get(user_id, journey_id) or feature_store.get(user_id, journey_id)
+    
+    live = live_features.get_journeys(user_id)
+    if not live:
+        return feature_store.get(user_id)
+    return aggregate_features(list({**feature_store.get_journeys(user_id), **live}.values()))
+
+
+def _resolve_features(items: list, feature_model) -> list:
+    """
+    Fitur per item: dari request jika dikirim, selain itu dari fitur live
+    (event yang sudah di-ingest) lalu feature store CSV berdasarkan user_id
+    (dan journey_id). 404 jika ada user yang tidak dikenal.
+    """
+    fields = list(feature_model.model_fields)
+    features_list = []
+    missing = []
+    
+    for item in items:
+        if item.features is not None:
+            features_list.append(item.features.model_dump())
+            continue
+        stored = _stored_features(item.user_id, item.journey_id)
+        if stored is None:
+            missing.append(item.user_id)
+            continue
+        features_list.append({field: stored[field] for field in fields})
+    
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Features not found for user_id: {missing[:20]}"
+        )
+    return features_list
+
+
+def _persona_response(user_id: int, result: dict) -> PersonaResponse:
+    return PersonaResponse(
+        user_id=user_id,
+        persona_label=result["label"],
+        cluster_id=result["cluster_id"],
+        confidence=result["confidence"],
+        description=result["description"],
+        criteria=result["criteria"],
+        characteristics=result["characteristics"],
+        is_outlier=result["is_outlier"]
+    )
+
+
+@app.post("/api/v1/persona/predict", response_model=PersonaResponse)
+async def predict_persona(req: PersonaRequest):
+    """
+    Klasifikasi persona belajar berdasarkan 6 fitur:
+    avg_study_hour, study_consistency_std, completion_speed,
+    avg_exam_score, submission_fail_rate, retry_count.
+    
+    Output: The Consistent, The Deep Diver, The Night Owl, The Sprinter,
+    atau The Struggler, plus flag is_outlier dari outlier detector.
+    """
+    features_list = _resolve_features([req], PersonaFeatures)
+    
+    try:
+        results = await scoring_pool.run(score_persona_batch, features_list)
+        return _persona_response(req.user_id, results[0])
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/v1/persona/batch", response_model=PersonaBatchResponse)
+async def predict_persona_batch(req: PersonaBatchRequest):
+    """
+    Klasifikasi persona untuk banyak siswa sekaligus. Scaling, klasifikasi
+    dan deteksi outlier dijalankan satu kali untuk seluruh batch.
+    """
+    items = req.items + [PersonaRequest(user_id=user_id) for user_id in req.user_ids]
+    if len(items) > PERSONA_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maximum {PERSONA_BATCH_MAX} items per batch request"
+        )
+    
+    features_list = _resolve_features(items, PersonaFeatures)
+    
+    try:
+        results = await scoring_pool.run(score_persona_batch, features_list)
+        
+        return PersonaBatchResponse(
+            results=[
+                _persona_response(item.user_id, result)
+                for item, result in zip(items, results)
+            ],
+            total_processed=len(results)
+        )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/v1/pace/analyze", response_model=PaceResponse)
 async def analyze_pace(req: PaceRequest):
     """
@@ -67,16 +275,11 @@ async def analyze_pace(req: PaceRequest):
     
     Output: fast learner, consistent learner, atau reflective learner
     """
+    features = _resolve_features([req], PaceFeatures)[0]
+    
     try:
-        features = {
-            "completion_speed": req.features.completion_speed,
-            "study_consistency_std": req.features.study_consistency_std,
-            "avg_study_hour": req.features.avg_study_hour,
-            "completed_modules": req.features.completed_modules,
-            "total_modules_viewed": req.features.total_modules_viewed
-        }
-        
-        result = pace_service.predict(features)
+        # Digabung dengan request lain lalu diprediksi di pool scoring
+        result = await pace_batcher.submit(features)
         
         return PaceResponse(
             user_id=req.user_id,
@@ -84,10 +287,143 @@ async def analyze_pace(req: PaceRequest):
             confidence=result["confidence"],
             insight=result["insight"]
         )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/v1/pace/batch", response_model=PaceBatchResponse)
+async def analyze_pace_batch(req: PaceBatchRequest):
+    """
+    Analisis pace untuk banyak siswa sekaligus (misal satu cohort).
+    Semua baris di-scale dan diklasifikasi dalam satu panggilan model;
+    baris yang gagal diprediksi tetap memakai fallback rule-based.
+    """
+    items = req.items + [PaceRequest(user_id=user_id) for user_id in req.user_ids]
+    if len(items) > PACE_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maximum {PACE_BATCH_MAX} items per batch request"
+        )
+    
+    features_list = _resolve_features(items, PaceFeatures)
+    
+    try:
+        results = await scoring_pool.run(score_pace_batch, features_list)
+        
+        return PaceBatchResponse(
+            results=[
+                PaceResponse(
+                    user_id=item.user_id,
+                    pace_label=result["label"],
+                    confidence=result["confidence"],
+                    insight=result["insight"]
+                )
+                for item, result in zip(items, results)
+            ],
+            total_processed=len(results)
+        )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/v1/features/reload")
+async def reload_features():
+    """Muat ulang feature store dari CSV di data/processed tanpa restart"""
+    loaded = await asyncio.get_running_loop().run_in_executor(None, feature_store.reload)
+    if not loaded:
+        raise HTTPException(status_code=500, detail="Failed to reload feature store")
+    return feature_store.stats()
+
+
+@app.post("/api/v1/features/events", response_model=IngestResponse)
+async def ingest_events(req: EventsRequest):
+    """
+    Ingest event aktivitas baru ke feature store inkremental. Agregat per
+    (developer_id, journey_id) diperbarui per event, sehingga fitur untuk
+    persona/pace/insights langsung segar tanpa rebuild batch.
+    """
+    total_events = len(req.trackings) + len(req.submissions) + len(req.exams) + len(req.completions)
+    if total_events > EVENTS_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maximum {EVENTS_MAX} events per request"
+        )
+    
+    events = [
+        [event.model_dump() for event in group]
+        for group in (req.trackings, req.submissions, req.exams, req.completions)
+    ]
+    ingested = await asyncio.get_running_loop().run_in_executor(None, live_features.ingest, *events)
+    stats = live_features.stats()
+    return IngestResponse(ingested=ingested, users=stats["users"], journeys=stats["journeys"])
+
+
+@app.post("/api/v1/features/score", response_model=EventsResponse)
+async def score_from_events(req: EventsRequest):
+    """
+    Hitung 5 fitur pace dan 6 fitur persona dari event aktivitas mentah
+    (tracking, submission, exam, completion) lalu langsung skor keduanya.
+    Backend tidak perlu lagi menghitung fitur sendiri.
+    """
+    total_events = len(req.trackings) + len(req.submissions) + len(req.exams) + len(req.completions)
+    if total_events > EVENTS_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maximum {EVENTS_MAX} events per request"
+        )
+    
+    events = [
+        [event.model_dump() for event in group]
+        for group in (req.trackings, req.submissions, req.exams, req.completions)
+    ]
+    
+    try:
+        results = await scoring_pool.run(score_events, *events)
+        
+        return EventsResponse(
+            results=[
+                EventScore(
+                    user_id=result["user_id"],
+                    journey_id=result["journey_id"],
+                    pace_features=PaceFeatures(**result["pace_features"]),
+                    persona_features=PersonaFeatures(**result["persona_features"]),
+                    persona=_persona_response(result["user_id"], result["persona"]),
+                    learning_pace=PaceResponse(
+                        user_id=result["user_id"],
+                        pace_label=result["pace"]["label"],
+                        confidence=result["pace"]["confidence"],
+                        insight=result["pace"]["insight"]
+                    )
+                )
+                for result in results
+            ],
+            total_processed=len(results)
+        )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _advice_args(req: AdviceRequest) -> dict:
+    return {
+        "name": req.name,
+        "pace_label": req.pace_label,
+        "avg_score": req.avg_exam_score,
+        "completed_modules": req.completed_modules,
+        "total_modules": req.total_modules_viewed,
+        "completion_speed": req.completion_speed,
+        "consistency_std": req.study_consistency_std,
+        "total_courses": req.total_courses_enrolled,
+        "courses_completed": req.courses_completed,
+        "optimal_time": req.optimal_study_time,
+    }
+
+
 @app.post("/api/v1/advice/generate", response_model=AdviceResponse)
 async def generate_advice(req: AdviceRequest):
     """
@@ -95,18 +431,8 @@ async def generate_advice(req: AdviceRequest):
     Saran bersifat umum (tidak spesifik kelas tertentu) dan membangun.
     """
     try:
-        advice = advice_service.generate(
-            name=req.name,
-            pace_label=req.pace_label,
-            avg_score=req.avg_exam_score,
-            completed_modules=req.completed_modules,
-            total_modules=req.total_modules_viewed,
-            completion_speed=req.completion_speed,
-            consistency_std=req.study_consistency_std,
-            total_courses=req.total_courses_enrolled,
-            courses_completed=req.courses_completed,
-            optimal_time=req.optimal_study_time,
-        )
+        # Client async: banyak generate bisa berjalan bersamaan tanpa memblokir
+        advice = await advice_service.generate(**_advice_args(req))
         
         return AdviceResponse(
             user_id=req.user_id,
@@ -118,5 +444,165 @@ async def generate_advice(req: AdviceRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/advice/stream")
+async def stream_advice(req: AdviceRequest):
+    """
+    Versi streaming dari /advice/generate (Server-Sent Events).
+    Setiap event `data` berisi {"delta": "..."}; event terakhir `done`
+    berisi teks lengkap. Tanpa client LLM, fallback dikirim dalam satu event.
+    Jika LLM gagal di tengah stream, event terakhir adalah `error` berisi
+    detail dan `advice_text` fallback (delta sebelumnya harus dibuang).
+    """
+    
+    async def events():
+        parts = []
+        try:
+            async for delta in advice_service.stream(**_advice_args(req)):
+                parts.append(delta)
+                yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+        except AdviceStreamInterrupted as e:
+            error = {"detail": str(e), "advice_text": e.fallback, "pace_context": req.pace_label}
+            yield f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
+            return
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        
+        done = {
+            "user_id": req.user_id,
+            "name": req.name,
+            "advice_text": "".join(parts),
+            "pace_context": req.pace_label
+        }
+        yield f"event: done\ndata: {json.dumps(done, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Nilai default fitur /insights jika tidak ada di query maupun feature store
+INSIGHT_DEFAULTS = {
+    "avg_study_hour": 12.0,
+    "study_consistency_std": 2.0,
+    "completion_speed": 1.0,
+    "avg_exam_score": 75.0,
+    "submission_fail_rate": 0.0,
+    "retry_count": 0.0,
+    "completed_modules": 0,
+    "total_modules_viewed": 0,
+    "total_courses_enrolled": 0,
+}
+
+
+async def _cancel(*tasks):
+    """Batalkan task yang masih berjalan dan tunggu sampai benar-benar selesai"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _timed(awaitable):
+    """Jalankan awaitable dan kembalikan (hasil, durasi ms)"""
+    started = time.perf_counter()
+    result = await awaitable
+    return result, round((time.perf_counter() - started) * 1000.0, 3)
+
+
+@app.get("/api/v1/insights/{user_id}", response_model=InsightsResponse)
+async def get_insights(user_id: int, query: Annotated[InsightsQuery, Query()]):
+    """
+    Gabungan persona, pace dan advice dalam satu response.
+    Persona dan pace dihitung bersamaan; advice dimulai begitu label pace
+    diketahui (dengan deadline dan fallback advice). Total latency mengikuti
+    jalur terlama, bukan jumlah ketiganya.
+    """
+    started = time.perf_counter()
+    
+    # Prioritas nilai fitur: query parameter > feature store > default.
+    # User yang tidak dikenal hanya dilayani jika semua fitur model dikirim
+    stored = _stored_features(user_id, query.journey_id)
+    if stored is None:
+        missing = [
+            field for field in {**PersonaFeatures.model_fields, **PaceFeatures.model_fields}
+            if getattr(query, field) is None
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Features not found for user_id: {[user_id]} (missing query parameters: {missing})"
+            )
+        stored = {}
+    if "journeys" in stored:
+        stored["total_courses_enrolled"] = stored["journeys"]
+    values = {
+        field: getattr(query, field) if getattr(query, field) is not None else stored.get(field, default)
+        for field, default in INSIGHT_DEFAULTS.items()
+    }
+    
+    persona_features = {field: values[field] for field in PersonaFeatures.model_fields}
+    pace_features = {field: values[field] for field in PaceFeatures.model_fields}
+    
+    try:
+        persona_task = asyncio.ensure_future(
+            _timed(scoring_pool.run(score_persona_batch, [persona_features]))
+        )
+        
+        try:
+            pace, pace_ms = await _timed(pace_batcher.submit(pace_features))
+        except BaseException:
+            await _cancel(persona_task)
+            raise
+        
+        advice_task = asyncio.ensure_future(_timed(advice_service.generate(
+            name=query.user_name,
+            pace_label=pace["label"],
+            avg_score=values["avg_exam_score"],
+            completed_modules=int(values["completed_modules"]),
+            total_modules=int(values["total_modules_viewed"]),
+            completion_speed=values["completion_speed"],
+            consistency_std=values["study_consistency_std"],
+            total_courses=int(values["total_courses_enrolled"]),
+            courses_completed=query.courses_completed,
+            optimal_time=query.optimal_study_time,
+        )))
+        
+        try:
+            (personas, persona_ms), (advice, advice_ms) = await asyncio.gather(persona_task, advice_task)
+        except BaseException:
+            # gather tidak membatalkan task lain saat satu gagal
+            await _cancel(persona_task, advice_task)
+            raise
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return InsightsResponse(
+        user_id=user_id,
+        persona=_persona_response(user_id, personas[0]),
+        learning_pace=PaceResponse(
+            user_id=user_id,
+            pace_label=pace["label"],
+            confidence=pace["confidence"],
+            insight=pace["insight"]
+        ),
+        personalized_advice=AdviceResponse(
+            user_id=user_id,
+            name=query.user_name,
+            advice_text=advice,
+            pace_context=pace["label"]
+        ),
+        timings_ms={
+            "persona": persona_ms,
+            "pace": pace_ms,
+            "advice": advice_ms,
+            "total": round((time.perf_counter() - started) * 1000.0, 3)
+        }
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class PaceFeatures(BaseModel):
@@ -12,7 +13,9 @@ class PaceFeatures(BaseModel):
 
 class PaceRequest(BaseModel):
     user_id: int
-    features: PaceFeatures
+    journey_id: Optional[int] = None
+    # Kosong = ambil dari feature store berdasarkan user_id (dan journey_id)
+    features: Optional[PaceFeatures] = None
 
 
 class PaceResponse(BaseModel):
@@ -22,6 +25,53 @@ class PaceResponse(BaseModel):
     insight: str
 
 
+class PaceBatchRequest(BaseModel):
+    items: List[PaceRequest] = []
+    user_ids: List[int] = []
+
+
+class PaceBatchResponse(BaseModel):
+    results: List[PaceResponse]
+    total_processed: int
+
+
+class PersonaFeatures(BaseModel):
+    avg_study_hour: float
+    study_consistency_std: float
+    completion_speed: float
+    avg_exam_score: float
+    submission_fail_rate: float
+    retry_count: float
+
+
+class PersonaRequest(BaseModel):
+    user_id: int
+    journey_id: Optional[int] = None
+    # Kosong = ambil dari feature store berdasarkan user_id (dan journey_id)
+    features: Optional[PersonaFeatures] = None
+
+
+class PersonaResponse(BaseModel):
+    user_id: int
+    persona_label: str
+    cluster_id: int
+    confidence: float
+    description: str
+    criteria: str
+    characteristics: List[str]
+    is_outlier: bool
+
+
+class PersonaBatchRequest(BaseModel):
+    items: List[PersonaRequest] = []
+    user_ids: List[int] = []
+
+
+class PersonaBatchResponse(BaseModel):
+    results: List[PersonaResponse]
+    total_processed: int
+
+
 class AdviceRequest(BaseModel):
     user_id: int
     name: str
@@ -44,6 +94,92 @@ class AdviceResponse(BaseModel):
     pace_context: str
 
 
+class InsightsQuery(BaseModel):
+    """
+    Query parameter /api/v1/insights/{user_id}. Fitur yang tidak dikirim
+    diambil dari feature store, lalu dari nilai default; user yang tidak ada
+    di feature store harus mengirim semua fitur model
+    """
+    user_name: str = "Kamu"
+    journey_id: Optional[int] = None
+    avg_study_hour: Optional[float] = None
+    study_consistency_std: Optional[float] = None
+    completion_speed: Optional[float] = None
+    avg_exam_score: Optional[float] = None
+    submission_fail_rate: Optional[float] = None
+    retry_count: Optional[float] = None
+    completed_modules: Optional[int] = None
+    total_modules_viewed: Optional[int] = None
+    total_courses_enrolled: Optional[int] = None
+    courses_completed: int = 0
+    optimal_study_time: str = "Pagi"
+
+
+class InsightsResponse(BaseModel):
+    user_id: int
+    persona: PersonaResponse
+    learning_pace: PaceResponse
+    personalized_advice: AdviceResponse
+    timings_ms: Dict[str, float]
+
+
+class TrackingEvent(BaseModel):
+    developer_id: int
+    journey_id: int
+    tutorial_id: Optional[int] = None
+    last_viewed: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class SubmissionEvent(BaseModel):
+    developer_id: int
+    journey_id: int
+    status: Optional[str] = None
+
+
+class ExamEvent(BaseModel):
+    developer_id: int
+    journey_id: int
+    score: float
+    is_passed: Optional[bool] = None
+
+
+class CompletionEvent(BaseModel):
+    developer_id: int
+    journey_id: int
+    study_duration: Optional[float] = None
+    enrolling_times: int = 0
+    hours_to_study: Optional[float] = None
+
+
+class EventsRequest(BaseModel):
+    """Event aktivitas mentah satu atau banyak user"""
+    trackings: List[TrackingEvent] = []
+    submissions: List[SubmissionEvent] = []
+    exams: List[ExamEvent] = []
+    completions: List[CompletionEvent] = []
+
+
+class IngestResponse(BaseModel):
+    ingested: int
+    users: int
+    journeys: int
+
+
+class EventScore(BaseModel):
+    user_id: int
+    journey_id: int
+    pace_features: PaceFeatures
+    persona_features: PersonaFeatures
+    persona: PersonaResponse
+    learning_pace: PaceResponse
+
+
+class EventsResponse(BaseModel):
+    results: List[EventScore]
+    total_processed: int
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
@@ -1,15 +1,40 @@
 import os
+import sys
+import json
+import asyncio
+import threading
+import time
+import httpx
 import joblib
-import pandas as pd
-from typing import Dict, Optional
-from openai import OpenAI
+import numpy as np
+from typing import AsyncIterator, Dict, List, Optional
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from forest import CompiledForest, CompiledIsolationForest
+from cache import AdviceCache
+from circuit import CircuitBreaker
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 MODELS_DIR = os.path.join(BASE_DIR, "models")
 
+# Package `features` ada di src/, satu level di atas src/api
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from features import compute_features, PACE_FEATURES, PERSONA_FEATURES
+from features.labeling import pace_labels, persona_labels
+
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
+# "compiled" = evaluasi forest via array NumPy, "sklearn" = predict_proba bawaan
+PACE_INFERENCE_ENGINE = os.getenv("PACE_INFERENCE_ENGINE", "compiled")
+
+# Model pace: "forest" = pace_classifier.pkl, "rules" = model ringkas
+# models/pace_rules.json (python -m training.pace), fallback ke forest
+PACE_MODEL = os.getenv("PACE_MODEL", "forest")
+
 
 class PaceService:
     """Service untuk klasifikasi pace belajar siswa"""
@@ -26,6 +51,12 @@ class PaceService:
         "reflective learner": "Kamu belajar dengan mendalam dan reflektif. Bagus untuk pemahaman konsep!"
     }
     
+    RULE_CONFIDENCE = {
+        "fast learner": 0.80,
+        "consistent learner": 0.70,
+        "reflective learner": 0.75
+    }
+    
     def __init__(self):
         self.model = None
         self.scaler = None
@@ -34,9 +65,21 @@ class PaceService:
             "completion_speed", "study_consistency_std", "avg_study_hour",
             "completed_modules", "total_modules_viewed"
         ]
+        
+        # Disiapkan sekali saat load_model, dipakai ulang di setiap request
+        self._labels = None
+        self._forest = None
+        self._mean = None
+        self._scale = None
+        self._buffers = threading.local()
+        # Model hasil kompilasi aturan: proba one-hot, confidence pakai RULE_CONFIDENCE
+        self._rule_confidence = False
     
     def load_model(self):
         """Load model pace classifier"""
+        if PACE_MODEL == "rules" and self._load_rules():
+            return True
+        
         model_path = os.path.join(MODELS_DIR, "pace_classifier.pkl")
         
         if not os.path.exists(model_path):
@@ -52,42 +95,129 @@ class PaceService:
             if data.get("feature_columns"):
                 self.feature_cols = data["feature_columns"]
             
+            self._prepare_fast_path()
+            self._rule_confidence = False
+            
             print(f"[OK] Pace model loaded")
             return True
         except Exception as e:
             print(f"[ERROR] Failed to load model: {e}")
             return False
     
+    def _load_rules(self) -> bool:
+        """Load model ringkas (tree di fitur mentah, tanpa scaler dan sklearn)"""
+        rules_path = os.path.join(MODELS_DIR, "pace_rules.json")
+        
+        if not os.path.exists(rules_path):
+            print(f"[WARN] Rules model not found: {rules_path}, using pace_classifier.pkl")
+            return False
+        
+        try:
+            with open(rules_path) as f:
+                data = json.load(f)
+            self._forest = CompiledForest.from_dict(data["forest"])
+            self.model = self._forest
+            self.scaler = None
+            self.label_encoder = None
+            self.feature_cols = data["feature_columns"]
+            self._labels = np.array([str(label) for label in self._forest.classes_], dtype=object)
+            self._mean = None
+            self._scale = None
+            self._buffers = threading.local()
+            self._rule_confidence = data.get("source") == "rules"
+            
+            print(f"[OK] Pace rules loaded ({data.get('source', 'rules')}, {len(self._forest.left)} nodes)")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to load rules model: {e}")
+            return False
+    
+    def _prepare_fast_path(self):
+        """Hitung ulang label per kolom proba dan parameter scaler"""
+        
+        classes = getattr(self.model, "classes_", np.arange(len(self.LABELS)))
+        if self.label_encoder:
+            labels = self.label_encoder.inverse_transform(np.asarray(classes).astype(int))
+        else:
+            labels = [self.LABELS.get(int(c), "consistent learner") for c in classes]
+        self._labels = np.array([str(label) for label in labels], dtype=object)
+        
+        # Forest dikompilasi sekali, request tidak lagi memanggil sklearn
+        self._forest = None
+        if PACE_INFERENCE_ENGINE == "compiled" and hasattr(self.model, "classes_"):
+            if hasattr(self.model, "tree_") or hasattr(self.model, "estimators_"):
+                self._forest = CompiledForest.from_sklearn(self.model)
+        
+        # StandardScaler cukup dihitung (x - mean) / scale tanpa validasi sklearn
+        self._mean = None
+        self._scale = None
+        if self.scaler is not None and type(self.scaler).__name__ == "StandardScaler":
+            n = len(self.feature_cols)
+            mean = getattr(self.scaler, "mean_", None)
+            scale = getattr(self.scaler, "scale_", None)
+            self._mean = np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64)
+            self._scale = np.ones(n) if scale is None else np.asarray(scale, dtype=np.float64)
+        
+        self._buffers = threading.local()
+    
+    def _row_buffer(self) -> np.ndarray:
+        """Buffer 1 x n_features milik thread ini, dialokasikan sekali"""
+        
+        row = getattr(self._buffers, "row", None)
+        if row is None or row.shape[1] != len(self.feature_cols):
+            row = np.zeros((1, len(self.feature_cols)), dtype=np.float64)
+            self._buffers.row = row
+        return row
+    
+    def _transform(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scaling fitur; in-place ke `out` jika scaler adalah StandardScaler"""
+        
+        if self._mean is not None:
+            out = np.subtract(X, self._mean, out=out)
+            return np.divide(out, self._scale, out=out)
+        if self.scaler:
+            return self.scaler.transform(X)
+        return X
+    
+    def _predict_proba(self, X: np.ndarray) -> Optional[np.ndarray]:
+        """Probabilitas per kelas, None jika model tidak punya predict_proba"""
+        
+        if self._forest is not None:
+            return self._forest.predict_proba(X)
+        if hasattr(self.model, "predict_proba"):
+            return self.model.predict_proba(X)
+        return None
+    
     def predict(self, features: Dict) -> Dict:
         """Prediksi pace berdasarkan fitur"""
         
-        # Ekstrak nilai fitur
-        values = [features.get(col, 0) for col in self.feature_cols]
-        
         # Jika model tersedia, gunakan ML
         if self.model:
             try:
-                X = pd.DataFrame([values], columns=self.feature_cols)
+                # Ekstrak nilai fitur ke buffer yang sudah dialokasikan
+                row = self._row_buffer()
+                for j, col in enumerate(self.feature_cols):
+                    row[0, j] = features.get(col, 0)
                 
-                if self.scaler:
-                    X_scaled = self.scaler.transform(X)
-                else:
-                    X_scaled = X.values
+                if not np.isfinite(row).all():
+                    return self._rule_based(features)
                 
-                pred = int(self.model.predict(X_scaled)[0])
+                X_scaled = self._transform(row, out=row)
                 
-                # Ambil confidence dari probability
-                if hasattr(self.model, "predict_proba"):
-                    proba = self.model.predict_proba(X_scaled)[0]
-                    conf = float(proba[pred])
+                # Satu kali predict_proba: label = argmax, confidence = proba label
+                proba = self._predict_proba(X_scaled)
+                if proba is not None:
+                    proba = proba[0]
+                    idx = int(proba.argmax())
+                    conf = float(proba[idx])
                 else:
+                    pred = self.model.predict(X_scaled)[0]
+                    idx = int(np.flatnonzero(self.model.classes_ == pred)[0])
                     conf = 0.85
                 
-                # Ambil label
-                if self.label_encoder:
-                    label = self.label_encoder.inverse_transform([pred])[0]
-                else:
-                    label = self.LABELS.get(pred, "consistent learner")
+                label = self._labels[idx]
+                if self._rule_confidence:
+                    conf = self.RULE_CONFIDENCE.get(label, conf)
                 
                 return {
                     "label": label,
@@ -98,23 +228,303 @@ class PaceService:
                 print(f"[ERROR] Prediction failed: {e}")
         
         # Fallback: rule-based
-        speed = features.get("completion_speed", 1.0)
-        
-        if speed < 0.55:
-            label = "fast learner"
-            conf = 0.80
-        elif speed > 1.5:
-            label = "reflective learner"
-            conf = 0.75
+        return self._rule_based(features)
+    
+    def predict_batch(self, features_list: List[Dict]) -> List[Dict]:
+        """Prediksi pace untuk banyak siswa dengan satu kali panggilan model"""
+        
+        if not features_list:
+            return []
+        
+        X = np.array(
+            [[features.get(col, 0) for col in self.feature_cols] for features in features_list],
+            dtype=np.float64
+        )
+        
+        # Baris dengan nilai tidak valid (NaN/inf) langsung pakai rule-based
+        valid = np.isfinite(X).all(axis=1)
+        results = [None] * len(features_list)
+        
+        if self.model and valid.any():
+            try:
+                X_valid = X[valid]
+                X_scaled = self._transform(X_valid, out=X_valid)
+                
+                proba = self._predict_proba(X_scaled)
+                if proba is not None:
+                    idx = proba.argmax(axis=1)
+                    confs = proba[np.arange(len(idx)), idx]
+                else:
+                    preds = self.model.predict(X_scaled)
+                    idx = np.searchsorted(self.model.classes_, preds)
+                    confs = np.full(len(preds), 0.85)
+                
+                labels = self._labels[idx]
+                if self._rule_confidence:
+                    confs = [self.RULE_CONFIDENCE.get(label, conf) for label, conf in zip(labels, confs)]
+                
+                for i, label, conf in zip(np.flatnonzero(valid), labels, confs):
+                    results[i] = {
+                        "label": label,
+                        "confidence": round(float(conf), 3),
+                        "insight": self.INSIGHTS.get(label, "")
+                    }
+            except Exception as e:
+                print(f"[ERROR] Batch prediction failed: {e}")
+        
+        # Fallback: rule-based untuk semua baris yang belum terisi sekaligus
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fallback = self._rule_based_batch([features_list[i] for i in missing])
+            for i, result in zip(missing, fallback):
+                results[i] = result
+        
+        return results
+    
+    def _rule_based(self, features: Dict) -> Dict:
+        """Klasifikasi pace berdasarkan threshold completion_speed"""
+        return self._rule_based_batch([features])[0]
+    
+    def _rule_based_batch(self, features_list: List[Dict]) -> List[Dict]:
+        """Aturan yang sama dengan pelabelan data training (features.labeling)"""
+        
+        labels = pace_labels([features.get("completion_speed", 1.0) for features in features_list])
+        return [
+            {
+                "label": label,
+                "confidence": self.RULE_CONFIDENCE[label],
+                "insight": self.INSIGHTS.get(label, "")
+            }
+            for label in labels
+        ]
+
+
+class PersonaService:
+    """Service untuk klasifikasi persona belajar siswa (6 fitur)"""
+    
+    PERSONAS = {
+        "The Consistent": {
+            "description": "Steady Learner - Belajar dengan ritme yang stabil",
+            "criteria": "study_consistency_std rendah",
+            "characteristics": [
+                "Jadwal belajar teratur dari hari ke hari",
+                "Progress stabil tanpa lonjakan besar",
+                "Nilai ujian cukup baik dan konsisten"
+            ]
+        },
+        "The Deep Diver": {
+            "description": "Slow but Thorough - Lambat tapi mendalam",
+            "criteria": "completion_speed > 2.0 AND avg_exam_score >= 70",
+            "characteristics": [
+                "Menghabiskan waktu lebih lama di setiap modul",
+                "Pemahaman materi mendalam",
+                "Nilai ujian tinggi"
+            ]
+        },
+        "The Night Owl": {
+            "description": "Night-time Learner - Aktif belajar di malam hari",
+            "criteria": "avg_study_hour >= 19",
+            "characteristics": [
+                "Mayoritas aktivitas belajar di jam 19:00 - 24:00",
+                "Konsistensi belajar cukup baik",
+                "Produktif di waktu malam"
+            ]
+        },
+        "The Sprinter": {
+            "description": "Fast Learner - Cepat menyelesaikan materi",
+            "criteria": "completion_speed < 0.5 AND avg_exam_score >= 75",
+            "characteristics": [
+                "Menyelesaikan modul jauh lebih cepat dari estimasi",
+                "Tetap mempertahankan nilai ujian tinggi",
+                "Siap untuk materi yang lebih menantang"
+            ]
+        },
+        "The Struggler": {
+            "description": "Need Support - Butuh pendampingan ekstra",
+            "criteria": "avg_exam_score < 60 AND submission_fail_rate > 0.3",
+            "characteristics": [
+                "Nilai ujian masih di bawah rata-rata",
+                "Sering gagal pada submission",
+                "Butuh review materi dasar dan bimbingan"
+            ]
+        }
+    }
+    
+    def __init__(self):
+        self.model = None
+        self.scaler = None
+        self.label_encoder = None
+        self.outlier_detector = None
+        self.feature_cols = [
+            "avg_study_hour", "study_consistency_std", "completion_speed",
+            "avg_exam_score", "submission_fail_rate", "retry_count"
+        ]
+        
+        # Disiapkan sekali saat load_model, dipakai ulang di setiap request
+        self._labels = None
+        self._forest = None
+        self._outliers = None
+        self._mean = None
+        self._scale = None
+    
+    def load_model(self):
+        """Load persona classifier dan outlier detector dari model clustering"""
+        model_path = os.path.join(MODELS_DIR, "persona_classifier.pkl")
+        clustering_path = os.path.join(MODELS_DIR, "clustering_model_production.pkl")
+        
+        if not os.path.exists(model_path):
+            print(f"[WARN] Model not found: {model_path}")
+            return False
+        
+        try:
+            data = joblib.load(model_path)
+            self.model = data.get("model")
+            self.scaler = data.get("scaler")
+            self.label_encoder = data.get("label_encoder")
+            
+            if data.get("feature_columns"):
+                self.feature_cols = data["feature_columns"]
+            
+            if os.path.exists(clustering_path):
+                clustering = joblib.load(clustering_path)
+                self.outlier_detector = clustering.get("outlier_detector")
+            else:
+                print(f"[WARN] Outlier detector not found: {clustering_path}")
+            
+            self._prepare_fast_path()
+            
+            print(f"[OK] Persona model loaded")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to load persona model: {e}")
+            return False
+    
+    def _prepare_fast_path(self):
+        """Label per kolom proba, forest terkompilasi dan parameter scaler"""
+        
+        classes = self.model.classes_
+        if self.label_encoder:
+            labels = self.label_encoder.inverse_transform(np.asarray(classes).astype(int))
         else:
-            label = "consistent learner"
-            conf = 0.70
+            labels = [str(c) for c in classes]
+        self._labels = np.array([str(label) for label in labels], dtype=object)
+        
+        self._forest = None
+        self._outliers = None
+        if PACE_INFERENCE_ENGINE == "compiled":
+            if hasattr(self.model, "tree_") or hasattr(self.model, "estimators_"):
+                self._forest = CompiledForest.from_sklearn(self.model)
+            if type(self.outlier_detector).__name__ == "IsolationForest":
+                self._outliers = CompiledIsolationForest.from_sklearn(self.outlier_detector)
         
+        self._mean = None
+        self._scale = None
+        if type(self.scaler).__name__ == "StandardScaler":
+            self._mean = np.asarray(self.scaler.mean_, dtype=np.float64)
+            self._scale = np.asarray(self.scaler.scale_, dtype=np.float64)
+    
+    def _transform(self, X: np.ndarray) -> np.ndarray:
+        if self._mean is not None:
+            return (X - self._mean) / self._scale
+        if self.scaler:
+            return self.scaler.transform(X)
+        return X
+    
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if self._forest is not None:
+            return self._forest.predict_proba(X)
+        return self.model.predict_proba(X)
+    
+    def _is_outlier(self, X: np.ndarray) -> np.ndarray:
+        """Outlier detector di-fit pada fitur mentah (belum di-scale)"""
+        
+        if self._outliers is not None:
+            return self._outliers.predict(X) == -1
+        if self.outlier_detector is not None:
+            return self.outlier_detector.predict(X) == -1
+        return np.zeros(len(X), dtype=bool)
+    
+    def predict(self, features: Dict) -> Dict:
+        """Prediksi persona untuk satu siswa"""
+        return self.predict_batch([features])[0]
+    
+    def predict_batch(self, features_list: List[Dict]) -> List[Dict]:
+        """Scaling, klasifikasi dan deteksi outlier untuk seluruh batch sekaligus"""
+        
+        if not features_list:
+            return []
+        
+        X = np.array(
+            [[features.get(col, 0) for col in self.feature_cols] for features in features_list],
+            dtype=np.float64
+        )
+        
+        valid = np.isfinite(X).all(axis=1)
+        results = [None] * len(features_list)
+        
+        if self.model and valid.any():
+            try:
+                X_valid = X[valid]
+                proba = self._predict_proba(self._transform(X_valid))
+                outliers = self._is_outlier(X_valid)
+                
+                idx = proba.argmax(axis=1)
+                confs = proba[np.arange(len(idx)), idx]
+                labels = self._labels[idx]
+                
+                for i, label, class_id, conf, outlier in zip(
+                    np.flatnonzero(valid), labels, idx, confs, outliers
+                ):
+                    results[i] = self._result(label, int(class_id), float(conf), bool(outlier))
+            except Exception as e:
+                print(f"[ERROR] Persona prediction failed: {e}")
+        
+        # Fallback: rule-based untuk semua baris yang belum terisi sekaligus
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fallback = self._rule_based_batch([features_list[i] for i in missing])
+            for i, result in zip(missing, fallback):
+                results[i] = result
+        
+        return results
+    
+    def _result(self, label: str, class_id: int, conf: float, outlier: bool) -> Dict:
+        info = self.PERSONAS.get(label, {})
         return {
             "label": label,
-            "confidence": conf,
-            "insight": self.INSIGHTS.get(label, "")
+            "cluster_id": class_id,
+            "confidence": round(conf, 3),
+            "description": info.get("description", ""),
+            "criteria": info.get("criteria", ""),
+            "characteristics": info.get("characteristics", []),
+            "is_outlier": outlier
         }
+    
+    def _rule_based(self, features: Dict) -> Dict:
+        """Kriteria bisnis yang dipakai untuk melabeli data training"""
+        return self._rule_based_batch([features])[0]
+    
+    def _rule_based_batch(self, features_list: List[Dict]) -> List[Dict]:
+        """Aturan features.labeling untuk banyak baris sekaligus"""
+        
+        labels = persona_labels(
+            [features.get("avg_study_hour", 12.0) for features in features_list],
+            [features.get("completion_speed", 1.0) for features in features_list],
+            [features.get("avg_exam_score", 75.0) for features in features_list],
+            [features.get("submission_fail_rate", 0.0) for features in features_list],
+        )
+        # cluster_id tetap berarti kelas model (kolom proba) apa pun jalur yang
+        # menjawab; -1 jika model tidak dimuat atau label tidak dikenal model
+        class_ids = {} if self._labels is None else {label: i for i, label in enumerate(self._labels)}
+        return [self._result(label, class_ids.get(label, -1), 0.70, False) for label in labels]
+
+
+class AdviceStreamInterrupted(RuntimeError):
+    """Stream LLM gagal setelah sebagian teks terkirim; membawa saran fallback"""
+    
+    def __init__(self, detail: str, fallback: str):
+        super().__init__(detail)
+        self.fallback = fallback
 
 
 class AdviceService:
@@ -126,41 +536,452 @@ class AdviceService:
         "reflective learner": "mendalam dan reflektif dalam memahami materi"
     }
     
-    def __init__(self):
-        api_key = os.getenv("OPENROUTER_API_KEY", "")
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key
-        ) if api_key else None
-    
-    def generate(self, name: str, pace_label: str, avg_score: float = 75.0,
-                 completed_modules: int = 0, total_modules: int = 0,
-                 completion_speed: float = 1.0, consistency_std: float = 2.0,
-                 total_courses: int = 0, courses_completed: int = 0,
-                 optimal_time: str = "Pagi") -> str:
+    # Band (batas bawah, deskripsi) untuk prompt yang di-cache: prompt hanya
+    # memuat deskripsi band, bukan angka, agar advice tidak mengutip nilai
+    # yang bukan milik siswa
+    SCORE_BANDS = [(85, "85+"), (70, "70-84"), (50, "50-69"), (float("-inf"), "di bawah 50")]
+    PROGRESS_BANDS = [(70, "70-100%"), (40, "40-69%"), (0, "di bawah 40%")]
+    
+    # Advice di-cache dengan placeholder ini, lalu diganti nama siswa
+    NAME_PLACEHOLDER = "[NAMA]"
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 cache: Optional[AdviceCache] = None, deadline_ms: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_waiting: Optional[int] = None):
+        self.api_key = api_key if api_key is not None else os.getenv("OPENROUTER_API_KEY", "")
+        self.base_url = base_url or os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        self.model_name = os.getenv("ADVICE_MODEL", "mistralai/devstral-2512:free")
+        self.max_concurrency = max_concurrency or int(os.getenv("ADVICE_MAX_CONCURRENCY", "200"))
+        # Batas panggilan LLM yang menunggu slot semaphore; di atas itu langsung
+        # fallback (0 = tanpa batas)
+        if max_waiting is None:
+            max_waiting = int(os.getenv("ADVICE_MAX_WAITING", "200"))
+        self.max_waiting = max(0, max_waiting)
+        self.timeout = timeout or float(os.getenv("ADVICE_TIMEOUT_S", "30"))
+        self.max_connections = int(os.getenv("ADVICE_MAX_CONNECTIONS", "100"))
+        self.keepalive_connections = int(os.getenv("ADVICE_KEEPALIVE_CONNECTIONS", "20"))
+        
+        self.cache = cache if cache is not None else AdviceCache(
+            max_entries=int(os.getenv("ADVICE_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("ADVICE_CACHE_TTL_S", "86400")),
+            db_path=os.getenv("ADVICE_CACHE_DB") or None
+        )
+        
+        # Batas waktu per request; 0 = tunggu LLM sampai selesai/timeout client
+        if deadline_ms is None:
+            deadline_ms = float(os.getenv("ADVICE_DEADLINE_MS", "800"))
+        self.deadline = deadline_ms / 1000.0 if deadline_ms > 0 else None
+        self.breaker = breaker if breaker is not None else CircuitBreaker(
+            failure_threshold=int(os.getenv("ADVICE_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("ADVICE_BREAKER_RESET_S", "30"))
+        )
+        self._background = set()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # Client async + semaphore dibuat di event loop yang memakainya
+        self.client = None
+        self._http = None
+        self._semaphore = None
+        
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.completed_total = 0
+        self.failed_total = 0
+        self._latency_total = 0.0
+        self.deadline_exceeded_total = 0
+        self.fallback_total = 0
+        self.rejected_total = 0
+        self.admitted = 0
+        self.cache_fills_total = 0
+        self.streams_total = 0
+        self.leader_total = 0
+        self.coalesced_total = 0
+        self.last_ttft_ms = 0.0
+        self._ttft_total = 0.0
+        self._ttft_count = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+    
+    def _ensure_client(self):
+        """Satu AsyncOpenAI + pool koneksi httpx dipakai bersama semua request"""
+        
+        if self.client is not None:
+            return
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.keepalive_connections,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=5.0)
+        )
+        self.client = AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=self._http,
+            timeout=httpx.Timeout(self.timeout, connect=5.0),
+            max_retries=0
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def close(self):
+        # Background fill yang masih berjalan dibatalkan sebelum client ditutup
+        pending = list(self._background)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        if self.client is not None:
+            await self.client.close()
+        self.client = None
+        self._http = None
+        self._semaphore = None
+    
+    async def generate(self, name: str, pace_label: str, avg_score: float = 75.0,
+                       completed_modules: int = 0, total_modules: int = 0,
+                       completion_speed: float = 1.0, consistency_std: float = 2.0,
+                       total_courses: int = 0, courses_completed: int = 0,
+                       optimal_time: str = "Pagi") -> str:
         """Generate saran personal untuk keseluruhan perjalanan belajar"""
         
         progress = (completed_modules / total_modules * 100) if total_modules > 0 else 0
         
-        if not self.client:
+        if not self.enabled:
             return self._fallback_advice(name, pace_label, avg_score, progress, optimal_time)
         
+        profile = self._bucket_profile(
+            pace_label, avg_score, progress, consistency_std,
+            total_courses, courses_completed, optimal_time
+        )
+        key = self._cache_key(profile)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._personalize(cached, name)
+        
+        prompt = self._build_prompt(self.NAME_PLACEHOLDER, **profile)
+        
+        # Single-flight: prompt identik yang sedang diproses cukup ditunggu
+        task = self._inflight.get(self._flight_key(prompt))
+        if task is not None:
+            self.coalesced_total += 1
+        else:
+            # Antrean penuh atau circuit terbuka (LLM sedang bermasalah):
+            # langsung pakai fallback
+            if self._queue_full() or not self.breaker.allow():
+                self.fallback_total += 1
+                return self._fallback_advice(name, pace_label, avg_score, progress, optimal_time)
+            task = self._start_flight(key, prompt)
+        
         try:
-            prompt = self._build_prompt(
-                name, pace_label, avg_score, completed_modules, total_modules,
-                completion_speed, consistency_std, total_courses, courses_completed,
-                optimal_time
-            )
-            
-            response = self.client.chat.completions.create(
-                model="mistralai/devstral-2512:free",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return response.choices[0].message.content.strip()
+            # shield: jika deadline lewat, panggilan LLM tetap selesai di
+            # background dan hasilnya mengisi cache untuk request berikutnya
+            text = await asyncio.wait_for(asyncio.shield(task), self.deadline)
+            return self._personalize(text, name)
+        except asyncio.TimeoutError:
+            self.deadline_exceeded_total += 1
         except Exception as e:
             print(f"[ERROR] AI generation failed: {e}")
+        
+        self.fallback_total += 1
+        return self._fallback_advice(name, pace_label, avg_score, progress, optimal_time)
+    
+    def _queue_full(self) -> bool:
+        """
+        True (dan dicatat) jika panggilan LLM yang sudah diterima mengisi semua
+        slot plus max_waiting antrean. Dihitung saat diterima, bukan saat masuk
+        semaphore, agar lonjakan dalam satu tick event loop ikut tertahan.
+        """
+        
+        if not self.max_waiting or self.admitted < self.max_concurrency + self.max_waiting:
+            return False
+        self.rejected_total += 1
+        return True
+    
+    def _flight_key(self, prompt: str) -> str:
+        """Prompt ternormalisasi (whitespace diseragamkan) sebagai kunci single-flight"""
+        return " ".join(prompt.split())
+    
+    def _start_flight(self, key: str, prompt: str) -> asyncio.Task:
+        """Mulai satu panggilan LLM (leader) yang bisa ditunggu request lain"""
+        
+        flight_key = self._flight_key(prompt)
+        task = asyncio.ensure_future(self._fill(key, prompt))
+        self._inflight[flight_key] = task
+        self._background.add(task)
+        self.leader_total += 1
+        self.admitted += 1
+        
+        def done(finished: asyncio.Task):
+            self.admitted -= 1
+            if self._inflight.get(flight_key) is finished:
+                del self._inflight[flight_key]
+            self._forget_task(finished)
+        
+        task.add_done_callback(done)
+        return task
+    
+    async def _fill(self, key: str, prompt: str) -> str:
+        """Panggil LLM, catat hasil ke circuit breaker dan isi cache"""
+        
+        try:
+            text = await self._complete(prompt)
+        except BaseException:
+            # Termasuk CancelledError (close(), shutdown): percobaan half-open
+            # harus dilepas, kalau tidak circuit tertahan di half_open
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        self.cache.set(key, text)
+        self.cache_fills_total += 1
+        return text
+    
+    def _forget_task(self, task: asyncio.Task):
+        self._background.discard(task)
+        # Exception sudah dicatat breaker; diambil di sini agar tidak muncul
+        # warning "never retrieved" untuk request yang sudah dijawab fallback
+        if not task.cancelled():
+            task.exception()
+    
+    async def stream(self, name: str, pace_label: str, avg_score: float = 75.0,
+                     completed_modules: int = 0, total_modules: int = 0,
+                     completion_speed: float = 1.0, consistency_std: float = 2.0,
+                     total_courses: int = 0, courses_completed: int = 0,
+                     optimal_time: str = "Pagi") -> AsyncIterator[str]:
+        """Seperti generate, tetapi teks dikirim per potongan saat token LLM tiba"""
+        
+        progress = (completed_modules / total_modules * 100) if total_modules > 0 else 0
+        
+        def fallback() -> str:
             return self._fallback_advice(name, pace_label, avg_score, progress, optimal_time)
+        
+        if not self.enabled:
+            yield fallback()
+            return
+        
+        profile = self._bucket_profile(
+            pace_label, avg_score, progress, consistency_std,
+            total_courses, courses_completed, optimal_time
+        )
+        key = self._cache_key(profile)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield self._personalize(cached, name)
+            return
+        
+        prompt = self._build_prompt(self.NAME_PLACEHOLDER, **profile)
+        
+        # Prompt yang sama sedang diproses generate(): tunggu hasilnya saja
+        task = self._inflight.get(self._flight_key(prompt))
+        if task is not None:
+            self.coalesced_total += 1
+            try:
+                text = await asyncio.shield(task)
+            except Exception:
+                self.fallback_total += 1
+                yield fallback()
+            else:
+                yield self._personalize(text, name)
+            return
+        
+        if self._queue_full() or not self.breaker.allow():
+            self.fallback_total += 1
+            yield fallback()
+            return
+        
+        parts = []
+        pending = ""
+        emitted = False
+        reported = False
+        self.admitted += 1
+        
+        try:
+            try:
+                async for delta in self._complete_stream(prompt):
+                    parts.append(delta)
+                    
+                    # Placeholder nama bisa terpotong antar token: tahan ekor yang
+                    # masih mungkin menjadi awal placeholder (dan whitespace di akhir)
+                    pending = self._personalize(pending + delta, name)
+                    trailing = len(pending) - len(pending.rstrip())
+                    hold = trailing or self._placeholder_prefix_len(pending)
+                    ready, pending = pending[:len(pending) - hold], pending[len(pending) - hold:]
+                    if not emitted:
+                        ready = ready.lstrip()
+                    if ready:
+                        emitted = True
+                        yield ready
+            except Exception as e:
+                reported = True
+                self.breaker.record_failure()
+                self.fallback_total += 1
+                print(f"[ERROR] AI streaming failed: {e}")
+                if parts:
+                    # Teks sudah terpotong di sisi client: harus ada sinyal error
+                    raise AdviceStreamInterrupted(str(e), fallback()) from e
+                yield fallback()
+                return
+            
+            reported = True
+            self.breaker.record_success()
+            text = "".join(parts).strip()
+            if text:
+                self.cache.set(key, text)
+                self.cache_fills_total += 1
+        finally:
+            # Client disconnect (GeneratorExit/CancelledError saat aclose) juga
+            # harus melepas percobaan half-open; dihitung sebagai kegagalan
+            self.admitted -= 1
+            if not reported:
+                self.breaker.record_failure()
+        
+        pending = pending.rstrip() if emitted else pending.strip()
+        if pending:
+            yield pending
+    
+    async def _complete_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Chat completion dengan stream=True; mencatat time-to-first-token"""
+        
+        self._ensure_client()
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.streams_total += 1
+            started = time.perf_counter()
+            first = True
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True
+                )
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if first:
+                        first = False
+                        self.last_ttft_ms = (time.perf_counter() - started) * 1000.0
+                        self._ttft_total += self.last_ttft_ms
+                        self._ttft_count += 1
+                    yield delta
+                self.completed_total += 1
+            except Exception:
+                self.failed_total += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self._latency_total += time.perf_counter() - started
+    
+    def _placeholder_prefix_len(self, text: str) -> int:
+        """Panjang ekor `text` yang merupakan awalan NAME_PLACEHOLDER"""
+        
+        for size in range(min(len(text), len(self.NAME_PLACEHOLDER) - 1), 0, -1):
+            if self.NAME_PLACEHOLDER.startswith(text[-size:]):
+                return size
+        return 0
+    
+    def _bucket_profile(self, pace_label: str, avg_score: float, progress: float,
+                        consistency_std: float, total_courses: int,
+                        courses_completed: int, optimal_time: str) -> Dict:
+        """
+        Profil kanonik: setiap nilai diganti band-nya, sehingga semua siswa
+        dalam band yang sama berbagi satu prompt (tanpa nama)
+        """
+        
+        score_band = next(band for lower, band in self.SCORE_BANDS if avg_score >= lower)
+        progress_band = (next(band for lower, band in self.PROGRESS_BANDS if progress >= lower)
+                         if progress > 0 else None)
+        
+        if consistency_std < 2:
+            consistency = "low"
+        elif consistency_std > 5:
+            consistency = "high"
+        else:
+            consistency = "mid"
+        
+        return {
+            "pace_label": pace_label,
+            "score_band": score_band,
+            "progress_band": progress_band,
+            "consistency": consistency,
+            "total_courses": int(total_courses),
+            "courses_completed": int(courses_completed),
+            "optimal_time": optimal_time
+        }
+    
+    def _cache_key(self, profile: Dict) -> str:
+        parts = [self.model_name] + [f"{k}={profile[k]}" for k in sorted(profile)]
+        return "|".join(parts)
+    
+    def _personalize(self, text: str, name: str) -> str:
+        return text.replace(self.NAME_PLACEHOLDER, name)
+    
+    async def _complete(self, prompt: str) -> str:
+        """Satu chat completion, dibatasi `max_concurrency` request bersamaan"""
+        
+        self._ensure_client()
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            started = time.perf_counter()
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                self.completed_total += 1
+                return response.choices[0].message.content.strip()
+            except Exception:
+                self.failed_total += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self._latency_total += time.perf_counter() - started
+    
+    def stats(self) -> dict:
+        finished = self.completed_total + self.failed_total
+        return {
+            "kind": "async",
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "max_connections": self.max_connections,
+            "active": self.in_flight,
+            "queued": self.waiting,
+            "max_waiting": self.max_waiting,
+            "admitted": self.admitted,
+            "rejected_total": self.rejected_total,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": round(self.in_flight / self.max_concurrency, 3),
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total,
+            "avg_latency_ms": round(self._latency_total / finished * 1000.0, 3) if finished else 0.0,
+            "deadline_ms": self.deadline * 1000.0 if self.deadline else 0.0,
+            "deadline_exceeded_total": self.deadline_exceeded_total,
+            "fallback_total": self.fallback_total,
+            "background_pending": len(self._background),
+            "cache_fills_total": self.cache_fills_total,
+            "singleflight_inflight": len(self._inflight),
+            "singleflight_leader_total": self.leader_total,
+            "singleflight_coalesced_total": self.coalesced_total,
+            "circuit": self.breaker.stats(),
+            "streams_total": self.streams_total,
+            "last_ttft_ms": round(self.last_ttft_ms, 3),
+            "avg_ttft_ms": round(self._ttft_total / self._ttft_count, 3) if self._ttft_count else 0.0,
+        }
     
     def _fallback_advice(self, name: str, pace_label: str, avg_score: float, 
                          progress: float, optimal_time: str) -> str:
@@ -183,43 +1004,42 @@ class AdviceService:
         else:  # consistent learner
             return f"Hai {name}! 📊 Konsistensi adalah kuncimu! Sebagai consistent learner, kamu {pace_desc}. Coba teknik time-blocking dan set milestone mingguan untuk tracking. Waktu {optimal_time} sudah jadi sweet spot-mu - pertahankan! Keep inspiring, {name}! 💪🌟"
     
-    def _build_prompt(self, name: str, pace_label: str, avg_score: float,
-                      completed_modules: int, total_modules: int,
-                      completion_speed: float, consistency_std: float,
+    def _build_prompt(self, name: str, pace_label: str, score_band: str,
+                      progress_band: Optional[str], consistency: str,
                       total_courses: int, courses_completed: int,
                       optimal_time: str) -> str:
-        """Build prompt untuk saran yang engaging dan actionable"""
+        """Build prompt untuk saran yang engaging dan actionable (dari profil band)"""
         
-        progress = (completed_modules / total_modules * 100) if total_modules > 0 else 0
-        course_completion = (courses_completed / total_courses * 100) if total_courses > 0 else 0
         pace_desc = self.PACE_DESC.get(pace_label, "belajar dengan baik")
+        scores = [band for _, band in self.SCORE_BANDS]
+        progresses = [band for _, band in self.PROGRESS_BANDS]
         
         # Determine strengths and areas for growth
         strengths = []
         growth_areas = []
         
         # Score analysis
-        if avg_score >= 85:
-            strengths.append(f"nilai ujian impresif ({avg_score:.0f}/100)")
-        elif avg_score >= 70:
-            strengths.append(f"nilai ujian solid ({avg_score:.0f}/100)")
-        elif avg_score >= 50:
+        if score_band == scores[0]:
+            strengths.append(f"nilai ujian impresif ({score_band})")
+        elif score_band == scores[1]:
+            strengths.append(f"nilai ujian solid ({score_band})")
+        elif score_band == scores[2]:
             growth_areas.append("tingkatkan nilai ujian dengan review materi")
         else:
             growth_areas.append("perkuat fondasi dengan review materi dasar")
         
         # Progress analysis
-        if progress >= 70:
-            strengths.append(f"progress luar biasa ({progress:.0f}%)")
-        elif progress >= 40:
-            strengths.append(f"progress konsisten ({progress:.0f}%)")
-        elif progress > 0:
+        if progress_band == progresses[0]:
+            strengths.append(f"progress luar biasa ({progress_band})")
+        elif progress_band == progresses[1]:
+            strengths.append(f"progress konsisten ({progress_band})")
+        elif progress_band is not None:
             growth_areas.append("tingkatkan frekuensi belajar")
         
         # Consistency analysis
-        if consistency_std < 2:
+        if consistency == "low":
             strengths.append("jadwal belajar sangat konsisten")
-        elif consistency_std > 5:
+        elif consistency == "high":
             growth_areas.append(f"tetapkan jadwal rutin di {optimal_time}")
         
         # Course completion
@@ -244,8 +1064,8 @@ PROFIL SISWA:
 - Nama: {name}
 - Tipe: {pace_label} {config['emoji']} ({pace_desc})
 - Waktu Optimal: {optimal_time}
-- Progress: {completed_modules}/{total_modules} modul ({progress:.0f}%)
-- Nilai Ujian: {avg_score:.0f}
+- Progress Modul: {progress_band or "belum ada"}
+- Nilai Ujian: {score_band}
 - Kelas Selesai: {courses_completed}/{total_courses}
 
 KELEBIHAN: {strengths_text}
@@ -262,11 +1082,62 @@ ATURAN:
 - Sertakan 2-3 emoji
 - Fokus SOLUSI bukan masalah
 - Paragraf mengalir, JANGAN bullet points
+- Nilai dan progress di atas berupa rentang; JANGAN menyebut angka pasti
 
 CONTOH:
-"Hai Budi! 🌟 Nilai 85 dan progress 70% kamu membanggakan! Sebagai fast learner, kamu cepat menyerap materi. Saatnya naik level - coba explore materi advanced atau bantu teman belajar. Waktu Pagi adalah golden hour-mu, manfaatkan untuk hasil maksimal! Terus melangkah, {name}! 💪" """
+"Hai Budi! 🌟 Nilai ujian dan progress belajarmu membanggakan! Sebagai fast learner, kamu cepat menyerap materi. Saatnya naik level - coba explore materi advanced atau bantu teman belajar. Waktu Pagi adalah golden hour-mu, manfaatkan untuk hasil maksimal! Terus melangkah, {name}! 💪" """
 
 
 # Singleton instances
 pace_service = PaceService()
+persona_service = PersonaService()
 advice_service = AdviceService()
+
+
+def init_scoring_worker():
+    """Initializer pool scoring: proses worker baru memuat model sendiri"""
+    if pace_service.model is None:
+        pace_service.load_model()
+    if persona_service.model is None:
+        persona_service.load_model()
+
+
+def score_pace_batch(features_list: List[Dict]) -> List[Dict]:
+    """Entry point scoring yang bisa di-pickle untuk process pool"""
+    return pace_service.predict_batch(features_list)
+
+
+def score_persona_batch(features_list: List[Dict]) -> List[Dict]:
+    """Entry point scoring persona yang bisa di-pickle untuk process pool"""
+    return persona_service.predict_batch(features_list)
+
+
+def score_events(trackings: List[Dict], submissions: List[Dict],
+                 exams: List[Dict], completions: List[Dict]) -> List[Dict]:
+    """
+    Hitung fitur dari event mentah lalu skor pace dan persona dalam satu
+    panggilan. Satu hasil per (developer_id, journey_id).
+    """
+    features = compute_features(trackings, submissions, exams, completions)
+    if features.empty:
+        return []
+
+    pace_rows = features[PACE_FEATURES].to_dict("records")
+    persona_rows = features[PERSONA_FEATURES].to_dict("records")
+    pace_results = pace_service.predict_batch(pace_rows)
+    persona_results = persona_service.predict_batch(persona_rows)
+
+    return [
+        {
+            "user_id": int(developer_id),
+            "journey_id": int(journey_id),
+            "pace_features": pace_row,
+            "persona_features": persona_row,
+            "pace": pace,
+            "persona": persona,
+        }
+        for developer_id, journey_id, pace_row, persona_row, pace, persona in zip(
+            features["developer_id"], features["journey_id"],
+            pace_rows, persona_rows, pace_results, persona_results
+        )
+    ]
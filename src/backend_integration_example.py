@@ -436,95 +436,19 @@ module.exports = router;
 
 """
 import mysql.connector
-from datetime import datetime
-import numpy as np
 
-def calculate_user_features(db_connection, user_id):
-    '''
-    Calculate semua features yang dibutuhkan untuk ML model
-    
-    Args:
-        db_connection: Database connection object
-        user_id: ID user
-        
-    Returns:
-        Dict dengan semua features
-    '''
-    cursor = db_connection.cursor(dictionary=True)
-    
-    # 1. Average study hour
-    cursor.execute('''
-        SELECT AVG(HOUR(last_viewed)) as avg_hour
-        FROM developer_journey_trackings
-        WHERE developer_id = %s
-    ''', (user_id,))
-    result = cursor.fetchone()
-    avg_study_hour = float(result['avg_hour'] or 12)
-    
-    # 2. Study consistency (std deviation of days between sessions)
-    cursor.execute('''
-        SELECT last_viewed 
-        FROM developer_journey_trackings
-        WHERE developer_id = %s
-        ORDER BY last_viewed
-    ''', (user_id,))
-    sessions = cursor.fetchall()
-    
-    if len(sessions) > 1:
-        days = [(sessions[i]['last_viewed'] - sessions[i-1]['last_viewed']).days 
-                for i in range(1, len(sessions))]
-        study_consistency_std = float(np.std(days)) if days else 0
-    else:
-        study_consistency_std = 0
-    
-    # 3. Completion speed
-    cursor.execute('''
-        SELECT AVG(study_duration) as avg_duration
-        FROM developer_journey_completions
-        WHERE developer_id = %s AND status = 'completed'
-    ''', (user_id,))
-    result = cursor.fetchone()
-    completion_speed = float(result['avg_duration'] or 40)
-    
-    # 4. Average exam score
-    cursor.execute('''
-        SELECT AVG(score) as avg_score
-        FROM exam_results
-        WHERE developer_id = %s
-    ''', (user_id,))
-    result = cursor.fetchone()
-    avg_exam_score = float(result['avg_score'] or 70)
-    
-    # 5. Submission fail rate
-    cursor.execute('''
-        SELECT 
-            COUNT(*) as total,
-            SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
-        FROM developer_journey_submissions
-        WHERE developer_id = %s
-    ''', (user_id,))
-    result = cursor.fetchone()
-    submission_fail_rate = (result['failed'] / result['total']) if result['total'] > 0 else 0
-    
-    # 6. Retry count
-    cursor.execute('''
-        SELECT SUM(enrolling_times - 1) as retries
-        FROM developer_journey_completions
-        WHERE developer_id = %s
-    ''', (user_id,))
-    result = cursor.fetchone()
-    retry_count = int(result['retries'] or 0)
-    
-    cursor.close()
-    
-    return {
-        'avg_study_hour': avg_study_hour,
-        'study_consistency_std': study_consistency_std,
-        'completion_speed': completion_speed,
-        'avg_exam_score': avg_exam_score,
-        'submission_fail_rate': float(submission_fail_rate),
-        'retry_count': retry_count
-    }
+# Fitur persona dihitung oleh package `features` (src/features/extractor.py):
+# satu query agregasi per user, atau satu query per 500 user untuk bulk.
+# Standar deviasi jarak hari antar sesi dihitung di database (LAG), tidak
+# perlu lagi menarik semua baris last_viewed ke Python.
+from features import calculate_user_features, calculate_users_features
+
+# Satu user
+# features = calculate_user_features(db_connection, user_id)
+#
+# Banyak user sekaligus (misal refresh 10k user = 20 query, bukan 60k)
+# features_by_user = calculate_users_features(db_connection, user_ids)
+# -> {developer_id: {'avg_study_hour': ..., 'study_consistency_std': ..., ...}}
 
 
 def get_journey_statistics(db_connection, journey_id):
@@ -0,0 +1,10 @@
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modul API di-import secara flat (seperti saat `cd src/api && python main.py`),
+# package lain di src (misal `features`) di-import dari root src
+for path in (os.path.join(SRC_DIR, "api"), SRC_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
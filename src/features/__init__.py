@@ -0,0 +1,16 @@
+"""
+Perhitungan fitur persona dan pace dari data aktivitas mentah.
+
+Dipakai oleh API (src/api) dan oleh backend yang menghitung fitur langsung
+dari database.
+"""
+
+from .extractor import calculate_user_features, calculate_users_features
+from .events import compute_features, PACE_FEATURES, PERSONA_FEATURES
+from .incremental import IncrementalFeatureStore, aggregate_features
+
+__all__ = [
+    "calculate_user_features", "calculate_users_features",
+    "compute_features", "PACE_FEATURES", "PERSONA_FEATURES",
+    "IncrementalFeatureStore", "aggregate_features",
+]
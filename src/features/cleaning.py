@@ -0,0 +1,229 @@
+"""
+Tahap cleaning per file: port notebooks/01_clean_individual_files.ipynb.
+
+Setiap tabel mentah punya fungsi cleaner sendiri (DataFrame mentah ->
+DataFrame bersih) yang identik dengan bagian preprocessing notebook. Karena
+tabel-tabel ini tidak saling bergantung, CLI menjalankan setiap cleaner di
+process pool terpisah sehingga total waktu kira-kira sama dengan tabel yang
+paling lambat. Output ditulis atomik (file sementara lalu os.replace) agar
+pembaca data/interim tidak pernah melihat CSV setengah jadi.
+
+Run (dari folder src):
+    python -m features.cleaning
+    python -m features.cleaning --tables users journeys --workers 2
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .raw_cache import CACHE_DIR, RAW_DIR, read_excel_cached
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INTERIM_DIR = os.path.join(BASE_DIR, "data", "interim")
+
+
+def _to_datetime(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    for c in columns:
+        if c in df.columns:
+            df[c] = pd.to_datetime(df[c], errors="coerce")
+    return df
+
+
+def _keep(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    return df[[c for c in columns if c in df.columns]]
+
+
+def clean_users(df: pd.DataFrame) -> pd.DataFrame:
+    """Buang kolom PII/tidak terpakai dan konversi tanggal"""
+    cols_to_drop = ["email", "phone", "password", "user_verification_status", "deleted_at", "city",
+                    "city_id", "custom_city", "remember_token", "image_path", "unsubscribe_link",
+                    "phone_verification_status", "phone_verified_with", "verified_certificate_name",
+                    "verified_identity_document", "ama"]
+    df = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
+    return _to_datetime(df, ["created_at", "updated_at", "deleted_at", "verified_at"])
+
+
+def clean_trackings(df: pd.DataFrame) -> pd.DataFrame:
+    """Tracking tanpa ID dan duplikat dibuang; status = 0 jika completed_at kosong"""
+    df = _to_datetime(df.copy(), ["last_viewed", "first_opened_at", "completed_at"])
+    df = df.dropna(subset=["developer_id", "journey_id"])
+    df = df.drop_duplicates(subset=["developer_id", "journey_id", "tutorial_id"])
+
+    if "completed_at" in df.columns and "status" in df.columns:
+        df.loc[df["completed_at"].isnull(), "status"] = 0
+
+    return _keep(df, ["id", "developer_id", "journey_id", "tutorial_id", "last_viewed",
+                      "first_opened_at", "completed_at", "status"])
+
+
+def clean_submissions(df: pd.DataFrame) -> pd.DataFrame:
+    df = _to_datetime(df.copy(), ["created_at", "updated_at", "started_review_at",
+                                  "ended_review_at", "first_opened_at"])
+    df = df.drop(columns=[c for c in ["app_link", "app_comment", "admin_comment", "note"] if c in df.columns])
+    return _keep(df, ["id", "submitter_id", "journey_id", "quiz_id", "rating", "status",
+                      "submission_duration", "created_at"])
+
+
+def clean_exam_results(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["score"] = pd.to_numeric(df["score"], errors="coerce")
+    df = _to_datetime(df, ["created_at"])
+    return df.drop(columns=[c for c in ["look_report_at"] if c in df.columns])
+
+
+def _process_rating(row) -> float:
+    """Rating dipisah koma dirata-rata; jika kosong dibuat dummy (seed = index baris)"""
+    rating = row["avg_submission_rating"]
+    if pd.notna(rating):
+        try:
+            if "," in str(rating):
+                return np.mean([float(r.strip()) for r in str(rating).split(",")])
+            return float(rating)
+        except ValueError:
+            pass
+    times = int(row.get("enrolling_times", 1)) if pd.notna(row.get("enrolling_times")) else 1
+    np.random.seed(int(row.name) % 10000)
+    ratings = np.random.choice([1.0, 2.0, 3.0, 4.0, 5.0], size=times, p=[0.05, 0.15, 0.30, 0.30, 0.20])
+    return round(np.mean(ratings), 1)
+
+
+def clean_completions(df: pd.DataFrame) -> pd.DataFrame:
+    """Konversi tanggal, hitung repeat_enrollments dan isi avg_submission_rating"""
+    df = _to_datetime(df.copy(), ["created_at", "updated_at", "last_enrolled_at"])
+
+    if "enrollments_at" in df.columns:
+        df["repeat_enrollments"] = df["enrollments_at"].apply(
+            lambda x: max(0, len(str(x).split(",")) - 1) if pd.notna(x) and str(x).strip() else 0
+        )
+    if "avg_submission_rating" in df.columns:
+        df["avg_submission_rating"] = df.apply(_process_rating, axis=1)
+    return df
+
+
+def clean_journeys(df: pd.DataFrame) -> pd.DataFrame:
+    df = _to_datetime(df.copy(), ["created_at", "updated_at", "deadline", "trial_deadline",
+                                  "discount_ends_at"])
+    return _keep(df, ["id", "name", "difficulty", "hours_to_study", "point", "xp", "created_at"])
+
+
+def clean_tutorials(df: pd.DataFrame) -> pd.DataFrame:
+    df = _to_datetime(df.copy(), ["created_at", "updated_at"])
+    return _keep(df, ["id", "developer_journey_id", "title", "type", "position", "status"])
+
+
+def clean_exam_registrations(df: pd.DataFrame) -> pd.DataFrame:
+    return _to_datetime(df.copy(), ["created_at", "updated_at", "deadline_at", "retake_limit_at",
+                                    "exam_finished_at", "deleted_at"])
+
+
+# nama tabel -> (file mentah, file interim, cleaner)
+CLEANERS: Dict[str, tuple] = {
+    "users": ("users.xlsx", "users_clean.csv", clean_users),
+    "trackings": ("developer_journey_trackings.xlsx", "trackings_clean.csv", clean_trackings),
+    "submissions": ("developer_journey_submissions.xlsx", "submissions_clean.csv", clean_submissions),
+    "exam_results": ("exam_results.xlsx", "exam_results_clean.csv", clean_exam_results),
+    "completions": ("developer_journey_completions.xlsx", "completions_clean.csv", clean_completions),
+    "journeys": ("developer_journeys.xlsx", "journeys_clean.csv", clean_journeys),
+    "tutorials": ("developer_journey_tutorials.xlsx", "tutorials_clean.csv", clean_tutorials),
+    "exam_registrations": ("exam_registrations.xlsx", "exam_registrations_clean.csv",
+                           clean_exam_registrations),
+}
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str):
+    tmp_path = f"{path}.tmp"
+    try:
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def clean_table(table: str, raw_dir: str = RAW_DIR, interim_dir: str = INTERIM_DIR,
+                cache_dir: str = CACHE_DIR) -> dict:
+    """Load, clean dan simpan satu tabel; mengembalikan ringkasan dengan timing"""
+    raw_name, out_name, cleaner = CLEANERS[table]
+    started = time.perf_counter()
+
+    raw = read_excel_cached(os.path.join(raw_dir, raw_name), cache_dir)
+    loaded = time.perf_counter()
+    clean = cleaner(raw)
+    cleaned = time.perf_counter()
+    write_csv_atomic(clean, os.path.join(interim_dir, out_name))
+    saved = time.perf_counter()
+
+    return {
+        "table": table,
+        "rows_in": len(raw),
+        "rows_out": len(clean),
+        "load_s": loaded - started,
+        "clean_s": cleaned - loaded,
+        "save_s": saved - cleaned,
+        "total_s": saved - started,
+    }
+
+
+def run(raw_dir: str = RAW_DIR, interim_dir: str = INTERIM_DIR, tables: Optional[List[str]] = None,
+        workers: Optional[int] = None, cache_dir: str = CACHE_DIR) -> List[dict]:
+    """Jalankan cleaner setiap tabel secara paralel; tabel tanpa file mentah dilewati"""
+    os.makedirs(interim_dir, exist_ok=True)
+
+    todo = []
+    for table in tables or list(CLEANERS):
+        if os.path.exists(os.path.join(raw_dir, CLEANERS[table][0])):
+            todo.append(table)
+        else:
+            print(f"[WARN] Skipping {table}: {CLEANERS[table][0]} not found in {raw_dir}")
+    if not todo:
+        return []
+
+    started = time.perf_counter()
+    results, failed = [], []
+    with ProcessPoolExecutor(max_workers=min(workers or len(todo), len(todo))) as pool:
+        futures = {pool.submit(clean_table, table, raw_dir, interim_dir, cache_dir): table for table in todo}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[ERROR] Cleaning {futures[future]} failed: {e}")
+                failed.append(futures[future])
+                continue
+            results.append(result)
+            print(f"[OK] {result['table']}: {result['rows_in']} -> {result['rows_out']} rows "
+                  f"(load {result['load_s']:.2f}s, clean {result['clean_s']:.2f}s, "
+                  f"save {result['save_s']:.2f}s)")
+
+    wall = time.perf_counter() - started
+    slowest = max((r["total_s"] for r in results), default=0.0)
+    print(f"[OK] Cleaned {len(results)}/{len(todo)} tables in {wall:.2f}s "
+          f"(slowest table {slowest:.2f}s, sequential {sum(r['total_s'] for r in results):.2f}s)")
+    if failed:
+        raise RuntimeError(f"Cleaning failed for: {', '.join(sorted(failed))}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cleaning data/raw/*.xlsx ke data/interim secara paralel")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--interim-dir", default=INTERIM_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--tables", nargs="+", choices=list(CLEANERS), help="Default: semua tabel")
+    parser.add_argument("--workers", type=int, default=None, help="Default: satu proses per tabel")
+    args = parser.parse_args()
+
+    try:
+        run(args.raw_dir, args.interim_dir, args.tables, args.workers, args.cache_dir)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
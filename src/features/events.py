@@ -0,0 +1,148 @@
+"""
+Perhitungan fitur pace dan persona dari event aktivitas mentah.
+
+Logika sama dengan notebooks/02_feature_engineering.ipynb, tetapi seluruhnya
+memakai operasi group pandas/NumPy (tanpa groupby.apply per grup) sehingga
+bisa dipanggil per request untuk satu atau ribuan user.
+
+Input berupa DataFrame (atau list of dict) per jenis event:
+- trackings   : developer_id, journey_id, tutorial_id, last_viewed, completed_at
+- submissions : developer_id, journey_id, status
+- exams       : developer_id, journey_id, score
+- completions : developer_id, journey_id, study_duration, enrolling_times, hours_to_study
+
+Output: satu baris per (developer_id, journey_id) yang punya tracking.
+"""
+
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+KEYS = ["developer_id", "journey_id"]
+
+PACE_FEATURES = [
+    "completion_speed", "study_consistency_std", "avg_study_hour",
+    "completed_modules", "total_modules_viewed"
+]
+
+PERSONA_FEATURES = [
+    "avg_study_hour", "study_consistency_std", "completion_speed",
+    "avg_exam_score", "submission_fail_rate", "retry_count"
+]
+
+# Status submission yang dihitung lulus (sama dengan notebook)
+PASSED_STATUSES = ["passed", "approved"]
+
+# Batas atas completion_speed (sama dengan notebook)
+MAX_COMPLETION_SPEED = 10
+
+# Kolom hitungan/rate yang diisi 0 jika user tidak punya event terkait
+ZERO_FILL = ["completed_modules", "total_modules_viewed", "retry_count", "submission_fail_rate"]
+
+# Pengganti NaN untuk kolom yang di notebook diisi median dataset training
+# (data/processed/clustering_features.csv).
+FILL_VALUES = {
+    "avg_study_hour": 13.92,
+    "study_consistency_std": 5.86,
+    "completion_speed": 0.56,
+    "avg_exam_score": 83.85,
+}
+
+Events = Optional[Union[pd.DataFrame, Iterable[dict]]]
+
+
+def _frame(events: Events, columns: list) -> pd.DataFrame:
+    if events is None:
+        return pd.DataFrame(columns=columns)
+    df = events if isinstance(events, pd.DataFrame) else pd.DataFrame(list(events))
+    for col in columns:
+        if col not in df.columns:
+            df[col] = np.nan
+    return df[columns]
+
+
+def _tracking_features(trackings: pd.DataFrame) -> pd.DataFrame:
+    df = trackings.copy()
+    df["last_viewed"] = pd.to_datetime(df["last_viewed"], errors="coerce")
+    df["completed_at"] = pd.to_datetime(df["completed_at"], errors="coerce")
+    df["hour"] = df["last_viewed"].dt.hour
+
+    agg = df.groupby(KEYS, sort=True).agg(
+        total_modules_viewed=("tutorial_id", "count"),
+        completed_modules=("completed_at", "count"),
+        avg_study_hour=("hour", "mean"),
+    )
+
+    # Std jarak hari antar tanggal unik belajar (np.std, ddof=0).
+    # Grup dengan satu tanggal tidak punya jarak -> 0; grup tanpa last_viewed
+    # sama sekali tetap NaN (diisi median seperti di notebook)
+    dates = df.loc[df["last_viewed"].notna(), KEYS].copy()
+    dates["date"] = df.loc[df["last_viewed"].notna(), "last_viewed"].dt.normalize()
+    dates = dates.drop_duplicates().sort_values(KEYS + ["date"])
+    dates["gap"] = dates.groupby(KEYS, sort=False)["date"].diff().dt.days
+    gap_std = dates.groupby(KEYS, sort=True)["gap"].std(ddof=0).fillna(0.0)
+
+    agg["study_consistency_std"] = gap_std.reindex(agg.index)
+    return agg
+
+
+def _submission_features(submissions: pd.DataFrame) -> pd.DataFrame:
+    status = submissions["status"]
+    is_passed = np.where(status.isna(), np.nan, status.isin(PASSED_STATUSES).astype(float))
+
+    grouped = submissions[KEYS].assign(is_passed=is_passed).groupby(KEYS, sort=True)["is_passed"]
+    total = grouped.count()
+    passed = grouped.sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fail_rate = (total - passed) / total
+    return fail_rate.replace([np.inf, -np.inf], 0).rename("submission_fail_rate").to_frame()
+
+
+def _exam_features(exams: pd.DataFrame) -> pd.DataFrame:
+    scores = pd.to_numeric(exams["score"], errors="coerce")
+    return exams[KEYS].assign(avg_exam_score=scores).groupby(KEYS, sort=True).mean()
+
+
+def _completion_features(completions: pd.DataFrame) -> pd.DataFrame:
+    df = completions.drop_duplicates(subset=KEYS, keep="last").set_index(KEYS)
+    duration = pd.to_numeric(df["study_duration"], errors="coerce")
+    hours = pd.to_numeric(df["hours_to_study"], errors="coerce")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed = np.where((hours > 0) & duration.notna(), duration / hours, np.nan)
+
+    return pd.DataFrame({
+        "retry_count": pd.to_numeric(df["enrolling_times"], errors="coerce"),
+        "completion_speed": np.minimum(speed, MAX_COMPLETION_SPEED),
+    }, index=df.index)
+
+
+def compute_features(trackings: Events, submissions: Events = None,
+                     exams: Events = None, completions: Events = None) -> pd.DataFrame:
+    """
+    Hitung 5 fitur pace dan 6 fitur persona per (developer_id, journey_id).
+
+    Returns:
+        DataFrame dengan kolom developer_id, journey_id dan semua fitur,
+        diurutkan berdasarkan (developer_id, journey_id), tanpa NaN
+    """
+    trackings = _frame(trackings, KEYS + ["tutorial_id", "last_viewed", "completed_at"])
+    submissions = _frame(submissions, KEYS + ["status"])
+    exams = _frame(exams, KEYS + ["score"])
+    completions = _frame(completions, KEYS + ["study_duration", "enrolling_times", "hours_to_study"])
+
+    features = _tracking_features(trackings)
+    for part in (_submission_features(submissions), _exam_features(exams),
+                 _completion_features(completions)):
+        features = features.join(part, how="left")
+
+    features[ZERO_FILL] = features[ZERO_FILL].fillna(0)
+    features = features.fillna(FILL_VALUES)
+
+    for col in ("completed_modules", "total_modules_viewed"):
+        features[col] = features[col].astype(np.int64)
+
+    columns = list(dict.fromkeys(PACE_FEATURES + PERSONA_FEATURES))
+    return features[columns].reset_index()
@@ -0,0 +1,176 @@
+"""
+Ekstraksi 6 fitur persona langsung dari database dengan satu query agregasi.
+
+Menggantikan `calculate_user_features` di backend_integration_example.py yang
+membutuhkan 6 query per user dan menarik semua baris `last_viewed` ke Python.
+Di sini semua agregasi (termasuk standar deviasi jarak hari antar sesi via
+LAG) dilakukan database; Python hanya menghitung akar kuadrat dan default.
+
+Dialect yang didukung: "mysql" (mysql.connector / PyMySQL) dan "sqlite".
+Query memakai CTE (WITH) dan window function LAG() OVER, jadi butuh MySQL
+8.0+ (MariaDB 10.2+) atau SQLite 3.25+; MySQL 5.7 akan gagal dengan syntax
+error.
+
+Default hanya dipakai jika agregat NULL (user belum punya baris di tabel
+terkait). Versi lama memakai `nilai or default`, sehingga agregat bernilai 0
+(rata-rata jam 0 = belajar tengah malam, durasi 0, nilai ujian 0) ikut
+diganti default; di sini 0 dipertahankan sebagai nilai sebenarnya.
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+# Ekspresi yang berbeda antar database
+DIALECTS = {
+    "mysql": {
+        "placeholder": "%s",
+        "hour": "HOUR(last_viewed)",
+        "day_gap": "TIMESTAMPDIFF(DAY, prev_viewed, last_viewed)",
+    },
+    "sqlite": {
+        "placeholder": "?",
+        "hour": "CAST(strftime('%H', last_viewed) AS INTEGER)",
+        "day_gap": "(CAST(strftime('%s', last_viewed) AS INTEGER)"
+                   " - CAST(strftime('%s', prev_viewed) AS INTEGER)) / 86400",
+    },
+}
+
+# Default jika user belum punya data di tabel terkait (agregat NULL; 0 tidak diganti)
+DEFAULTS = {
+    "avg_study_hour": 12.0,
+    "completion_speed": 40.0,
+    "avg_exam_score": 70.0,
+}
+
+# Jumlah user per statement agar jumlah parameter tetap di bawah batas driver
+CHUNK_SIZE = 500
+
+FEATURES_SQL = """
+WITH ids AS (
+    {ids}
+),
+sessions AS (
+    SELECT developer_id, last_viewed,
+           LAG(last_viewed) OVER (PARTITION BY developer_id ORDER BY last_viewed) AS prev_viewed
+    FROM developer_journey_trackings
+    WHERE developer_id IN (SELECT developer_id FROM ids)
+      AND last_viewed IS NOT NULL
+),
+tracking AS (
+    SELECT developer_id,
+           AVG({hour}) AS avg_hour,
+           AVG(gap) AS gap_mean,
+           AVG(gap * gap) AS gap_sq_mean
+    FROM (
+        SELECT developer_id, last_viewed,
+               CASE WHEN prev_viewed IS NULL THEN NULL ELSE {day_gap} END AS gap
+        FROM sessions
+    ) s
+    GROUP BY developer_id
+),
+completion AS (
+    SELECT developer_id,
+           AVG(CASE WHEN status = 'completed' THEN study_duration END) AS avg_duration,
+           SUM(enrolling_times - 1) AS retries
+    FROM developer_journey_completions
+    WHERE developer_id IN (SELECT developer_id FROM ids)
+    GROUP BY developer_id
+),
+exam AS (
+    SELECT developer_id, AVG(score) AS avg_score
+    FROM exam_results
+    WHERE developer_id IN (SELECT developer_id FROM ids)
+    GROUP BY developer_id
+),
+submission AS (
+    SELECT developer_id,
+           COUNT(*) AS total,
+           SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failed
+    FROM developer_journey_submissions
+    WHERE developer_id IN (SELECT developer_id FROM ids)
+    GROUP BY developer_id
+)
+SELECT ids.developer_id,
+       tracking.avg_hour, tracking.gap_mean, tracking.gap_sq_mean,
+       completion.avg_duration, completion.retries,
+       exam.avg_score,
+       submission.total, submission.failed
+FROM ids
+LEFT JOIN tracking ON tracking.developer_id = ids.developer_id
+LEFT JOIN completion ON completion.developer_id = ids.developer_id
+LEFT JOIN exam ON exam.developer_id = ids.developer_id
+LEFT JOIN submission ON submission.developer_id = ids.developer_id
+"""
+
+
+def build_query(n_users: int, dialect: str = "mysql") -> str:
+    """SQL agregasi untuk `n_users` user (parameter = daftar developer_id)"""
+
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unknown dialect: {dialect}")
+    if n_users < 1:
+        raise ValueError("n_users must be >= 1")
+
+    parts = DIALECTS[dialect]
+    ph = parts["placeholder"]
+    ids = f"SELECT {ph} AS developer_id" + f" UNION ALL SELECT {ph}" * (n_users - 1)
+    return FEATURES_SQL.format(ids=ids, hour=parts["hour"], day_gap=parts["day_gap"])
+
+
+def _to_features(row: Dict) -> Dict:
+    """Baris hasil query -> dict 6 fitur dengan default seperti versi lama"""
+
+    gap_mean = row["gap_mean"]
+    if gap_mean is None:
+        consistency_std = 0.0
+    else:
+        # Std populasi (sama dengan np.std): sqrt(E[x^2] - E[x]^2)
+        variance = float(row["gap_sq_mean"]) - float(gap_mean) ** 2
+        consistency_std = math.sqrt(max(variance, 0.0))
+
+    total = int(row["total"] or 0)
+    failed = int(row["failed"] or 0)
+
+    def value_or(key, feature):
+        return float(row[key]) if row[key] is not None else DEFAULTS[feature]
+
+    return {
+        "avg_study_hour": value_or("avg_hour", "avg_study_hour"),
+        "study_consistency_std": consistency_std,
+        "completion_speed": value_or("avg_duration", "completion_speed"),
+        "avg_exam_score": value_or("avg_score", "avg_exam_score"),
+        "submission_fail_rate": failed / total if total > 0 else 0.0,
+        "retry_count": int(row["retries"] or 0),
+    }
+
+
+def calculate_users_features(db_connection, user_ids: Iterable[int],
+                             dialect: str = "mysql") -> Dict[int, Dict]:
+    """
+    Fitur persona untuk banyak user: satu query per CHUNK_SIZE user.
+
+    Returns:
+        Dict developer_id -> dict fitur. User tanpa data tetap ada dengan
+        nilai default.
+    """
+    user_ids: List[int] = list(dict.fromkeys(int(u) for u in user_ids))
+    results = {}
+
+    cursor = db_connection.cursor()
+    try:
+        for start in range(0, len(user_ids), CHUNK_SIZE):
+            chunk = user_ids[start:start + CHUNK_SIZE]
+            cursor.execute(build_query(len(chunk), dialect), chunk)
+            columns = [desc[0] for desc in cursor.description]
+            for values in cursor.fetchall():
+                row = dict(zip(columns, values))
+                results[int(row["developer_id"])] = _to_features(row)
+    finally:
+        cursor.close()
+
+    return results
+
+
+def calculate_user_features(db_connection, user_id: int, dialect: str = "mysql") -> Dict:
+    """Fitur persona untuk satu user dengan satu query"""
+    return calculate_users_features(db_connection, [user_id], dialect)[int(user_id)]
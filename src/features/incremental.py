@@ -0,0 +1,433 @@
+"""
+Feature store inkremental: agregat berjalan per (developer_id, journey_id).
+
+Setiap event baru memperbarui agregat dalam O(1), sehingga fitur selalu
+segar tanpa menjalankan ulang notebook feature engineering. Tanggal belajar
+disimpan sebagai set; tanggal yang datang urut menambah satu jarak hari ke
+statistik berjalan, sedangkan tanggal yang datang tidak urut hanya menandai
+statistik jarak basi. Statistik itu dihitung ulang sekali saat fitur dibaca
+(O(d log d), d = jumlah tanggal unik journey tersebut, biasanya puluhan).
+Hasil fitur sama dengan features.events.compute_features untuk event yang
+sama. State disimpan ke snapshot JSON secara berkala dan dimuat saat start.
+
+Journey yang sudah punya baris di feature store CSV di-seed dari baris itu
+saat event pertamanya masuk (lihat JourneyAggregate.from_history), sehingga
+event live menambah histori, bukan menggantikannya.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from .events import FILL_VALUES, PASSED_STATUSES, PACE_FEATURES, PERSONA_FEATURES, MAX_COMPLETION_SPEED
+
+FEATURES = list(dict.fromkeys(PACE_FEATURES + PERSONA_FEATURES))
+
+# Hitungan modul dibulatkan setelah dirata-rata (sama dengan api/feature_store.py)
+COUNT_FEATURES = {"completed_modules", "total_modules_viewed"}
+
+SNAPSHOT_VERSION = 1
+
+
+def aggregate_features(rows) -> Dict[str, float]:
+    """
+    Fitur level user dari fitur per journey (bentuk sama dengan FeatureStore.get).
+    Semua kolom, termasuk hitungan modul, dirata-rata agar tetap dalam
+    distribusi per journey yang dipakai saat training.
+    """
+    features = {col: sum(row[col] for row in rows) / len(rows) for col in FEATURES}
+    for col in COUNT_FEATURES:
+        features[col] = float(round(features[col]))
+    features["journeys"] = len(rows)
+    return features
+
+
+class RunningStat:
+    """Mean dan standar deviasi populasi (ddof=0) dengan algoritma Welford"""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
+
+    def to_list(self) -> list:
+        return [self.n, self.mean, self.m2]
+
+
+class JourneyAggregate:
+    """State berjalan satu (developer_id, journey_id)"""
+
+    __slots__ = (
+        "modules_viewed", "modules_completed", "hour", "days", "last_day", "gaps", "gaps_stale",
+        "exam_score", "exams_passed", "exams_failed",
+        "submissions_passed", "submissions_failed",
+        "study_duration", "hours_to_study", "enrolling_times", "updated_at",
+        "base_std", "base_gaps", "base_speed",
+    )
+
+    def __init__(self):
+        self.modules_viewed = 0
+        self.modules_completed = 0
+        self.hour = RunningStat()
+        self.days = set()                   # ordinal tanggal unik
+        self.last_day = None                # tanggal terbaru yang pernah masuk
+        self.gaps = RunningStat()           # jarak hari antar tanggal unik berurutan
+        self.gaps_stale = False             # True jika ada tanggal yang datang tidak urut
+        self.exam_score = RunningStat()
+        self.exams_passed = 0
+        self.exams_failed = 0
+        self.submissions_passed = 0
+        self.submissions_failed = 0
+        self.study_duration = None
+        self.hours_to_study = None
+        self.enrolling_times = None
+        self.updated_at = 0.0
+        self.base_std = None                # std jarak hari histori CSV (tanggalnya tidak ada)
+        self.base_gaps = 0                  # bobot base_std saat digabung dengan jarak live
+        self.base_speed = None              # completion_speed histori sampai ada completion live
+
+    @classmethod
+    def from_history(cls, row: Dict) -> "JourneyAggregate":
+        """
+        Seed agregat dari baris fitur historis (bentuk FeatureStore.get).
+
+        Hitungan modul disalin persis. Rata-rata jam belajar diberi bobot
+        sejumlah modul yang dilihat, sedangkan nilai ujian dan rasio gagal
+        submission diberi bobot satu event karena jumlah event aslinya tidak
+        ada di tabel fitur. Tanggal belajar histori juga tidak ada, jadi std
+        jarak histori digabung (pooled) dengan jarak antar tanggal live dan
+        jarak antara histori dan tanggal live pertama diabaikan.
+        """
+        agg = cls()
+        viewed = int(row.get("total_modules_viewed", 0))
+        agg.modules_viewed = viewed
+        agg.modules_completed = int(row.get("completed_modules", 0))
+        agg.hour = RunningStat(max(viewed, 1), float(row["avg_study_hour"]))
+        agg.exam_score = RunningStat(1, float(row["avg_exam_score"]))
+        fail_rate = float(row.get("submission_fail_rate", 0.0))
+        if fail_rate > 0:
+            agg.submissions_failed = fail_rate
+            agg.submissions_passed = 1.0 - fail_rate
+        agg.enrolling_times = row.get("retry_count")
+        agg.base_std = float(row["study_consistency_std"])
+        agg.base_gaps = max(viewed - 1, 1)
+        agg.base_speed = float(row["completion_speed"])
+        return agg
+
+    def add_tracking(self, tutorial_id, last_viewed: Optional[datetime], completed_at):
+        if tutorial_id is not None:
+            self.modules_viewed += 1
+        if completed_at is not None:
+            self.modules_completed += 1
+        if last_viewed is None:
+            return
+
+        self.hour.add(last_viewed.hour)
+        day = last_viewed.toordinal()
+        if day in self.days:
+            return
+        self.days.add(day)
+
+        if self.last_day is None or day > self.last_day:
+            if self.last_day is not None:
+                self.gaps.add(day - self.last_day)
+            self.last_day = day
+        else:
+            # Tanggal di tengah memecah satu jarak lama; dihitung ulang saat dibaca
+            self.gaps_stale = True
+
+    def _refresh_gaps(self):
+        if not self.gaps_stale:
+            return
+        days = sorted(self.days)
+        self.gaps = RunningStat()
+        for prev_day, day in zip(days, days[1:]):
+            self.gaps.add(day - prev_day)
+        self.gaps_stale = False
+
+    def add_submission(self, status):
+        if status is None:
+            return
+        if status in PASSED_STATUSES:
+            self.submissions_passed += 1
+        else:
+            self.submissions_failed += 1
+
+    def add_exam(self, score, is_passed=None):
+        if score is not None:
+            self.exam_score.add(float(score))
+        if is_passed is True:
+            self.exams_passed += 1
+        elif is_passed is False:
+            self.exams_failed += 1
+
+    def set_completion(self, study_duration, enrolling_times, hours_to_study):
+        # Satu baris completion per journey: event terbaru menggantikan yang lama
+        self.study_duration = study_duration
+        self.enrolling_times = enrolling_times
+        self.hours_to_study = hours_to_study
+
+    def features(self) -> Dict[str, float]:
+        self._refresh_gaps()
+        submissions = self.submissions_passed + self.submissions_failed
+
+        speed = self.base_speed
+        if self.study_duration is not None and self.hours_to_study and self.hours_to_study > 0:
+            speed = min(self.study_duration / self.hours_to_study, MAX_COMPLETION_SPEED)
+
+        consistency = self.gaps.std if self.days else None
+        if self.base_std is not None:
+            consistency = math.sqrt(
+                (self.base_gaps * self.base_std ** 2 + self.gaps.m2) / (self.base_gaps + self.gaps.n)
+            )
+
+        values = {
+            "completion_speed": speed,
+            "study_consistency_std": consistency,
+            "avg_study_hour": self.hour.mean if self.hour.n else None,
+            "completed_modules": self.modules_completed,
+            "total_modules_viewed": self.modules_viewed,
+            "avg_exam_score": self.exam_score.mean if self.exam_score.n else None,
+            "submission_fail_rate": self.submissions_failed / submissions if submissions else 0.0,
+            "retry_count": self.enrolling_times or 0,
+        }
+        return {
+            col: float(FILL_VALUES.get(col, 0.0) if value is None else value)
+            for col, value in values.items()
+        }
+
+    def to_dict(self) -> dict:
+        """Salinan state (dipanggil di bawah lock store, aman di-dump setelahnya)"""
+        self._refresh_gaps()
+        return {
+            "modules_viewed": self.modules_viewed,
+            "modules_completed": self.modules_completed,
+            "hour": self.hour.to_list(),
+            "dates": sorted(self.days),
+            "gaps": self.gaps.to_list(),
+            "exam_score": self.exam_score.to_list(),
+            "exams_passed": self.exams_passed,
+            "exams_failed": self.exams_failed,
+            "submissions_passed": self.submissions_passed,
+            "submissions_failed": self.submissions_failed,
+            "study_duration": self.study_duration,
+            "hours_to_study": self.hours_to_study,
+            "enrolling_times": self.enrolling_times,
+            "updated_at": self.updated_at,
+            "base_std": self.base_std,
+            "base_gaps": self.base_gaps,
+            "base_speed": self.base_speed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JourneyAggregate":
+        agg = cls()
+        for key, value in data.items():
+            if key in ("hour", "gaps", "exam_score"):
+                value = RunningStat(*value)
+            if key == "dates":
+                agg.days = set(value)
+                agg.last_day = max(value) if value else None
+                continue
+            setattr(agg, key, value)
+        return agg
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+class IncrementalFeatureStore:
+    """
+    Agregat fitur berjalan yang diperbarui per event.
+
+    Event memakai bentuk yang sama dengan features.events (dict per baris
+    tracking, submission, exam dan completion). Aman dipanggil dari banyak
+    thread; snapshot ditulis atomik (file sementara lalu os.replace).
+
+    history(developer_id, journey_id) opsional mengembalikan baris fitur
+    historis journey (mis. FeatureStore.get) untuk seed agregat baru.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None,
+                 history: Optional[Callable[[int, int], Optional[Dict]]] = None):
+        self.snapshot_path = snapshot_path or None
+        self.history = history
+        self._journeys: Dict[int, Dict[int, JourneyAggregate]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.events_total = 0
+        self.snapshots_total = 0
+        self.last_snapshot_at = None
+
+    def _aggregate(self, developer_id: int, journey_id: int) -> JourneyAggregate:
+        journeys = self._journeys.setdefault(int(developer_id), {})
+        agg = journeys.get(int(journey_id))
+        if agg is None:
+            row = self.history(int(developer_id), int(journey_id)) if self.history else None
+            agg = JourneyAggregate.from_history(row) if row else JourneyAggregate()
+            journeys[int(journey_id)] = agg
+        return agg
+
+    def ingest(self, trackings: Iterable[dict] = (), submissions: Iterable[dict] = (),
+               exams: Iterable[dict] = (), completions: Iterable[dict] = ()) -> int:
+        """Terapkan event baru ke agregat; mengembalikan jumlah event yang diproses"""
+        now = time.time()
+        count = 0
+
+        with self._lock:
+            for event in trackings:
+                agg = self._aggregate(event["developer_id"], event["journey_id"])
+                agg.add_tracking(event.get("tutorial_id"), _as_datetime(event.get("last_viewed")),
+                                 event.get("completed_at"))
+                agg.updated_at = now
+                count += 1
+
+            for event in submissions:
+                agg = self._aggregate(event["developer_id"], event["journey_id"])
+                agg.add_submission(event.get("status"))
+                agg.updated_at = now
+                count += 1
+
+            for event in exams:
+                agg = self._aggregate(event["developer_id"], event["journey_id"])
+                agg.add_exam(event.get("score"), event.get("is_passed"))
+                agg.updated_at = now
+                count += 1
+
+            for event in completions:
+                agg = self._aggregate(event["developer_id"], event["journey_id"])
+                agg.set_completion(event.get("study_duration"), event.get("enrolling_times"),
+                                   event.get("hours_to_study"))
+                agg.updated_at = now
+                count += 1
+
+            self.events_total += count
+            self._dirty = self._dirty or count > 0
+        return count
+
+    def get(self, developer_id: int, journey_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Fitur satu journey, atau agregasi semua journey user jika journey_id
+        None (bentuk sama dengan FeatureStore.get). None jika belum ada event.
+        """
+        with self._lock:
+            journeys = self._journeys.get(int(developer_id))
+            if not journeys:
+                return None
+
+            if journey_id is not None:
+                agg = journeys.get(int(journey_id))
+                if agg is None:
+                    return None
+                features = agg.features()
+                features["journeys"] = 1
+                return features
+
+            rows = [agg.features() for agg in journeys.values()]
+
+        return aggregate_features(rows)
+
+    def get_journeys(self, developer_id: int) -> Dict[int, Dict]:
+        """Fitur per journey_id untuk satu user; dict kosong jika belum ada event"""
+        with self._lock:
+            journeys = self._journeys.get(int(developer_id), {})
+            return {journey_id: agg.features() for journey_id, agg in journeys.items()}
+
+    def save_snapshot(self, force: bool = False) -> bool:
+        """Tulis state ke disk jika ada perubahan sejak snapshot terakhir"""
+        if not self.snapshot_path:
+            return False
+
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            entries = [
+                {"developer_id": developer_id, "journey_id": journey_id, **agg.to_dict()}
+                for developer_id, journeys in self._journeys.items()
+                for journey_id, agg in journeys.items()
+            ]
+            self._dirty = False
+
+        payload = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "entries": entries}
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            with self._lock:
+                self._dirty = True
+            print(f"[ERROR] Failed to save feature snapshot: {e}")
+            return False
+
+        self.snapshots_total += 1
+        self.last_snapshot_at = payload["saved_at"]
+        return True
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            with open(self.snapshot_path) as f:
+                payload = json.load(f)
+            if payload.get("version") != SNAPSHOT_VERSION:
+                print(f"[WARN] Unsupported feature snapshot version: {payload.get('version')}")
+                return False
+
+            journeys: Dict[int, Dict[int, JourneyAggregate]] = {}
+            for entry in payload["entries"]:
+                developer_id = entry.pop("developer_id")
+                journey_id = entry.pop("journey_id")
+                journeys.setdefault(developer_id, {})[journey_id] = JourneyAggregate.from_dict(entry)
+        except Exception as e:
+            print(f"[ERROR] Failed to load feature snapshot: {e}")
+            return False
+
+        with self._lock:
+            self._journeys = journeys
+            self._dirty = False
+        self.last_snapshot_at = payload.get("saved_at")
+        print(f"[OK] Live features restored ({sum(len(j) for j in journeys.values())} journeys, "
+              f"{len(journeys)} users)")
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            users = len(self._journeys)
+            keys = sum(len(journeys) for journeys in self._journeys.values())
+            dirty = self._dirty
+        return {
+            "users": users,
+            "journeys": keys,
+            "events_total": self.events_total,
+            "dirty": dirty,
+            "snapshot_path": self.snapshot_path,
+            "snapshots_total": self.snapshots_total,
+            "last_snapshot_at": self.last_snapshot_at,
+        }
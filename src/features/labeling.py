@@ -0,0 +1,100 @@
+"""
+Aturan pelabelan yang dipakai bersama oleh training dan API.
+
+Label pace (notebook 07) dan persona (notebook 06) serta kategori/percentile
+kecepatan (notebook 02) dihitung secara vectorized: percentile memakai
+groupby().rank() dan aturan berprioritas memakai np.select, sehingga waktu
+relabel tumbuh linear dengan jumlah baris. Fallback rule-based di
+PaceService/PersonaService memanggil fungsi yang sama agar label API selalu
+konsisten dengan label data training.
+
+Nilai NaN tidak memenuhi kondisi apa pun sehingga jatuh ke label default,
+sama seperti perbandingan if/else per baris di notebook.
+"""
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[pd.Series, np.ndarray, list, float]
+
+# ---------- Pace (notebook 07) ----------
+PACE_FAST_MAX_SPEED = 0.55
+PACE_REFLECTIVE_MIN_SPEED = 1.5
+PACE_DEFAULT = "consistent learner"
+
+# ---------- Persona (notebook 06), urut sesuai prioritas ----------
+PERSONA_NIGHT_MIN_HOUR = 19
+PERSONA_DEFAULT = "The Consistent"
+
+# ---------- Kategori (notebook 02) ----------
+SPEED_BINS = [0, 0.7, 1.3, float("inf")]
+SPEED_LABELS = ["Fast (< 70%)", "Normal (70-130%)", "Slow (> 130%)"]
+HOUR_BINS = [0, 6, 12, 18, 24]
+HOUR_LABELS = ["Night (0-6)", "Morning (6-12)", "Afternoon (12-18)", "Evening (18-24)"]
+PERFORMANCE_BINS = [0, 40, 70, 100]
+PERFORMANCE_LABELS = ["Low", "Medium", "High"]
+
+
+def _values(x: ArrayLike) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def pace_labels(completion_speed: ArrayLike) -> np.ndarray:
+    """Label pace per baris dari rasio study_duration / hours_to_study"""
+    speed = _values(completion_speed)
+    return np.select(
+        [speed < PACE_FAST_MAX_SPEED, speed > PACE_REFLECTIVE_MIN_SPEED],
+        ["fast learner", "reflective learner"],
+        default=PACE_DEFAULT,
+    ).astype(object)
+
+
+def persona_labels(avg_study_hour: ArrayLike, completion_speed: ArrayLike,
+                   avg_exam_score: ArrayLike, submission_fail_rate: ArrayLike) -> np.ndarray:
+    """Label persona per baris; kondisi pertama yang terpenuhi menang"""
+    hour = _values(avg_study_hour)
+    speed = _values(completion_speed)
+    score = _values(avg_exam_score)
+    fail_rate = _values(submission_fail_rate)
+
+    return np.select(
+        [
+            hour >= PERSONA_NIGHT_MIN_HOUR,
+            (score < 60) & (fail_rate > 0.3),
+            (speed < 0.5) & (score >= 75),
+            (speed > 2.0) & (score >= 70),
+        ],
+        ["The Night Owl", "The Struggler", "The Sprinter", "The Deep Diver"],
+        default=PERSONA_DEFAULT,
+    ).astype(object)
+
+
+def assign_pace_labels(df: pd.DataFrame) -> pd.Series:
+    """Pengganti df.apply(assign_pace_label, axis=1) di notebook 07"""
+    return pd.Series(pace_labels(df["completion_speed"]), index=df.index, name="pace_label")
+
+
+def assign_persona_labels(df: pd.DataFrame) -> pd.Series:
+    """Pengganti df.apply(assign_persona, axis=1) di notebook 06"""
+    labels = persona_labels(df["avg_study_hour"], df["completion_speed"],
+                            df["avg_exam_score"], df["submission_fail_rate"])
+    return pd.Series(labels, index=df.index, name="persona_label")
+
+
+def speed_percentile(df: pd.DataFrame, value: str = "study_duration", by: str = "journey_id") -> pd.Series:
+    """Percentile rank (0-100] `value` di dalam setiap `by`, satu kali groupby"""
+    return df.groupby(by)[value].rank(pct=True) * 100
+
+
+def speed_category(completion_speed: pd.Series) -> pd.Series:
+    return pd.cut(completion_speed, bins=SPEED_BINS, labels=SPEED_LABELS)
+
+
+def study_time_slot(avg_study_hour: pd.Series) -> pd.Series:
+    return pd.cut(avg_study_hour, bins=HOUR_BINS, labels=HOUR_LABELS)
+
+
+def performance_level(performance_score: pd.Series) -> pd.Series:
+    return pd.cut(performance_score, bins=PERFORMANCE_BINS, labels=PERFORMANCE_LABELS)
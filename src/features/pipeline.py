@@ -0,0 +1,383 @@
+"""
+Pipeline feature engineering (pengganti notebooks/02_feature_engineering.ipynb).
+
+Menghasilkan clustering_features.csv, pace_features.csv dan advice_context.csv
+yang identik byte-per-byte dengan output notebook. Tabel event besar
+(trackings, submissions, exam_results) dibaca per chunk dan diagregasi
+sebagian; yang disimpan di memori hanya agregat per (developer_id, journey_id)
+dan tanggal unik belajar per journey, sehingga memori puncak tidak tumbuh
+mengikuti jumlah baris tracking. Tabel referensi kecil (users, journeys,
+tutorials, completions, exam_registrations) tetap dibaca utuh.
+
+Catatan: stuck tutorial dipilih dari tracking belum selesai dengan
+last_viewed terbaru; jika ada dua baris dengan last_viewed sama persis,
+dipilih baris yang muncul lebih dulu di file (notebook memakai sort yang
+tidak stabil sehingga hasilnya tidak tentu untuk kasus ini).
+
+Run (dari folder src):
+    python -m features.pipeline
+    python -m features.pipeline --interim-dir ../data/interim --processed-dir ../data/processed --chunksize 100000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .labeling import performance_level, speed_category, speed_percentile, study_time_slot
+from .schema import read_table
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INTERIM_DIR = os.path.join(BASE_DIR, "data", "interim")
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+
+KEYS = ["developer_id", "journey_id"]
+DEFAULT_CHUNKSIZE = 200_000
+
+CLUSTERING_COLUMNS = [
+    'developer_id', 'journey_id', 'name',
+    'avg_study_hour', 'study_consistency_std', 'study_consistency_ratio',
+    'completed_modules', 'total_modules_viewed',
+    'avg_exam_score', 'exam_pass_rate', 'exam_fail_count',
+    'avg_submission_rating', 'submission_pass_rate', 'submission_fail_count', 'submission_fail_rate',
+    'completion_speed', 'retry_count',
+    'performance_score', 'struggle_score',
+    'study_time_slot', 'performance_level', 'speed_category', 'difficulty'
+]
+
+PACE_COLUMNS = [
+    'developer_id', 'journey_id', 'name', 'difficulty', 'hours_to_study',
+    'study_duration', 'completion_speed',
+    'completed_modules', 'total_modules_viewed',
+    'avg_study_hour', 'study_consistency_std', 'study_consistency_ratio'
+]
+
+ADVICE_COLUMNS = [
+    'developer_id', 'journey_id', 'name',
+    'avg_study_hour', 'study_time_slot',
+    'avg_exam_score', 'exam_fail_count',
+    'avg_submission_rating', 'submission_fail_count',
+    'completion_speed',
+    'performance_level', 'struggle_score'
+]
+
+
+def _chunks(table: str, path: str, chunksize: int, usecols: list):
+    # Metrik tidak diubah agar hasil identik dengan notebook; ID/flag/tanggal ringkas
+    return read_table(table, path, usecols=usecols, compact_floats=False, chunksize=chunksize)
+
+
+def _reference(table: str, path: str) -> pd.DataFrame:
+    return read_table(table, path, compact_floats=False)
+
+
+def _combine(acc, partial, how: dict, keys=KEYS):
+    """Gabungkan agregat parsial chunk ke agregat berjalan"""
+    if acc is None:
+        return partial
+    return pd.concat([acc, partial]).groupby(keys).agg(how)
+
+
+# ============================================================
+# TRACKINGS
+# ============================================================
+
+def aggregate_trackings(path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Returns:
+        (tracking_agg, stuck_tutorials) dengan kolom dan urutan baris sama
+        seperti notebook
+    """
+    counts = None          # total_modules_viewed, completed_modules, hour_sum, hour_count
+    dates = None           # tanggal unik per (developer_id, journey_id)
+    stuck = None           # kandidat stuck tutorial per (developer_id, journey_id)
+    offset = 0
+
+    for chunk in _chunks('trackings', path, chunksize,
+                         usecols=KEYS + ['tutorial_id', 'last_viewed', 'completed_at']):
+        hour = chunk['last_viewed'].dt.hour
+        partial = chunk[KEYS].assign(
+            total_modules_viewed=chunk['tutorial_id'].notna().astype(np.int64),
+            completed_modules=chunk['completed_at'].notna().astype(np.int64),
+            hour_sum=hour.fillna(0).astype(np.int64),
+            hour_count=hour.notna().astype(np.int64),
+        ).groupby(KEYS).sum()
+        counts = _combine(counts, partial, "sum")
+
+        viewed = chunk.dropna(subset=['last_viewed'])
+        day = viewed[KEYS].assign(date=viewed['last_viewed'].dt.normalize()).drop_duplicates()
+        dates = day if dates is None else pd.concat([dates, day]).drop_duplicates()
+
+        # Baris belum selesai dengan last_viewed terbaru; urutan file jadi tie-breaker
+        open_rows = chunk[chunk['completed_at'].isnull()][KEYS + ['last_viewed', 'tutorial_id']]
+        open_rows = open_rows.assign(row=np.arange(offset, offset + len(chunk))[
+            chunk['completed_at'].isnull().to_numpy()])
+        candidates = open_rows if stuck is None else pd.concat([stuck, open_rows])
+        stuck = (candidates.sort_values(['last_viewed', 'row'], ascending=[False, True],
+                                        na_position='last', kind='mergesort')
+                 .drop_duplicates(subset=KEYS, keep='first'))
+        offset += len(chunk)
+
+    tracking_agg = counts[['total_modules_viewed', 'completed_modules']].reset_index()
+
+    # Feature 1: avg_study_hour (jam integer -> jumlah/banyak sama persis dengan mean)
+    with_hours = counts[counts['hour_count'] > 0]
+    hour_agg = (with_hours['hour_sum'] / with_hours['hour_count']).rename('avg_study_hour').reset_index()
+    tracking_agg = tracking_agg.merge(hour_agg, on=KEYS, how='left')
+
+    # Feature 2: study_consistency_std + study_consistency_ratio dari tanggal unik
+    dates = dates.sort_values(KEYS + ['date'])
+    consistency, ratio = _consistency(dates)
+    tracking_agg = tracking_agg.merge(consistency, on=KEYS, how='left')
+    tracking_agg = tracking_agg.merge(ratio, on=KEYS, how='left')
+
+    stuck_tutorials = stuck.sort_values(KEYS)[KEYS + ['tutorial_id']].reset_index(drop=True)
+    stuck_tutorials.columns = ['developer_id', 'journey_id', 'stuck_tutorial_id']
+    return tracking_agg, stuck_tutorials
+
+
+def _consistency(dates: pd.DataFrame):
+    """
+    Std jarak hari antar tanggal unik (np.std seperti notebook) dan rasio hari
+    aktif terhadap rentang hari, per (developer_id, journey_id)
+    """
+    days = dates['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    groups = dates[KEYS].drop_duplicates()
+    starts = np.flatnonzero(~dates[KEYS].duplicated().to_numpy())
+    bounds = np.append(starts, len(days))
+
+    std_values, ratio_values = [], []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        group_days = days[start:end]
+        if len(group_days) <= 1:
+            std_values.append(0)
+        else:
+            std_values.append(np.std(np.diff(group_days)))
+
+        span = int(group_days[-1] - group_days[0])
+        ratio_values.append(len(group_days) / (span + 1) if span > 0 else 1)
+
+    index = pd.MultiIndex.from_frame(groups)
+    consistency = pd.Series(std_values, index=index, name='study_consistency_std').reset_index()
+    ratio = pd.Series(ratio_values, index=index, name='study_consistency_ratio').reset_index()
+    return consistency, ratio
+
+
+# ============================================================
+# SUBMISSIONS & EXAMS
+# ============================================================
+
+def aggregate_submissions(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    keys = ['submitter_id', 'journey_id']
+    acc = None
+    has_missing_status = False
+
+    for chunk in _chunks('submissions', path, chunksize,
+                         usecols=keys + ['rating', 'status', 'submission_duration']):
+        status = chunk['status']
+        has_missing_status = has_missing_status or bool(status.isna().any())
+        is_passed = np.where(status.isin(['passed', 'approved']), 1.0,
+                             np.where(status.notna(), 0.0, np.nan))
+
+        frame = chunk[keys].assign(
+            rating_sum=chunk['rating'], rating_count=chunk['rating'].notna(),
+            passed_sum=is_passed, passed_count=~np.isnan(is_passed),
+            duration_sum=chunk['submission_duration'],
+            duration_count=chunk['submission_duration'].notna(),
+        )
+        partial = frame.groupby(keys).sum()
+        acc = _combine(acc, partial, "sum", keys)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        agg = pd.DataFrame({
+            'avg_submission_rating': acc['rating_sum'] / acc['rating_count'].replace(0, np.nan),
+            'submission_pass_rate': acc['passed_sum'] / acc['passed_count'].replace(0, np.nan),
+            'submissions_passed': acc['passed_sum'],
+            'total_submissions': acc['passed_count'].astype(np.int64),
+            'avg_submission_duration': acc['duration_sum'] / acc['duration_count'].replace(0, np.nan),
+        }).reset_index()
+
+    # Tanpa status kosong, kolom is_passed di notebook bertipe integer
+    if not has_missing_status:
+        agg['submissions_passed'] = agg['submissions_passed'].astype(np.int64)
+
+    agg.columns = ['developer_id', 'journey_id', 'avg_submission_rating',
+                   'submission_pass_rate', 'submissions_passed', 'total_submissions',
+                   'avg_submission_duration']
+
+    agg['submission_fail_count'] = agg['total_submissions'] - agg['submissions_passed']
+    agg['submission_fail_rate'] = agg['submission_fail_count'] / agg['total_submissions']
+    agg['submission_fail_rate'] = agg['submission_fail_rate'].replace([np.inf, -np.inf], 0)
+    return agg
+
+
+def aggregate_exams(results_path: str, registrations: pd.DataFrame, tutorials: pd.DataFrame,
+                    chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    keys = ['examinees_id', 'developer_journey_id']
+    registrations = registrations[['id', 'examinees_id', 'tutorial_id']]
+    tutorials = tutorials[['id', 'developer_journey_id']]
+    acc = None
+
+    for chunk in _chunks('exam_results', results_path, chunksize,
+                         usecols=['exam_registration_id', 'score', 'is_passed']):
+        full = chunk.merge(registrations, left_on='exam_registration_id', right_on='id', how='left')
+        full = full.merge(tutorials, left_on='tutorial_id', right_on='id', how='left',
+                          suffixes=('', '_tutorial'))
+        partial = full[keys].assign(
+            score_sum=full['score'], score_count=full['score'].notna(),
+            passed_sum=full['is_passed'], passed_count=full['is_passed'].notna(),
+        ).groupby(keys).sum()
+        acc = _combine(acc, partial, "sum", keys)
+
+    agg = pd.DataFrame({
+        'avg_exam_score': acc['score_sum'] / acc['score_count'].replace(0, np.nan),
+        'exam_pass_rate': acc['passed_sum'] / acc['passed_count'].replace(0, np.nan),
+        'exams_passed': acc['passed_sum'],
+        'total_exams': acc['passed_count'].astype(np.int64),
+    }).reset_index()
+    agg.columns = ['developer_id', 'journey_id', 'avg_exam_score',
+                   'exam_pass_rate', 'exams_passed', 'total_exams']
+    agg['exam_fail_count'] = agg['total_exams'] - agg['exams_passed']
+    return agg
+
+
+# ============================================================
+# MERGE, DERIVED FEATURES & NaN HANDLING (sama dengan notebook)
+# ============================================================
+
+def _fill_median(df: pd.DataFrame, columns: list):
+    for col in columns:
+        if col in df.columns and df[col].isnull().sum() > 0:
+            fill_value = df[col].median() if df[col].notna().any() else 0
+            df[col] = df[col].fillna(fill_value)
+
+
+def build_clustering(tracking_agg, submission_agg, exam_agg, completions, journeys) -> pd.DataFrame:
+    completion_features = completions[['user_id', 'journey_id', 'study_duration',
+                                       'enrolling_times', 'avg_submission_rating']].copy()
+    completion_features.columns = ['developer_id', 'journey_id', 'study_duration',
+                                   'retry_count', 'completion_avg_rating']
+
+    df = tracking_agg.copy()
+    df = df.merge(submission_agg, on=KEYS, how='left')
+    df = df.merge(exam_agg, on=KEYS, how='left')
+    df = df.merge(completion_features, on=KEYS, how='left')
+    df = df.merge(journeys[['id', 'name', 'difficulty', 'hours_to_study']],
+                  left_on='journey_id', right_on='id', how='left', suffixes=('', '_journey'))
+
+    df['completion_speed'] = np.where(
+        (df['hours_to_study'] > 0) & (df['study_duration'].notna()),
+        df['study_duration'] / df['hours_to_study'],
+        np.nan
+    )
+    df['completion_speed'] = df['completion_speed'].clip(upper=10)
+    df['performance_score'] = (
+        df['avg_exam_score'].fillna(0) * 0.4 +
+        df['avg_submission_rating'].fillna(0) * 20 * 0.6
+    )
+    df['struggle_score'] = (
+        df['exam_fail_count'].fillna(0) +
+        df['submission_fail_count'].fillna(0) * 2
+    )
+    df['speed_category'] = speed_category(df['completion_speed'])
+    df['study_time_slot'] = study_time_slot(df['avg_study_hour'])
+    df['performance_level'] = performance_level(df['performance_score'])
+
+    df = df.dropna(subset=['id', 'name'])
+
+    count_cols = [
+        'submission_fail_count', 'submissions_passed', 'total_submissions',
+        'exams_passed', 'total_exams', 'exam_fail_count',
+        'retry_count', 'completed_modules', 'total_modules_viewed'
+    ]
+    rate_cols = ['submission_pass_rate', 'submission_fail_rate', 'exam_pass_rate']
+    for col in count_cols + rate_cols:
+        if col in df.columns and df[col].isnull().sum() > 0:
+            df[col] = df[col].fillna(0)
+
+    _fill_median(df, ['avg_submission_rating', 'avg_submission_duration',
+                      'completion_avg_rating', 'study_duration'])
+    _fill_median(df, ['avg_exam_score', 'avg_study_hour', 'study_consistency_std',
+                      'study_consistency_ratio', 'performance_score', 'struggle_score',
+                      'completion_speed', 'difficulty', 'hours_to_study'])
+
+    for col in ['study_time_slot', 'performance_level', 'speed_category']:
+        if col in df.columns and df[col].isnull().sum() > 0:
+            mode_values = df[col].dropna().mode()
+            df[col] = df[col].fillna(mode_values[0] if not mode_values.empty else 'Unknown')
+    return df
+
+
+def build_pace(clustering_df: pd.DataFrame) -> pd.DataFrame:
+    pace_df = clustering_df[PACE_COLUMNS].dropna(subset=['study_duration']).copy()
+    pace_df['speed_percentile'] = speed_percentile(pace_df)
+    pace_df['speed_category'] = speed_category(pace_df['completion_speed'])
+    return pace_df
+
+
+def build_advice(clustering_df: pd.DataFrame, stuck_tutorials: pd.DataFrame,
+                 users: pd.DataFrame) -> pd.DataFrame:
+    advice_df = clustering_df[ADVICE_COLUMNS].copy()
+    advice_df['speed_category'] = clustering_df['speed_category']
+    advice_df = advice_df.merge(users[['id', 'display_name']],
+                                left_on='developer_id', right_on='id', how='left')
+    advice_df = advice_df.merge(stuck_tutorials, on=KEYS, how='left')
+    advice_df['cluster_label'] = None
+    advice_df['pace_insight'] = None
+    return advice_df
+
+
+def build_outputs(interim_dir: str = INTERIM_DIR, chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+    """Bangun ketiga dataset; mengembalikan {nama file: DataFrame}"""
+
+    def path(name):
+        return os.path.join(interim_dir, name)
+
+    tracking_agg, stuck_tutorials = aggregate_trackings(path('trackings_clean.csv'), chunksize)
+    submission_agg = aggregate_submissions(path('submissions_clean.csv'), chunksize)
+    exam_agg = aggregate_exams(path('exam_results_clean.csv'),
+                               _reference('exam_registrations', path('exam_registrations_clean.csv')),
+                               _reference('tutorials', path('tutorials_clean.csv')), chunksize)
+
+    clustering_df = build_clustering(tracking_agg, submission_agg, exam_agg,
+                                     _reference('completions', path('completions_clean.csv')),
+                                     _reference('journeys', path('journeys_clean.csv')))
+
+    return {
+        'clustering_features.csv': clustering_df[CLUSTERING_COLUMNS].copy(),
+        'pace_features.csv': build_pace(clustering_df),
+        'advice_context.csv': build_advice(clustering_df, stuck_tutorials,
+                                           _reference('users', path('users_clean.csv'))),
+    }
+
+
+def run(interim_dir: str = INTERIM_DIR, processed_dir: str = PROCESSED_DIR,
+        chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+    started = time.perf_counter()
+    outputs = build_outputs(interim_dir, chunksize)
+
+    os.makedirs(processed_dir, exist_ok=True)
+    paths = {}
+    for name, df in outputs.items():
+        paths[name] = os.path.join(processed_dir, name)
+        df.to_csv(paths[name], index=False)
+        print(f"[OK] Saved {paths[name]} ({len(df)} rows)")
+
+    print(f"[OK] Feature pipeline finished in {time.perf_counter() - started:.1f}s")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature engineering pipeline (chunked)")
+    parser.add_argument("--interim-dir", default=INTERIM_DIR)
+    parser.add_argument("--processed-dir", default=PROCESSED_DIR)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Jumlah baris per chunk saat membaca tabel event")
+    args = parser.parse_args()
+    run(args.interim_dir, args.processed_dir, args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Cache Parquet untuk workbook mentah di data/raw/*.xlsx.
+
+Parsing Excel lewat openpyxl adalah langkah paling lambat di pipeline; di sini
+setiap workbook dikonversi sekali ke Parquet (kolumnar, bertipe) lalu
+pembacaan berikutnya memakai file Parquet dengan memory mapping.
+
+Invalidasi: metadata sumber (mtime, ukuran, sha256) disimpan di file
+`<nama>-<hash path>.meta.json` di samping Parquet. Jika mtime dan ukuran sama, cache
+langsung dipakai; jika berbeda, hash isi dihitung ulang dan cache hanya
+dibangun ulang bila isi benar-benar berubah (misal file hanya di-touch).
+
+Tanpa pyarrow, loader kembali membaca Excel langsung.
+
+Run (dari folder src) untuk menghangatkan cache semua workbook:
+    python -m features.raw_cache
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "raw")
+
+# Naikkan jika format cache berubah agar cache lama dibangun ulang
+CACHE_VERSION = 1
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_info(path: str) -> dict:
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _cache_paths(source_path: str, cache_dir: str):
+    """Nama cache = nama workbook + hash path absolutnya, agar workbook bernama
+    sama di folder berbeda tidak saling menimpa"""
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    key = hashlib.sha256(os.path.abspath(source_path).encode()).hexdigest()[:12]
+    base = os.path.join(cache_dir, f"{name}-{key}")
+    return f"{base}.parquet", f"{base}.meta.json"
+
+
+def _read_meta(meta_path: str):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path: str, write):
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_meta(meta_path: str, meta: dict):
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+    _write_atomic(meta_path, write)
+
+
+def _to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Kolom object dengan tipe campuran disimpan sebagai string (Parquet butuh satu tipe)"""
+    for col in df.columns:
+        if df[col].dtype == object and df[col].dropna().map(type).nunique() > 1:
+            print(f"[WARN] Column '{col}' has mixed types, cached as string")
+            df[col] = df[col].astype("string")
+    return df
+
+
+def is_fresh(source_path: str, cache_dir: str = CACHE_DIR) -> bool:
+    """True jika cache Parquet untuk source_path ada dan masih sesuai sumbernya"""
+    parquet_path, meta_path = _cache_paths(source_path, cache_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("version") != CACHE_VERSION or not os.path.exists(parquet_path):
+        return False
+
+    info = _source_info(source_path)
+    if info["mtime_ns"] == meta["mtime_ns"] and info["size"] == meta["size"]:
+        return True
+
+    # mtime/ukuran berubah: cek isi. Jika sama, cukup perbarui metadata
+    if info["size"] == meta["size"] and _file_hash(source_path) == meta["sha256"]:
+        _write_meta(meta_path, {**meta, **info})
+        return True
+    return False
+
+
+def materialize(source_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """Konversi satu workbook ke Parquet (atomik); mengembalikan path Parquet"""
+    parquet_path, meta_path = _cache_paths(source_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    info = _source_info(source_path)
+    sha256 = _file_hash(source_path)
+    df = _to_columnar(pd.read_excel(source_path))
+
+    _write_atomic(parquet_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    _write_meta(meta_path, {
+        "version": CACHE_VERSION,
+        "source": os.path.basename(source_path),
+        "sha256": sha256,
+        "rows": len(df),
+        "created_at": time.time(),
+        **info,
+    })
+
+    print(f"[OK] Cached {os.path.basename(source_path)} -> {parquet_path} "
+          f"({len(df)} rows, {time.perf_counter() - started:.2f}s)")
+    return parquet_path
+
+
+def read_excel_cached(source_path: str, cache_dir: str = CACHE_DIR, **read_kwargs) -> pd.DataFrame:
+    """
+    Pengganti pd.read_excel: baca dari cache Parquet, bangun cache jika
+    belum ada atau sumbernya berubah.
+    """
+    # Opsi baca khusus (sheet, kolom, ...) tidak di-cache agar tidak menimpa cache default
+    if not PARQUET_AVAILABLE or read_kwargs:
+        return pd.read_excel(source_path, **read_kwargs)
+
+    parquet_path, _ = _cache_paths(source_path, cache_dir)
+    if not is_fresh(source_path, cache_dir):
+        materialize(source_path, cache_dir)
+
+    return pd.read_parquet(parquet_path, memory_map=True)
+
+
+def load_raw(name: str, raw_dir: str = RAW_DIR, cache_dir: str = CACHE_DIR) -> pd.DataFrame:
+    """Baca data/raw/<name>.xlsx lewat cache, misal load_raw("exam_results")"""
+    return read_excel_cached(os.path.join(raw_dir, f"{name}.xlsx"), cache_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize data/raw/*.xlsx ke cache Parquet")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="Bangun ulang walau cache masih valid")
+    args = parser.parse_args()
+
+    if not PARQUET_AVAILABLE:
+        print("[ERROR] pyarrow is not installed (pip install pyarrow)")
+        return
+
+    for source_path in sorted(glob.glob(os.path.join(args.raw_dir, "*.xlsx"))):
+        if args.force or not is_fresh(source_path, args.cache_dir):
+            materialize(source_path, args.cache_dir)
+        else:
+            print(f"[OK] {os.path.basename(source_path)} is up to date")
+
+
+if __name__ == "__main__":
+    main()
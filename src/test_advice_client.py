@@ -0,0 +1,457 @@
+"""
+Test AdviceService async terhadap server lokal tiruan chat-completions API.
+
+Run: python -m pytest src/test_advice_client.py
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cache import AdviceCache
+from circuit import CircuitBreaker
+from services import AdviceService
+
+
+class FakeCompletions(BaseHTTPRequestHandler):
+    """Meniru POST /chat/completions dengan delay tetap"""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.05
+    status = 200
+    content = "  Saran dari LLM  "
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.clients.add(self.client_address)
+            server.requests += 1
+            server.prompts.append(None)
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.prompts[-1] = body["messages"][0]["content"]
+        time.sleep(self.delay)
+
+        with server.lock:
+            server.active -= 1
+
+        if self.status != 200:
+            payload = json.dumps({"error": {"message": "upstream down"}}).encode()
+        elif body.get("stream"):
+            payload = self.stream_payload(body["model"])
+        else:
+            payload = json.dumps({
+                "id": "cmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": self.content}
+                }]
+            }).encode()
+
+        self.send_response(self.status)
+        self.send_header("Content-Type", "text/event-stream" if body.get("stream") else "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream_payload(self, model):
+        """Konten dipecah per 3 karakter sebagai chunk chat.completion.chunk"""
+        events = []
+        for i in range(0, len(self.content), 3):
+            chunk = {
+                "id": "cmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": self.content[i:i + 3]},
+                             "finish_reason": None}]
+            }
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        return "".join(events).encode()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCompletions)
+    server.lock = threading.Lock()
+    server.active = server.peak = server.requests = 0
+    server.clients = set()
+    server.prompts = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    FakeCompletions.status = 200
+    FakeCompletions.delay = 0.05
+    FakeCompletions.content = "  Saran dari LLM  "
+
+
+def make_service(server, max_concurrency=8, deadline_ms=5000, breaker=None):
+    host, port = server.server_address
+    return AdviceService(api_key="test-key", base_url=f"http://{host}:{port}/v1",
+                         max_concurrency=max_concurrency, timeout=5.0,
+                         cache=AdviceCache(max_entries=16), deadline_ms=deadline_ms,
+                         breaker=breaker or CircuitBreaker())
+
+
+def test_concurrent_generations_share_pool(fake_server):
+    service = make_service(fake_server, max_concurrency=8)
+
+    async def scenario():
+        # total_courses berbeda tiap request agar tidak ada yang terlayani cache
+        results = await asyncio.gather(*[
+            service.generate(name=f"Siswa {i}", pace_label="fast learner",
+                             total_courses=i)
+            for i in range(40)
+        ])
+        await service.close()
+        return results
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    assert results == ["Saran dari LLM"] * 40
+    assert fake_server.requests == 40
+    # Dibatasi semaphore, dan koneksi keep-alive dipakai ulang
+    assert fake_server.peak <= 8
+    assert len(fake_server.clients) <= 8
+    # 40 request x 50 ms, 8 sekaligus: jauh di bawah eksekusi serial (2 s)
+    assert elapsed < 1.5
+
+    stats = service.stats()
+    assert stats["completed_total"] == 40
+    assert stats["active"] == 0
+    assert stats["peak_in_flight"] == 8
+
+
+def test_full_queue_falls_back_immediately(fake_server):
+    FakeCompletions.delay = 0.3
+    host, port = fake_server.server_address
+    service = AdviceService(api_key="test-key", base_url=f"http://{host}:{port}/v1",
+                            max_concurrency=1, max_waiting=1, timeout=5.0,
+                            cache=AdviceCache(max_entries=16), deadline_ms=5000,
+                            breaker=CircuitBreaker())
+
+    async def scenario():
+        # Lonjakan dalam satu tick: 1 berjalan, 1 menunggu, sisanya ditolak
+        started = time.perf_counter()
+        texts = await asyncio.gather(*[
+            service.generate(name="Rina", pace_label="fast learner", total_courses=i)
+            for i in range(4)
+        ])
+        stats = service.stats()
+        await service.close()
+        return texts, stats, time.perf_counter() - started
+
+    texts, stats, elapsed = asyncio.run(scenario())
+
+    assert texts[:2] == ["Saran dari LLM"] * 2
+    assert all(text.startswith("Hai Rina!") for text in texts[2:])
+    assert fake_server.requests == 2
+    assert stats["rejected_total"] == 2
+    assert stats["admitted"] == 0
+    # Penolakan tidak dihitung sebagai kegagalan LLM
+    assert stats["circuit"]["state"] == "closed"
+    assert elapsed < 1.5
+
+
+def test_same_bucket_served_from_cache(fake_server):
+    FakeCompletions.content = "Hai [NAMA]! Progress kamu keren, [NAMA]."
+    service = make_service(fake_server)
+
+    async def scenario():
+        first = await service.generate(name="Rina", pace_label="fast learner",
+                                       avg_score=88, completed_modules=8, total_modules=10)
+        # Nilai berbeda tetapi band sama (>= 85, progress >= 70)
+        second = await service.generate(name="Dimas", pace_label="fast learner",
+                                        avg_score=95, completed_modules=45, total_modules=50)
+        other = await service.generate(name="Dimas", pace_label="fast learner",
+                                       avg_score=72, completed_modules=45, total_modules=50)
+        await service.close()
+        return first, second, other
+
+    first, second, other = asyncio.run(scenario())
+
+    assert first == "Hai Rina! Progress kamu keren, Rina."
+    assert second == "Hai Dimas! Progress kamu keren, Dimas."
+    assert other == "Hai Dimas! Progress kamu keren, Dimas."
+    assert fake_server.requests == 2
+    # Nama siswa tidak pernah dikirim ke LLM
+    assert all("Rina" not in p and "Dimas" not in p for p in fake_server.prompts)
+    assert service.cache.stats()["hits"] == 1
+    assert service.cache.stats()["misses"] == 2
+
+
+def test_cached_prompt_describes_bands_not_numbers(fake_server):
+    FakeCompletions.content = "Hai [NAMA]!"
+    service = make_service(fake_server)
+
+    async def scenario():
+        await service.generate(name="Rina", pace_label="fast learner",
+                               avg_score=88, completed_modules=8, total_modules=10)
+        await service.close()
+
+    asyncio.run(scenario())
+
+    prompt = fake_server.prompts[0]
+    # Prompt dipakai ulang untuk semua siswa di band yang sama: tidak boleh
+    # memuat angka milik satu siswa, hanya deskripsi band
+    assert "Nilai Ujian: 85+" in prompt
+    assert "Progress Modul: 70-100%" in prompt
+    assert "88" not in prompt and "8/10" not in prompt and "80%" not in prompt
+
+
+def test_identical_requests_share_one_upstream_call(fake_server):
+    FakeCompletions.content = "Hai [NAMA]!"
+    FakeCompletions.delay = 0.2
+    service = make_service(fake_server)
+
+    async def scenario():
+        texts = await asyncio.gather(*[
+            service.generate(name=f"Siswa {i}", pace_label="reflective learner",
+                             avg_score=80 + i % 5)
+            for i in range(30)
+        ])
+        await service.close()
+        return texts
+
+    texts = asyncio.run(scenario())
+
+    assert texts == [f"Hai Siswa {i}!" for i in range(30)]
+    assert fake_server.requests == 1
+
+    stats = service.stats()
+    assert stats["singleflight_leader_total"] == 1
+    assert stats["singleflight_coalesced_total"] == 29
+    assert stats["singleflight_inflight"] == 0
+
+
+def test_upstream_error_falls_back(fake_server):
+    FakeCompletions.status = 500
+    service = make_service(fake_server)
+
+    async def scenario():
+        text = await service.generate(name="Budi", pace_label="consistent learner")
+        await service.close()
+        return text
+
+    text = asyncio.run(scenario())
+
+    assert "Budi" in text and "consistent learner" in text
+    assert service.stats()["failed_total"] == 1
+
+
+def test_without_api_key_uses_fallback():
+    service = AdviceService(api_key="")
+    text = asyncio.run(service.generate(name="Budi", pace_label="fast learner"))
+
+    assert text.startswith("Hai Budi!")
+    assert service.client is None
+
+
+def test_deadline_returns_fallback_and_fills_cache(fake_server):
+    FakeCompletions.delay = 0.3
+    service = make_service(fake_server, deadline_ms=50)
+
+    async def scenario():
+        started = time.perf_counter()
+        first = await service.generate(name="Rina", pace_label="fast learner")
+        elapsed = time.perf_counter() - started
+
+        # Panggilan LLM tetap selesai di background dan mengisi cache
+        await asyncio.sleep(0.5)
+        second = await service.generate(name="Rina", pace_label="fast learner")
+        await service.close()
+        return first, elapsed, second
+
+    first, elapsed, second = asyncio.run(scenario())
+
+    assert elapsed < 0.2
+    assert first.startswith("Hai Rina!")
+    assert second == "Saran dari LLM"
+    assert fake_server.requests == 1
+
+    stats = service.stats()
+    assert stats["deadline_exceeded_total"] == 1
+    assert stats["fallback_total"] == 1
+    assert stats["cache_fills_total"] == 1
+    assert stats["background_pending"] == 0
+
+
+def test_circuit_breaker_skips_llm_after_failures(fake_server):
+    FakeCompletions.status = 500
+    service = make_service(fake_server, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    async def scenario():
+        texts = [
+            await service.generate(name="Rina", pace_label="fast learner", total_courses=i)
+            for i in range(4)
+        ]
+        await service.close()
+        return texts
+
+    texts = asyncio.run(scenario())
+
+    assert all(text.startswith("Hai Rina!") for text in texts)
+    assert fake_server.requests == 2
+    circuit = service.stats()["circuit"]
+    assert circuit["state"] == "open"
+    assert circuit["short_circuited_total"] == 2
+
+
+def test_circuit_half_open_recovers():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()          # satu panggilan percobaan
+    assert not breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_circuit_half_open_trial_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+    # Percobaan yang tidak pernah melapor tidak menahan circuit selamanya
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+def test_cancelled_half_open_trial_releases_circuit(fake_server):
+    FakeCompletions.delay = 0.5
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    service = make_service(fake_server, deadline_ms=20, breaker=breaker)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    async def scenario():
+        # Deadline lewat, percobaan LLM tetap berjalan di background lalu dibatalkan close()
+        await service.generate(name="Budi", pace_label="fast learner")
+        assert breaker._trial_in_flight
+        await service.close()
+
+    asyncio.run(scenario())
+
+    assert breaker.state == "open"
+    assert not breaker._trial_in_flight
+
+
+def test_stream_substitutes_split_placeholder(fake_server):
+    # "[NAMA]" pasti terpotong di antara chunk 3 karakter
+    FakeCompletions.content = " Hai [NAMA]! Semangat terus, [NAMA]. "
+    service = make_service(fake_server)
+
+    async def collect(name):
+        return [delta async for delta in service.stream(name=name, pace_label="fast learner")]
+
+    async def scenario():
+        first = await collect("Rina")
+        second = await collect("Dimas")
+        await service.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert len(first) > 1
+    assert "".join(first) == "Hai Rina! Semangat terus, Rina."
+    assert second == ["Hai Dimas! Semangat terus, Dimas."]   # dari cache
+    assert fake_server.requests == 1
+
+    stats = service.stats()
+    assert stats["streams_total"] == 1
+    assert stats["avg_ttft_ms"] > 0
+
+
+def test_stream_endpoint_without_client_sends_fallback(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main.advice_service, "api_key", "")
+    client = TestClient(main.app)
+
+    response = client.post("/api/v1/advice/stream", json={
+        "user_id": 1, "name": "Rina", "pace_label": "fast learner"
+    })
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in response.text.split("\n\n") if e]
+    assert len(events) == 2
+    delta = json.loads(events[0].removeprefix("data: "))["delta"]
+    assert delta.startswith("Hai Rina!")
+    assert events[1].startswith("event: done")
+    assert json.loads(events[1].split("data: ", 1)[1])["advice_text"] == delta
+
+
+def test_stream_disconnect_releases_half_open_trial(fake_server):
+    FakeCompletions.content = "Satu dua tiga empat lima enam tujuh delapan"
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    service = make_service(fake_server, breaker=breaker)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    async def scenario():
+        stream = service.stream(name="Rina", pace_label="fast learner")
+        first = await stream.__anext__()
+        await stream.aclose()       # client menutup koneksi SSE
+        await service.close()
+        return first
+
+    assert asyncio.run(scenario())
+    assert breaker.state == "open"
+    assert not breaker._trial_in_flight
+
+
+def test_stream_endpoint_sends_error_after_partial_output(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    async def broken_stream(prompt):
+        yield "Hai [NAMA], kamu "
+        raise RuntimeError("connection reset")
+
+    service = AdviceService(api_key="test-key", base_url="http://127.0.0.1:9/v1",
+                            cache=AdviceCache(max_entries=4), breaker=CircuitBreaker())
+    monkeypatch.setattr(service, "_complete_stream", broken_stream)
+    monkeypatch.setattr(main, "advice_service", service)
+    client = TestClient(main.app)
+
+    response = client.post("/api/v1/advice/stream", json={
+        "user_id": 1, "name": "Rina", "pace_label": "fast learner"
+    })
+
+    events = [e for e in response.text.split("\n\n") if e]
+    assert json.loads(events[0].removeprefix("data: "))["delta"] == "Hai Rina, kamu"
+    assert events[-1].startswith("event: error")
+    error = json.loads(events[-1].split("data: ", 1)[1])
+    assert error["detail"] == "connection reset"
+    assert error["advice_text"].startswith("Hai Rina!")
+    assert not any(e.startswith("event: done") for e in events)
+    assert service.breaker.consecutive_failures == 1
+    assert service.cache_fills_total == 0
@@ -244,6 +244,53 @@ def test_pace_reflective_learner():
         return False
 
 
+def test_pace_batch():
+    """Test batch pace endpoint dengan beberapa siswa sekaligus"""
+    print_header("Test 5b: Pace - Batch Analysis")
+    
+    try:
+        speeds = [0.3, 0.8, 2.0]
+        payload = {
+            "items": [
+                {
+                    "user_id": 1000 + i,
+                    "features": {
+                        "completion_speed": speed,
+                        "study_consistency_std": 25.0,
+                        "avg_study_hour": 14.0,
+                        "completed_modules": 50,
+                        "total_modules_viewed": 60
+                    }
+                }
+                for i, speed in enumerate(speeds)
+            ]
+        }
+        
+        print(f"Testing batch of {len(payload['items'])} users")
+        
+        response = requests.post(
+            f"{API_BASE_URL}/api/v1/pace/batch",
+            json=payload,
+            timeout=10
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print_success(f"Total Processed: {data['total_processed']}")
+            for result in data['results']:
+                print_success(f"User {result['user_id']}: {result['pace_label']} ({result['confidence']})")
+            
+            return data['total_processed'] == len(speeds)
+        else:
+            print_error(f"Batch analysis failed with status {response.status_code}")
+            print_response(response.json(), "Error Response")
+            return False
+            
+    except Exception as e:
+        print_error(f"Error: {str(e)}")
+        return False
+
+
 def test_advice_generation():
     """Test advice generation endpoint (Model 2 - OpenRouter Mistral AI)"""
     print_header("Test 6: Advice Generation (Model 2 - OpenRouter)")
@@ -382,6 +429,7 @@ def run_all_tests():
         ("Pace Analysis", test_pace_analysis),
         ("Pace - Fast Learner", test_pace_fast_learner),
         ("Pace - Reflective Learner", test_pace_reflective_learner),
+        ("Pace - Batch", test_pace_batch),
         ("Advice Generation (OpenRouter)", test_advice_generation),
         ("Advice - Low Score", test_advice_low_score),
         ("API Documentation", test_swagger_docs),
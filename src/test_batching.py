@@ -0,0 +1,164 @@
+"""
+Test MicroBatcher: batch terbentuk karena ukuran atau window, hasil kembali
+ke caller yang benar, error batch_fn diteruskan, dan stop() tidak
+meninggalkan request menggantung.
+
+Run: python -m pytest src/test_batching.py
+"""
+
+import asyncio
+import threading
+import time
+
+from batching import MicroBatcher
+
+
+def test_size_triggered_flush():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return items
+
+    async def scenario():
+        # Window panjang: batch hanya bisa flush karena ukuran penuh
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=5000)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+        elapsed = time.perf_counter() - started
+        await batcher.stop()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert results == [0, 1, 2, 3]
+    assert calls == [[0, 1, 2, 3]]
+    assert elapsed < 1.0
+
+
+def test_window_triggered_flush():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=64, max_wait_ms=20)
+        first = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.sleep(0.005)
+        second = asyncio.ensure_future(batcher.submit("b"))
+        results = await asyncio.gather(first, second)
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert results == ["a", "b"]
+    assert calls == [["a", "b"]]
+    assert stats["batches_total"] == 1
+
+
+def test_results_are_routed_to_each_caller():
+    async def scenario():
+        batcher = MicroBatcher(lambda items: [item * 10 for item in items], max_batch_size=3, max_wait_ms=5)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert results == [i * 10 for i in range(10)]
+    assert stats["items_total"] == 10
+    assert stats["max_batch_size_seen"] <= 3
+
+
+def test_batch_fn_exception_propagates():
+    def batch_fn(items):
+        raise ValueError("model error")
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=5)
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        # Worker tetap hidup setelah batch gagal
+        batcher.batch_fn = lambda items: items
+        after = await batcher.submit(3)
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, after, stats
+
+    results, after, stats = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert after == 3
+    assert stats["errors_total"] == 1
+
+
+def test_result_count_mismatch_fails_every_caller():
+    async def scenario():
+        # batch_fn yang membuang satu hasil tidak boleh membuat caller menggantung
+        batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=3, max_wait_ms=5000)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True), 1.0
+        )
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "2 results for 3 items" in str(results[0])
+    assert stats["errors_total"] == 1
+
+
+def test_cancelled_caller_is_not_executed():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=64, max_wait_ms=30)
+        cancelled = asyncio.ensure_future(batcher.submit("gone"))
+        kept = asyncio.ensure_future(batcher.submit("kept"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await kept
+        await batcher.stop()
+        return result
+
+    assert asyncio.run(scenario()) == "kept"
+    assert calls == [["kept"]]
+
+
+def test_stop_fails_queued_and_inflight_items():
+    release = threading.Event()
+    entered = threading.Event()
+
+    def batch_fn(items):
+        entered.set()
+        release.wait(5)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=1)
+        inflight = [asyncio.ensure_future(batcher.submit(i)) for i in range(2)]
+        await asyncio.get_running_loop().run_in_executor(None, entered.wait, 5)
+
+        # Batch pertama sedang dieksekusi, dua item berikutnya masih mengantre
+        queued = [asyncio.ensure_future(batcher.submit(i)) for i in range(2, 4)]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*inflight, *queued, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 4
+    for result in results:
+        assert isinstance(result, RuntimeError)
+        assert str(result) == "Batcher stopped"
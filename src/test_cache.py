@@ -0,0 +1,54 @@
+"""
+Test AdviceCache: LRU, TTL, counter dan persistensi SQLite.
+
+Run: python -m pytest src/test_cache.py
+"""
+
+import time
+
+from cache import AdviceCache
+
+
+def test_lru_eviction():
+    cache = AdviceCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"   # a jadi paling baru dipakai
+
+    cache.set("c", "C")            # b yang dibuang
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = AdviceCache(ttl_seconds=0.05)
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
+
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    db_path = str(tmp_path / "advice_cache.db")
+
+    cache = AdviceCache(max_entries=1, db_path=db_path)
+    cache.set("a", "A")
+    cache.set("b", "B")            # a dibuang dari memori, tetap ada di disk
+    assert cache.get("a") == "A"
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
+
+    reopened = AdviceCache(db_path=db_path)
+    assert reopened.get("b") == "B"
+    assert reopened.stats()["backend"] == "sqlite"
+    reopened.close()
@@ -0,0 +1,83 @@
+"""
+Test features.cleaning: setiap cleaner harus menghasilkan CSV identik dengan
+notebooks/01_clean_individual_files.ipynb (file di data/interim), dan CLI
+menjalankan tabel secara paralel dengan penulisan atomik.
+
+Run: python -m pytest src/test_cleaning.py
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import cleaning
+from features.raw_cache import RAW_DIR, read_excel_cached
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERIM_DIR = os.path.join(ROOT, "data", "interim")
+
+
+@pytest.mark.parametrize("table", [
+    t for t, (raw_name, _, _) in cleaning.CLEANERS.items() if os.path.exists(os.path.join(RAW_DIR, raw_name))
+])
+def test_cleaner_matches_interim(table, tmp_path):
+    raw_name, out_name, cleaner = cleaning.CLEANERS[table]
+    clean = cleaner(read_excel_cached(os.path.join(RAW_DIR, raw_name)))
+
+    cleaning.write_csv_atomic(clean, str(tmp_path / out_name))
+    with open(os.path.join(INTERIM_DIR, out_name), "rb") as f:
+        assert (tmp_path / out_name).read_bytes() == f.read()
+
+
+def test_clean_trackings():
+    raw = pd.DataFrame({
+        "id": [1, 2, 3, 4],
+        "developer_id": [10, 10, None, 11],
+        "journey_id": [5, 5, 5, 6],
+        "tutorial_id": [100, 100, 101, 102],
+        "last_viewed": ["2021-01-01 08:00:00", "2021-01-02 08:00:00", "2021-01-01", "bad"],
+        "first_opened_at": ["2021-01-01"] * 4,
+        "completed_at": ["2021-01-01", None, None, None],
+        "status": [1, 1, 1, 1],
+        "extra": ["x"] * 4,
+    })
+    clean = cleaning.clean_trackings(raw)
+
+    assert clean["id"].tolist() == [1, 4]
+    assert clean["status"].tolist() == [1, 0]
+    assert "extra" not in clean.columns
+    assert pd.isna(clean["last_viewed"].iloc[1])
+    assert raw["last_viewed"].iloc[0] == "2021-01-01 08:00:00"
+
+
+def test_clean_completions_ratings():
+    raw = pd.DataFrame({
+        "enrollments_at": ["2021-01-01, 2021-02-01", None],
+        "enrolling_times": [2, 3],
+        "avg_submission_rating": ["4, 5", np.nan],
+    })
+    clean = cleaning.clean_completions(raw)
+
+    assert clean["repeat_enrollments"].tolist() == [1, 0]
+    assert clean["avg_submission_rating"].iloc[0] == 4.5
+    assert 1.0 <= clean["avg_submission_rating"].iloc[1] <= 5.0
+
+
+def test_run_parallel_skips_missing_and_reports(tmp_path, capsys):
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    for name in ("users.xlsx", "developer_journeys.xlsx"):
+        shutil.copy(os.path.join(RAW_DIR, name), raw_dir / name)
+    interim_dir = tmp_path / "interim"
+
+    results = cleaning.run(str(raw_dir), str(interim_dir), tables=["users", "journeys", "tutorials"],
+                           cache_dir=str(tmp_path / "cache"))
+
+    assert sorted(r["table"] for r in results) == ["journeys", "users"]
+    assert all(r["total_s"] >= r["clean_s"] for r in results)
+    assert sorted(os.listdir(interim_dir)) == ["journeys_clean.csv", "users_clean.csv"]
+    out = capsys.readouterr().out
+    assert "Skipping tutorials" in out and "Cleaned 2/2 tables" in out
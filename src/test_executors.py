@@ -0,0 +1,114 @@
+"""
+Test ExecutionPool: kode blocking tidak menahan event loop dan pool yang
+penuh menolak task baru.
+
+Run: python -m pytest src/test_executors.py
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from executors import ExecutionPool, PoolSaturated
+
+
+def test_blocking_call_does_not_freeze_event_loop():
+    pool = ExecutionPool("advice", kind="thread", max_workers=2, max_queue=0)
+
+    async def scenario():
+        slow = asyncio.ensure_future(pool.run(time.sleep, 0.3))
+        await asyncio.sleep(0)
+
+        # Event loop tetap melayani coroutine lain selama pool sibuk
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+
+        stats = pool.stats()
+        await slow
+        return elapsed, stats
+
+    elapsed, busy = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert elapsed < 0.1
+    assert busy["active"] == 1
+    assert busy["utilization"] == 0.5
+    assert pool.stats()["completed_total"] == 1
+
+
+def test_saturated_pool_rejects():
+    pool = ExecutionPool("advice", kind="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        stats = pool.stats()
+        with pytest.raises(PoolSaturated):
+            await pool.run(release.wait, 5)
+
+        release.set()
+        await asyncio.gather(*running)
+        return stats
+
+    busy = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert busy["active"] == 1
+    assert busy["queued"] == 1
+    assert busy["saturated"] is True
+    assert pool.stats()["rejected_total"] == 1
+    assert pool.stats()["completed_total"] == 2
+
+
+def test_kwargs_and_errors_are_forwarded():
+    pool = ExecutionPool("scoring", kind="thread", max_workers=1)
+
+    def divide(a, b=1):
+        return a / b
+
+    async def scenario():
+        assert await pool.run(divide, 6, b=3) == 2
+        with pytest.raises(ZeroDivisionError):
+            await pool.run(divide, 1, b=0)
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+    assert pool.stats()["failed_total"] == 1
+
+
+def test_abandoned_task_keeps_its_slot_until_worker_finishes():
+    pool = ExecutionPool("scoring", kind="thread", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        # Pemanggil berhenti menunggu (mis. client disconnect), worker tetap jalan
+        task = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        abandoned = pool.stats()
+        with pytest.raises(PoolSaturated):
+            await pool.run(release.wait, 5)
+
+        release.set()
+        for _ in range(100):
+            if pool.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        return abandoned
+
+    abandoned = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert abandoned["active"] == 1
+    assert abandoned["saturated"] is True
+    assert pool.in_flight == 0
+    assert pool.stats()["completed_total"] == 1
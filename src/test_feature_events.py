@@ -0,0 +1,135 @@
+"""
+Test features.events: hasil vectorized harus sama dengan logika notebook
+02_feature_engineering.ipynb (groupby.apply per grup), dan endpoint
+/api/v1/features/score langsung mengembalikan skor pace dan persona.
+
+Run: python -m pytest src/test_feature_events.py
+"""
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from features.events import FILL_VALUES, compute_features
+
+
+def make_events(seed=7, n_users=40):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01")
+
+    trackings, submissions, exams, completions = [], [], [], []
+    for developer_id in range(1, n_users + 1):
+        for journey_id in rng.choice([10, 20, 30], size=rng.integers(1, 4), replace=False):
+            journey_id = int(journey_id)
+            for tutorial_id in range(int(rng.integers(1, 25))):
+                viewed = start + pd.Timedelta(minutes=int(rng.integers(0, 60 * 24 * 90)))
+                trackings.append({
+                    "developer_id": developer_id, "journey_id": journey_id,
+                    "tutorial_id": tutorial_id,
+                    "last_viewed": None if rng.random() < 0.05 else viewed,
+                    "completed_at": viewed if rng.random() < 0.6 else None,
+                })
+            for _ in range(int(rng.integers(0, 4))):
+                submissions.append({
+                    "developer_id": developer_id, "journey_id": journey_id,
+                    "status": str(rng.choice(["passed", "approved", "failed", "rejected"])),
+                })
+            for _ in range(int(rng.integers(0, 3))):
+                exams.append({"developer_id": developer_id, "journey_id": journey_id,
+                              "score": float(rng.integers(20, 101))})
+            if rng.random() < 0.8:
+                completions.append({
+                    "developer_id": developer_id, "journey_id": journey_id,
+                    "study_duration": float(rng.integers(1, 200)),
+                    "enrolling_times": int(rng.integers(1, 4)),
+                    "hours_to_study": float(rng.choice([0, 20, 60, 140])),
+                })
+    return trackings, submissions, exams, completions
+
+
+def notebook_features(trackings, submissions, exams, completions):
+    """Salinan logika notebook (dengan groupby.apply) sebagai referensi"""
+    keys = ["developer_id", "journey_id"]
+    df_t = pd.DataFrame(trackings)
+    df_t["last_viewed"] = pd.to_datetime(df_t["last_viewed"])
+    df_t["completed_at"] = pd.to_datetime(df_t["completed_at"])
+
+    agg = df_t.groupby(keys).agg(total_modules_viewed=("tutorial_id", "count"),
+                                 completed_modules=("completed_at", "count")).reset_index()
+    temp = df_t.dropna(subset=["last_viewed"]).copy()
+    temp["hour"] = temp["last_viewed"].dt.hour
+    agg = agg.merge(temp.groupby(keys)["hour"].mean().rename("avg_study_hour").reset_index(),
+                    on=keys, how="left")
+
+    temp["date"] = temp["last_viewed"].dt.date
+
+    def consistency_std(group):
+        dates = sorted(group["date"].unique())
+        if len(dates) <= 1:
+            return 0
+        return np.std([(dates[i] - dates[i - 1]).days for i in range(1, len(dates))])
+
+    std = temp.groupby(keys).apply(consistency_std).rename("study_consistency_std").reset_index()
+    agg = agg.merge(std, on=keys, how="left")
+
+    df_s = pd.DataFrame(submissions)
+    df_s["is_passed"] = df_s["status"].apply(lambda x: 1 if x in ["passed", "approved"] else 0)
+    sub = df_s.groupby(keys)["is_passed"].agg(["sum", "count"]).reset_index()
+    sub["submission_fail_rate"] = (sub["count"] - sub["sum"]) / sub["count"]
+    agg = agg.merge(sub[keys + ["submission_fail_rate"]], on=keys, how="left")
+
+    exam = pd.DataFrame(exams).groupby(keys)["score"].mean().rename("avg_exam_score").reset_index()
+    agg = agg.merge(exam, on=keys, how="left")
+
+    comp = pd.DataFrame(completions).rename(columns={"enrolling_times": "retry_count"})
+    agg = agg.merge(comp, on=keys, how="left")
+    agg["completion_speed"] = np.where(
+        (agg["hours_to_study"] > 0) & agg["study_duration"].notna(),
+        agg["study_duration"] / agg["hours_to_study"], np.nan
+    )
+    agg["completion_speed"] = agg["completion_speed"].clip(upper=10)
+
+    for col in ["completed_modules", "total_modules_viewed", "retry_count", "submission_fail_rate"]:
+        agg[col] = agg[col].fillna(0)
+    return agg.fillna(FILL_VALUES).sort_values(keys).reset_index(drop=True)
+
+
+def test_vectorized_features_match_notebook():
+    events = make_events()
+    result = compute_features(*events)
+    expected = notebook_features(*events)
+
+    assert len(result) == len(expected)
+    for col in result.columns:
+        np.testing.assert_allclose(result[col].to_numpy(dtype=float),
+                                   expected[col].to_numpy(dtype=float), err_msg=col)
+    assert not result.isna().any().any()
+
+
+def test_score_endpoint_returns_pace_and_persona():
+    import main
+
+    trackings, submissions, exams, completions = make_events(n_users=3)
+    for event in trackings:
+        for key in ("last_viewed", "completed_at"):
+            if event[key] is not None:
+                event[key] = event[key].isoformat()
+
+    client = TestClient(main.app)
+    response = client.post("/api/v1/features/score", json={
+        "trackings": trackings, "submissions": submissions,
+        "exams": exams, "completions": completions
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    expected = compute_features(trackings, submissions, exams, completions)
+    assert body["total_processed"] == len(expected)
+
+    first = body["results"][0]
+    assert first["user_id"] == expected["developer_id"][0]
+    assert first["persona_features"]["avg_exam_score"] == expected["avg_exam_score"][0]
+    assert first["learning_pace"]["pace_label"] in {
+        "fast learner", "consistent learner", "reflective learner"
+    }
+    assert first["persona"]["persona_label"]
@@ -0,0 +1,152 @@
+"""
+Test features.extractor terhadap database SQLite lokal dengan skema yang
+sama seperti database backend. Hasil harus sama dengan perhitungan lama
+(6 query per user + std jarak hari di Python).
+
+Run: python -m pytest src/test_feature_extractor.py
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from features import extractor
+from features.extractor import calculate_user_features, calculate_users_features
+
+SCHEMA = """
+CREATE TABLE developer_journey_trackings (
+    id INTEGER PRIMARY KEY, journey_id INTEGER, tutorial_id INTEGER,
+    developer_id INTEGER, status TEXT, last_viewed TEXT
+);
+CREATE TABLE developer_journey_completions (
+    id INTEGER PRIMARY KEY, user_id INTEGER, journey_id INTEGER, developer_id INTEGER,
+    enrolling_times INTEGER, enrollments_at TEXT, last_enrolled_at TEXT,
+    study_duration REAL, status TEXT
+);
+CREATE TABLE exam_results (
+    id INTEGER PRIMARY KEY, exam_registration_id INTEGER, developer_id INTEGER,
+    score REAL, is_passed INTEGER
+);
+CREATE TABLE developer_journey_submissions (
+    id INTEGER PRIMARY KEY, journey_id INTEGER, quiz_id INTEGER, developer_id INTEGER,
+    status TEXT, rating REAL
+);
+"""
+
+
+def build_fixture(n_users=40, seed=7):
+    rng = np.random.default_rng(seed)
+    db = sqlite3.connect(":memory:")
+    db.executescript(SCHEMA)
+    raw = {}
+
+    for user in range(1, n_users + 1):
+        # User kelipatan 10 sengaja tidak punya aktivitas sama sekali
+        if user % 10 == 0:
+            raw[user] = {"sessions": [], "completions": [], "scores": [], "submissions": []}
+            continue
+
+        base = datetime(2024, 1, 1, 8, 0, 0)
+        sessions = sorted(
+            base + timedelta(days=int(rng.integers(0, 120)), hours=int(rng.integers(0, 24)),
+                             minutes=int(rng.integers(0, 60)))
+            for _ in range(int(rng.integers(1, 30)))
+        )
+        completions = [
+            (int(rng.integers(1, 4)), float(rng.integers(5, 200)),
+             "completed" if rng.random() < 0.7 else "in_progress")
+            for _ in range(int(rng.integers(0, 4)))
+        ]
+        scores = [float(rng.integers(0, 101)) for _ in range(int(rng.integers(0, 6)))]
+        submissions = ["failed" if rng.random() < 0.3 else "passed"
+                       for _ in range(int(rng.integers(0, 8)))]
+
+        db.executemany(
+            "INSERT INTO developer_journey_trackings (developer_id, last_viewed) VALUES (?, ?)",
+            [(user, s.strftime("%Y-%m-%d %H:%M:%S")) for s in sessions]
+        )
+        db.executemany(
+            "INSERT INTO developer_journey_completions (developer_id, enrolling_times, study_duration, status)"
+            " VALUES (?, ?, ?, ?)",
+            [(user, *c) for c in completions]
+        )
+        db.executemany("INSERT INTO exam_results (developer_id, score) VALUES (?, ?)",
+                       [(user, s) for s in scores])
+        db.executemany("INSERT INTO developer_journey_submissions (developer_id, status) VALUES (?, ?)",
+                       [(user, s) for s in submissions])
+        raw[user] = {"sessions": sessions, "completions": completions,
+                     "scores": scores, "submissions": submissions}
+
+    db.commit()
+    return db, raw
+
+
+def reference_features(data):
+    """Logika calculate_user_features lama, dihitung dari data Python"""
+    sessions = data["sessions"]
+    completed = [d for _, d, status in data["completions"] if status == "completed"]
+    submissions = data["submissions"]
+
+    if len(sessions) > 1:
+        days = [(sessions[i] - sessions[i - 1]).days for i in range(1, len(sessions))]
+        consistency = float(np.std(days))
+    else:
+        consistency = 0.0
+
+    return {
+        "avg_study_hour": float(np.mean([s.hour for s in sessions])) if sessions else 12.0,
+        "study_consistency_std": consistency,
+        "completion_speed": float(np.mean(completed)) if completed else 40.0,
+        "avg_exam_score": float(np.mean(data["scores"])) if data["scores"] else 70.0,
+        "submission_fail_rate": (submissions.count("failed") / len(submissions)) if submissions else 0.0,
+        "retry_count": sum(times - 1 for times, _, _ in data["completions"]),
+    }
+
+
+@pytest.fixture(scope="module")
+def fixture_db():
+    db, raw = build_fixture()
+    yield db, raw
+    db.close()
+
+
+def test_bulk_matches_per_user_reference(fixture_db):
+    db, raw = fixture_db
+
+    features = calculate_users_features(db, list(raw), dialect="sqlite")
+
+    assert set(features) == set(raw)
+    for user, data in raw.items():
+        expected = reference_features(data)
+        for key, value in expected.items():
+            assert features[user][key] == pytest.approx(value, abs=1e-9), (user, key)
+
+
+def test_single_user_and_unknown_user(fixture_db):
+    db, raw = fixture_db
+
+    assert calculate_user_features(db, 3, dialect="sqlite") == pytest.approx(reference_features(raw[3]))
+
+    # User yang tidak ada di database mendapat nilai default
+    unknown = calculate_user_features(db, 9999, dialect="sqlite")
+    assert unknown == {
+        "avg_study_hour": 12.0, "study_consistency_std": 0.0, "completion_speed": 40.0,
+        "avg_exam_score": 70.0, "submission_fail_rate": 0.0, "retry_count": 0,
+    }
+
+
+def test_one_statement_per_chunk(fixture_db, monkeypatch):
+    db, raw = fixture_db
+    statements = []
+    db.set_trace_callback(statements.append)
+    monkeypatch.setattr(extractor, "CHUNK_SIZE", 16)
+
+    try:
+        features = calculate_users_features(db, list(raw), dialect="sqlite")
+    finally:
+        db.set_trace_callback(None)
+
+    assert len(features) == 40
+    assert len(statements) == 3
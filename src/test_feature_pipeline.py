@@ -0,0 +1,91 @@
+"""
+Test features.pipeline: output harus identik byte-per-byte dengan menjalankan
+notebooks/02_feature_engineering.ipynb pada data interim yang sama, berapa
+pun ukuran chunk-nya.
+
+Data interim diambil dari data/interim; trackings_clean.csv (tidak ikut di
+repo) dibuat sintetis untuk pasangan (user, journey) di completions.
+
+Run: python -m pytest src/test_feature_pipeline.py
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import pipeline
+from features.labeling import speed_percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTEBOOK = os.path.join(ROOT, "notebooks", "02_feature_engineering.ipynb")
+OUTPUTS = ["clustering_features.csv", "pace_features.csv", "advice_context.csv"]
+
+
+def write_trackings(path, completions, seed=3):
+    rng = np.random.default_rng(seed)
+    pairs = completions[["user_id", "journey_id"]].drop_duplicates().to_numpy()
+    start = pd.Timestamp("2019-01-01").value // 10**9
+
+    rows = []
+    for developer_id, journey_id in pairs[:300]:
+        n = int(rng.integers(1, 40))
+        # Detik unik per baris agar stuck tutorial tidak bergantung urutan sort
+        seconds = rng.choice(86400 * 200, size=n, replace=False) + start
+        for i, second in enumerate(seconds):
+            viewed = pd.Timestamp(int(second), unit="s")
+            rows.append({
+                "id": len(rows) + 1,
+                "journey_id": journey_id,
+                "tutorial_id": int(rng.integers(1, 9000)),
+                "developer_id": developer_id,
+                "status": 1,
+                "last_viewed": None if rng.random() < 0.03 else viewed,
+                "first_opened_at": viewed,
+                "completed_at": viewed if rng.random() < 0.5 else None,
+            })
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def run_notebook(interim_dir, processed_dir):
+    with open(NOTEBOOK) as f:
+        cells = [c for c in json.load(f)["cells"] if c["cell_type"] == "code"]
+
+    namespace = {
+        "pd": pd, "np": np, "os": os,
+        "INTERIM_DIR": str(interim_dir), "PROCESSED_DIR": str(processed_dir),
+        "display": lambda *args: None, "speed_percentile": speed_percentile,
+    }
+    # Cell pertama hanya import (matplotlib/seaborn, features.labeling) dan path
+    for cell in cells[1:]:
+        exec("".join(cell["source"]), namespace)
+
+
+@pytest.fixture(scope="module")
+def interim_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("interim")
+    for name in os.listdir(os.path.join(ROOT, "data", "interim")):
+        if name.endswith(".csv"):
+            shutil.copy(os.path.join(ROOT, "data", "interim", name), directory / name)
+    write_trackings(directory / "trackings_clean.csv",
+                    pd.read_csv(directory / "completions_clean.csv"))
+    return directory
+
+
+@pytest.fixture(scope="module")
+def notebook_dir(interim_dir, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("notebook")
+    run_notebook(interim_dir, directory)
+    return directory
+
+
+@pytest.mark.parametrize("chunksize", [1000, 10**6])
+def test_pipeline_matches_notebook_bytes(interim_dir, notebook_dir, tmp_path, chunksize):
+    pipeline.run(str(interim_dir), str(tmp_path), chunksize=chunksize)
+
+    for name in OUTPUTS:
+        expected = (notebook_dir / name).read_bytes()
+        assert (tmp_path / name).read_bytes() == expected, name
@@ -0,0 +1,84 @@
+"""
+Test FeatureStore: lookup per journey dan agregasi per user sama dengan
+perhitungan pandas langsung dari CSV.
+
+Run: python -m pytest src/test_feature_store.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import FeatureStore
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLUSTERING_PATH = os.path.join(BASE_DIR, "data", "processed", "clustering_features.csv")
+
+
+@pytest.fixture(scope="module")
+def store():
+    store = FeatureStore()
+    assert store.load()
+    return store
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return pd.read_csv(CLUSTERING_PATH)
+
+
+def test_journey_lookup_matches_csv(store, frame):
+    for row in frame.sample(50, random_state=42).itertuples():
+        features = store.get(row.developer_id, row.journey_id)
+        for col in FeatureStore.FEATURES:
+            assert features[col] == pytest.approx(getattr(row, col))
+
+
+def test_user_aggregation(store, frame):
+    developer_id = frame["developer_id"].iloc[0]
+    rows = frame[frame["developer_id"] == developer_id]
+
+    features = store.get(developer_id)
+
+    assert features["journeys"] == len(rows)
+    # Semua kolom dirata-rata per journey, sama seperti input training model;
+    # hitungan modul dibulatkan agar tetap bilangan bulat
+    for col in FeatureStore.FEATURES:
+        expected = rows[col].mean()
+        if col in FeatureStore.COUNT_FEATURES:
+            expected = round(expected)
+        assert features[col] == pytest.approx(expected), col
+
+
+def test_unknown_keys(store, frame):
+    developer_id = frame["developer_id"].iloc[0]
+    assert store.get(-1) is None
+    assert store.get(developer_id, journey_id=-1) is None
+    assert store.get(int(frame["developer_id"].max()) + 1) is None
+
+    many = store.get_many([developer_id, -1])
+    assert many[0] == store.get(developer_id)
+    assert many[1] is None
+
+
+def test_reload_swaps_table(tmp_path, capsys):
+    path = tmp_path / "features.csv"
+    df = pd.DataFrame({
+        "developer_id": [2, 1, 1],
+        "journey_id": [5, 9, 3],
+        **{col: np.arange(3, dtype=float) for col in FeatureStore.FEATURES},
+    })
+    df.to_csv(path, index=False)
+
+    store = FeatureStore(clustering_path=str(path), pace_path=str(tmp_path / "missing.csv"))
+    assert store.load()
+    assert "[OK] Loaded clustering_features: 3 rows" in capsys.readouterr().out
+    assert store.get(1, 3)["avg_study_hour"] == 2.0
+    assert store.stats()["users"] == 2
+
+    df.loc[2, "avg_study_hour"] = 42.0
+    df.to_csv(path, index=False)
+    assert store.reload()
+    assert store.get(1, 3)["avg_study_hour"] == 42.0
@@ -0,0 +1,94 @@
+"""
+Test CompiledForest: hasil harus identik dengan predict_proba sklearn
+untuk model pace dan persona yang ada di folder models/, begitu pula
+CompiledIsolationForest terhadap outlier detector model clustering.
+
+Run: python -m pytest src/test_forest.py
+"""
+
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from forest import CompiledForest, CompiledIsolationForest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS = [
+    ("pace_classifier.pkl", "pace_features.csv"),
+    ("persona_classifier.pkl", "clustering_features.csv"),
+]
+
+
+def load_case(model_file, features_file):
+    package = joblib.load(os.path.join(BASE_DIR, "models", model_file))
+    df = pd.read_csv(os.path.join(BASE_DIR, "data", "processed", features_file))
+    X = df[package["feature_columns"]].fillna(0)
+    X_scaled = package["scaler"].transform(X)
+
+    # Tambah titik acak (termasuk yang jauh di luar distribusi training)
+    rng = np.random.default_rng(42)
+    noise = rng.normal(scale=3.0, size=(500, X_scaled.shape[1]))
+    return package["model"], np.vstack([X_scaled, noise])
+
+
+@pytest.mark.parametrize("model_file,features_file", MODELS)
+def test_predict_proba_matches_sklearn(model_file, features_file):
+    model, X = load_case(model_file, features_file)
+    model.n_jobs = 1
+    forest = CompiledForest.from_sklearn(model)
+
+    np.testing.assert_array_equal(forest.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+
+
+@pytest.mark.parametrize("model_file,features_file", MODELS)
+def test_single_row_and_chunking(model_file, features_file):
+    model, X = load_case(model_file, features_file)
+    model.n_jobs = 1
+    forest = CompiledForest.from_sklearn(model)
+    forest.CHUNK_ROWS = 7
+
+    expected = model.predict_proba(X[:50])
+    np.testing.assert_array_equal(forest.predict_proba(X[:50]), expected)
+    np.testing.assert_array_equal(forest.predict_proba(X[0]), expected[:1])
+
+
+def test_leaves_match_sklearn_apply():
+    model, X = load_case(*MODELS[0])
+    forest = CompiledForest.from_sklearn(model)
+
+    leaves = forest.apply(X)
+    offsets = forest.roots
+    np.testing.assert_array_equal(leaves - offsets, model.apply(X))
+
+
+def test_dict_round_trip():
+    model, X = load_case(*MODELS[0])
+    forest = CompiledForest.from_sklearn(model)
+    restored = CompiledForest.from_dict(json.loads(json.dumps(forest.to_dict())))
+
+    np.testing.assert_array_equal(restored.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(restored.classes_, forest.classes_)
+    assert restored.float32_inputs
+
+
+def test_isolation_forest_matches_sklearn():
+    package = joblib.load(os.path.join(BASE_DIR, "models", "clustering_model_production.pkl"))
+    detector = package["outlier_detector"]
+    columns = package["feature_columns"]
+    df = pd.read_csv(os.path.join(BASE_DIR, "data", "processed", "clustering_features.csv"))
+    X = df[columns].fillna(0).to_numpy(dtype=np.float64)
+
+    rng = np.random.default_rng(42)
+    noise = X.mean(axis=0) + rng.normal(scale=3.0, size=(300, X.shape[1])) * X.std(axis=0)
+    X = np.vstack([X, noise])
+    X_frame = pd.DataFrame(X, columns=columns)
+
+    compiled = CompiledIsolationForest.from_sklearn(detector)
+
+    np.testing.assert_array_equal(compiled.score_samples(X), detector.score_samples(X_frame))
+    np.testing.assert_array_equal(compiled.predict(X), detector.predict(X_frame))
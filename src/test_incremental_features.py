@@ -0,0 +1,189 @@
+"""
+Test features.incremental: agregat berjalan harus sama dengan perhitungan
+batch features.events untuk event yang sama, termasuk event yang datang
+tidak urut, dan bertahan lewat snapshot.
+
+Run: python -m pytest src/test_incremental_features.py
+"""
+
+import random
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from features.events import compute_features
+from features.incremental import FEATURES, IncrementalFeatureStore, aggregate_features
+from test_feature_events import make_events
+
+
+def assert_matches_batch(store, events):
+    expected = compute_features(*events)
+    for row in expected.to_dict("records"):
+        live = store.get(row["developer_id"], row["journey_id"])
+        for col in FEATURES:
+            np.testing.assert_allclose(live[col], row[col], err_msg=col)
+
+
+def test_incremental_matches_batch_for_shuffled_events():
+    trackings, submissions, exams, completions = make_events(seed=11)
+    shuffled = trackings[:]
+    random.Random(3).shuffle(shuffled)
+
+    store = IncrementalFeatureStore()
+    # Dipecah menjadi banyak ingest kecil seperti event yang masuk bertahap
+    for i in range(0, len(shuffled), 37):
+        store.ingest(trackings=shuffled[i:i + 37])
+    store.ingest(submissions=submissions, exams=exams, completions=completions)
+
+    assert store.stats()["events_total"] == (
+        len(trackings) + len(submissions) + len(exams) + len(completions)
+    )
+    assert_matches_batch(store, (trackings, submissions, exams, completions))
+
+
+def test_snapshot_roundtrip(tmp_path):
+    events = make_events(seed=5, n_users=10)
+    path = tmp_path / "live_features.json"
+
+    store = IncrementalFeatureStore(snapshot_path=str(path))
+    store.ingest(*events)
+    assert store.save_snapshot()
+    assert not store.save_snapshot()        # tidak ada perubahan baru
+
+    restored = IncrementalFeatureStore(snapshot_path=str(path))
+    assert restored.load_snapshot()
+    assert_matches_batch(restored, events)
+    assert restored.get(1) == store.get(1)
+
+
+def test_ingested_events_feed_persona_endpoint(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, "live_features",
+                        IncrementalFeatureStore(snapshot_path=str(tmp_path / "live.json")))
+    client = TestClient(main.app)
+
+    response = client.post("/api/v1/features/events", json={
+        "trackings": [
+            {"developer_id": 990001, "journey_id": 1, "tutorial_id": i,
+             "last_viewed": f"2024-03-{i + 1:02d}T22:00:00"}
+            for i in range(5)
+        ],
+        "exams": [{"developer_id": 990001, "journey_id": 1, "score": 90, "is_passed": True}]
+    })
+    assert response.status_code == 200
+    assert response.json() == {"ingested": 6, "users": 1, "journeys": 1}
+
+    response = client.post("/api/v1/persona/predict", json={"user_id": 990001})
+    assert response.status_code == 200
+    assert response.json()["user_id"] == 990001
+
+
+def test_snapshot_state_is_copied():
+    store = IncrementalFeatureStore()
+    store.ingest(trackings=[{"developer_id": 1, "journey_id": 1, "tutorial_id": 1,
+                             "last_viewed": "2024-03-10T08:00:00"}])
+    agg = store._journeys[1][1]
+    state = agg.to_dict()
+
+    # Event setelah to_dict (misal saat json.dump di luar lock) tidak mengubah salinan
+    store.ingest(trackings=[{"developer_id": 1, "journey_id": 1, "tutorial_id": 2,
+                             "last_viewed": f"2024-03-{day:02d}T08:00:00"} for day in (1, 20)])
+    assert state["dates"] == [date(2024, 3, 10).toordinal()]
+    assert state["gaps"] == [0, 0.0, 0.0]
+
+    assert agg.to_dict()["dates"] == sorted(date(2024, 3, day).toordinal() for day in (1, 10, 20))
+    assert store.get(1, 1)["study_consistency_std"] == 0.5
+
+
+def test_user_aggregation_averages_every_feature():
+    rows = [
+        {col: 0.0 for col in FEATURES} | {"completed_modules": 10.0, "total_modules_viewed": 20.0},
+        {col: 0.0 for col in FEATURES} | {"completed_modules": 31.0, "total_modules_viewed": 41.0,
+                                          "retry_count": 3.0},
+    ]
+    features = aggregate_features(rows)
+
+    assert features["journeys"] == 2
+    # Hitungan modul dirata-rata lalu dibulatkan (20.5 -> 20, 30.5 -> 30)
+    assert features["completed_modules"] == 20.0
+    assert features["total_modules_viewed"] == 30.0
+    assert features["retry_count"] == 1.5
+
+
+def test_live_events_merge_with_csv_history(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, "live_features",
+                        IncrementalFeatureStore(snapshot_path=str(tmp_path / "live.json"),
+                                                history=main.feature_store.get))
+    client = TestClient(main.app)
+    client.post("/api/v1/features/reload")
+
+    user = int(pd.read_csv(main.feature_store.clustering_path, usecols=["developer_id"])["developer_id"].iloc[0])
+    csv_journeys = main.feature_store.get_journeys(user)
+    before = main.feature_store.get(user)
+    assert before["journeys"] == len(csv_journeys) > 1
+    existing = next(iter(csv_journeys))
+    new_journey = max(csv_journeys) + 1
+    completed = sum(row["completed_modules"] for row in csv_journeys.values())
+    journeys = before["journeys"] + 1
+
+    # Satu event untuk journey baru tidak boleh menyembunyikan histori CSV
+    client.post("/api/v1/features/events", json={"trackings": [
+        {"developer_id": user, "journey_id": new_journey, "tutorial_id": 1,
+         "last_viewed": "2024-03-01T10:00:00", "completed_at": "2024-03-01T11:00:00"}
+    ]})
+    merged = main._stored_features(user)
+    assert merged["journeys"] == journeys
+    # Level user memakai rata-rata per journey, bukan jumlah
+    assert merged["completed_modules"] == round((completed + 1) / journeys)
+
+    # Event untuk journey yang sudah ada menambah histori CSV journey itu
+    client.post("/api/v1/features/events", json={"trackings": [
+        {"developer_id": user, "journey_id": existing, "tutorial_id": 1,
+         "last_viewed": "2024-03-02T10:00:00"}
+    ]})
+    merged = main._stored_features(user)
+    assert merged["journeys"] == journeys
+    assert merged["completed_modules"] == round((completed + 1) / journeys)
+    assert (main._stored_features(user, existing)["total_modules_viewed"]
+            == csv_journeys[existing]["total_modules_viewed"] + 1)
+
+    response = client.post("/api/v1/pace/analyze", json={"user_id": user})
+    assert response.status_code == 200
+
+
+def test_first_event_extends_csv_history_of_existing_journey(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, "live_features",
+                        IncrementalFeatureStore(snapshot_path=str(tmp_path / "live.json"),
+                                                history=main.feature_store.get))
+    client = TestClient(main.app)
+    client.post("/api/v1/features/reload")
+
+    frame = pd.read_csv(main.feature_store.clustering_path, usecols=["developer_id", "journey_id"])
+    user, journey = (int(v) for v in frame.iloc[0])
+    before = main.feature_store.get(user, journey)
+    pace_before = client.post("/api/v1/pace/analyze",
+                              json={"user_id": user, "journey_id": journey}).json()
+
+    client.post("/api/v1/features/events", json={"trackings": [
+        {"developer_id": user, "journey_id": journey, "tutorial_id": 1,
+         "last_viewed": "2024-03-02T10:00:00"}
+    ]})
+    after = main._stored_features(user, journey)
+
+    assert after["completed_modules"] >= before["completed_modules"]
+    assert after["total_modules_viewed"] == before["total_modules_viewed"] + 1
+    for col in ("avg_exam_score", "completion_speed", "submission_fail_rate",
+                "retry_count", "study_consistency_std"):
+        np.testing.assert_allclose(after[col], before[col], err_msg=col)
+
+    pace_after = client.post("/api/v1/pace/analyze",
+                             json={"user_id": user, "journey_id": journey}).json()
+    assert pace_after["pace_label"] == pace_before["pace_label"]
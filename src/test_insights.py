@@ -0,0 +1,93 @@
+"""
+Test /api/v1/insights/{user_id}: persona dan pace berjalan bersamaan,
+advice dimulai setelah label pace diketahui.
+
+Run: python -m pytest src/test_insights.py
+"""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from services import persona_service, pace_service
+
+# User 7 tidak ada di feature store: semua fitur model dikirim lewat query
+QUERY_FEATURES = {
+    "avg_study_hour": 21, "study_consistency_std": 2.0, "completion_speed": 0.4,
+    "avg_exam_score": 88, "submission_fail_rate": 0.0, "retry_count": 0,
+    "completed_modules": 10, "total_modules_viewed": 12
+}
+
+
+def test_insights_runs_persona_and_pace_concurrently(monkeypatch):
+    def slow_persona(features_list):
+        time.sleep(0.2)
+        return persona_service.predict_batch(features_list)
+
+    def slow_pace(features_list):
+        time.sleep(0.2)
+        return pace_service.predict_batch(features_list)
+
+    advice_started = {}
+
+    async def fake_generate(**kwargs):
+        advice_started.update(kwargs)
+        await asyncio.sleep(0.1)
+        return f"Hai {kwargs['name']}!"
+
+    monkeypatch.setattr(main, "score_persona_batch", slow_persona)
+    monkeypatch.setattr(main.pace_batcher, "batch_fn", slow_pace)
+    monkeypatch.setattr(main.advice_service, "generate", fake_generate)
+
+    with TestClient(main.app) as client:
+        response = client.get("/api/v1/insights/7", params={
+            "user_name": "Rina", **QUERY_FEATURES
+        })
+
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["persona"]["persona_label"] == "The Night Owl"
+    assert body["learning_pace"]["pace_label"] == "fast learner"
+    assert body["personalized_advice"]["advice_text"] == "Hai Rina!"
+    assert advice_started["pace_label"] == "fast learner"
+
+    timings = body["timings_ms"]
+    assert set(timings) == {"persona", "pace", "advice", "total"}
+    # Persona (200 ms) tumpang tindih dengan pace (200 ms) + advice (100 ms)
+    assert timings["total"] < timings["persona"] + timings["pace"] + timings["advice"] - 100
+
+
+def test_insights_cancels_persona_when_advice_fails(monkeypatch):
+    persona_state = {}
+
+    async def slow_pool_run(fn, *args):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            persona_state["cancelled"] = True
+            raise
+        return fn(*args)
+
+    async def broken_generate(**kwargs):
+        raise RuntimeError("advice exploded")
+
+    monkeypatch.setattr(main.scoring_pool, "run", slow_pool_run)
+    monkeypatch.setattr(main.advice_service, "generate", broken_generate)
+
+    with TestClient(main.app) as client:
+        response = client.get("/api/v1/insights/7", params=QUERY_FEATURES)
+
+    assert response.status_code == 500
+    assert "advice exploded" in response.json()["detail"]
+    assert persona_state == {"cancelled": True}
+
+
+def test_insights_unknown_user_without_features_returns_404():
+    with TestClient(main.app) as client:
+        response = client.get("/api/v1/insights/7", params={"avg_study_hour": 21})
+
+    assert response.status_code == 404
+    assert "completion_speed" in response.json()["detail"]
@@ -0,0 +1,85 @@
+"""
+Test features.labeling: hasil vectorized harus sama dengan aturan if/else
+per baris dari notebook 06/07 dan loop percentile notebook 02, dan fallback
+rule-based API memakai aturan yang sama.
+
+Run: python -m pytest src/test_labeling.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from features import labeling
+from services import PaceService, PersonaService
+
+
+def assign_pace_label(row):
+    # Salinan notebooks/07_model3_pace_classification.ipynb (sebelum vectorized)
+    if row['completion_speed'] < 0.55:
+        return 'fast learner'
+    if row['completion_speed'] > 1.5:
+        return 'reflective learner'
+    return 'consistent learner'
+
+
+def assign_persona(row):
+    # Salinan notebooks/06_model1_persona_classification.ipynb (sebelum vectorized)
+    if row['avg_study_hour'] >= 19:
+        return 'The Night Owl'
+    if row['avg_exam_score'] < 60 and row['submission_fail_rate'] > 0.3:
+        return 'The Struggler'
+    if row['completion_speed'] < 0.5 and row['avg_exam_score'] >= 75:
+        return 'The Sprinter'
+    if row['completion_speed'] > 2.0 and row['avg_exam_score'] >= 70:
+        return 'The Deep Diver'
+    return 'The Consistent'
+
+
+def make_frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "journey_id": rng.integers(1, 30, n),
+        "study_duration": rng.integers(1, 200, n).astype(float),
+        "avg_study_hour": rng.uniform(0, 24, n),
+        "completion_speed": rng.uniform(0, 4, n),
+        "avg_exam_score": rng.uniform(0, 100, n),
+        "submission_fail_rate": rng.uniform(0, 1, n),
+    })
+    edge = rng.random(n) < 0.3
+    df.loc[edge, "completion_speed"] = rng.choice([0.5, 0.55, 1.5, 2.0], edge.sum())
+    df.loc[edge, "avg_exam_score"] = rng.choice([60, 70, 75], edge.sum())
+    df.loc[edge, "submission_fail_rate"] = 0.3
+    # Nilai batas dan NaN harus diperlakukan sama dengan if/else
+    df.loc[::97, "completion_speed"] = np.nan
+    df.loc[::89, "avg_study_hour"] = 19.0
+    return df
+
+
+def test_labels_match_row_by_row_rules():
+    df = make_frame()
+
+    assert labeling.assign_pace_labels(df).tolist() == df.apply(assign_pace_label, axis=1).tolist()
+    assert labeling.assign_persona_labels(df).tolist() == df.apply(assign_persona, axis=1).tolist()
+
+
+def test_speed_percentile_matches_loop():
+    df = make_frame()
+
+    expected = pd.Series(np.nan, index=df.index)
+    for journey_id in df['journey_id'].unique():
+        mask = df['journey_id'] == journey_id
+        expected[mask] = df.loc[mask, 'study_duration'].rank(pct=True) * 100
+
+    pd.testing.assert_series_equal(labeling.speed_percentile(df), expected, check_names=False)
+
+
+def test_service_fallback_uses_shared_rules():
+    df = make_frame(200, seed=1)
+    rows = df.to_dict("records")
+
+    pace = PaceService()._rule_based_batch(rows)
+    persona = PersonaService()._rule_based_batch(rows)
+
+    assert [r["label"] for r in pace] == labeling.assign_pace_labels(df).tolist()
+    assert [r["label"] for r in persona] == labeling.assign_persona_labels(df).tolist()
+    assert PaceService()._rule_based({"completion_speed": 0.2})["confidence"] == 0.80
@@ -0,0 +1,76 @@
+"""
+Test /api/v1/pace/batch in-process: campuran fitur di request dan lookup
+user_id, user yang tidak dikenal, dan request kosong.
+
+Run: python -m pytest src/test_pace_batch.py
+"""
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from feature_store import BASE_DIR, feature_store
+
+FEATURES = {
+    "completion_speed": 0.3,
+    "study_consistency_std": 25.0,
+    "avg_study_hour": 14.0,
+    "completed_modules": 50,
+    "total_modules_viewed": 60
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def known_user():
+    df = pd.read_csv(f"{BASE_DIR}/data/processed/clustering_features.csv", usecols=["developer_id"])
+    return int(df["developer_id"].iloc[0])
+
+
+def test_mixed_items_and_user_ids(client, known_user):
+    response = client.post("/api/v1/pace/batch", json={
+        "items": [
+            {"user_id": 1, "features": FEATURES},
+            {"user_id": 2, "features": {**FEATURES, "completion_speed": 2.0}},
+        ],
+        "user_ids": [known_user]
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_processed"] == 3
+    assert [r["user_id"] for r in body["results"]] == [1, 2, known_user]
+    assert body["results"][0]["pace_label"] == "fast learner"
+    assert body["results"][1]["pace_label"] == "reflective learner"
+
+    # Hasil lookup user_id sama dengan mengirim fitur yang tersimpan
+    stored = feature_store.get(known_user)
+    single = client.post("/api/v1/pace/analyze", json={
+        "user_id": known_user,
+        "features": {field: stored[field] for field in FEATURES}
+    }).json()
+    assert body["results"][2]["pace_label"] == single["pace_label"]
+    assert body["results"][2]["confidence"] == single["confidence"]
+
+
+def test_unknown_user_returns_404(client):
+    response = client.post("/api/v1/pace/batch", json={
+        "items": [{"user_id": 1, "features": FEATURES}],
+        "user_ids": [-1]
+    })
+
+    assert response.status_code == 404
+    assert "-1" in response.json()["detail"]
+
+
+def test_empty_request(client):
+    response = client.post("/api/v1/pace/batch", json={})
+
+    assert response.status_code == 200
+    assert response.json() == {"results": [], "total_processed": 0}
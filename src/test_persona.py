@@ -0,0 +1,71 @@
+"""
+Test PersonaService: hasil batch sama dengan pipeline sklearn asli
+(StandardScaler + RandomForest + IsolationForest).
+
+Run: python -m pytest src/test_persona.py
+"""
+
+import os
+
+import pandas as pd
+
+from services import PersonaService
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_service():
+    service = PersonaService()
+    assert service.load_model()
+    return service
+
+
+def test_batch_matches_sklearn_pipeline():
+    service = load_service()
+    df = pd.read_csv(os.path.join(BASE_DIR, "data", "processed", "clustering_features.csv"))
+    X = df[service.feature_cols].fillna(0)
+
+    results = service.predict_batch(X.to_dict("records"))
+
+    service.model.n_jobs = 1
+    expected_labels = service.label_encoder.inverse_transform(
+        service.model.predict(service.scaler.transform(X))
+    )
+    expected_outliers = service.outlier_detector.predict(X) == -1
+
+    assert [r["label"] for r in results] == list(expected_labels)
+    assert [r["is_outlier"] for r in results] == list(expected_outliers)
+    assert all(0.0 <= r["confidence"] <= 1.0 for r in results)
+
+
+def test_single_prediction_and_fallback():
+    service = load_service()
+    features = {
+        "avg_study_hour": 21.5, "study_consistency_std": 2.3, "completion_speed": 0.35,
+        "avg_exam_score": 78.5, "submission_fail_rate": 0.15, "retry_count": 1
+    }
+
+    result = service.predict(features)
+    assert result["label"] == "The Night Owl"
+    assert result["cluster_id"] == 2
+    assert result["characteristics"]
+
+    # Nilai tidak valid memakai kriteria rule-based
+    broken = dict(features, avg_exam_score=float("nan"), avg_study_hour=20)
+    assert service.predict(broken)["label"] == "The Night Owl"
+    assert service.predict(broken)["confidence"] == 0.70
+
+
+def test_fallback_cluster_id_uses_model_classes():
+    features = {
+        "avg_study_hour": float("nan"), "study_consistency_std": 2.3, "completion_speed": 3.0,
+        "avg_exam_score": 85.0, "submission_fail_rate": 0.1, "retry_count": 1
+    }
+
+    service = load_service()
+    result = service.predict(features)
+    assert result["confidence"] == 0.70
+    assert result["cluster_id"] == list(service._labels).index(result["label"])
+
+    # Tanpa model tidak ada kelas yang bisa dirujuk
+    assert PersonaService().predict(features)["cluster_id"] == -1
@@ -0,0 +1,77 @@
+"""
+Test features.raw_cache: workbook dikonversi sekali ke Parquet dan dibangun
+ulang hanya jika isi sumbernya berubah.
+
+Run: python -m pytest src/test_raw_cache.py
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("openpyxl")
+
+from features import raw_cache
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "exam_results.xlsx"
+    pd.DataFrame({
+        "id": [1, 2, 3],
+        "score": [68.0, 90.5, None],
+        "created_at": pd.to_datetime(["2020-04-14 08:57:50", "2020-04-15 10:00:00", None]),
+        "status": ["passed", "failed", None],
+    }).to_excel(path, index=False)
+    return path
+
+
+def test_cached_read_matches_excel_and_skips_reparse(workbook, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+    pd.testing.assert_frame_equal(first, pd.read_excel(workbook), check_dtype=False)
+    assert [p.name.startswith("exam_results-") for p in cache_dir.glob("*.parquet")] == [True]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Excel should not be parsed again")
+
+    monkeypatch.setattr(raw_cache.pd, "read_excel", fail)
+    second = raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+    pd.testing.assert_frame_equal(second, first)
+
+    # Hanya mtime berubah (isi sama): cache tetap dipakai
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert raw_cache.is_fresh(str(workbook), str(cache_dir))
+    raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+
+
+def test_changed_content_rebuilds_cache(workbook, tmp_path):
+    cache_dir = tmp_path / "cache"
+    raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+
+    pd.DataFrame({"id": [7], "score": [55.0]}).to_excel(workbook, index=False)
+    assert not raw_cache.is_fresh(str(workbook), str(cache_dir))
+
+    df = raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+    assert df["id"].tolist() == [7]
+    assert raw_cache.is_fresh(str(workbook), str(cache_dir))
+
+
+def test_same_name_in_different_directories(workbook, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    other = other_dir / workbook.name
+    pd.DataFrame({"id": [42], "score": [10.0]}).to_excel(other, index=False)
+
+    first = raw_cache.read_excel_cached(str(workbook), str(cache_dir))
+    second = raw_cache.read_excel_cached(str(other), str(cache_dir))
+    assert len(list(cache_dir.glob("*.parquet"))) == 2
+
+    # Kedua cache tetap segar dan tidak saling menimpa
+    monkeypatch.setattr(raw_cache.pd, "read_excel", lambda *a, **k: pytest.fail("re-parsed"))
+    pd.testing.assert_frame_equal(raw_cache.read_excel_cached(str(workbook), str(cache_dir)), first)
+    pd.testing.assert_frame_equal(raw_cache.read_excel_cached(str(other), str(cache_dir)), second)
@@ -0,0 +1,99 @@
+"""
+Test features.schema: dtype ringkas dan error untuk nilai yang tidak muat.
+
+Run: python -m pytest src/test_schema.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.schema import TABLES, apply_schema, load_table, memory_report, read_table
+
+
+def test_processed_table_uses_compact_dtypes():
+    df = read_table("clustering_features")
+
+    assert df["developer_id"].dtype == np.int32
+    assert df["avg_study_hour"].dtype == np.float32
+    assert isinstance(df["performance_level"].dtype, pd.CategoricalDtype)
+
+    original = pd.read_csv(TABLES["clustering_features"]["file"])
+    np.testing.assert_allclose(df["avg_study_hour"], original["avg_study_hour"], rtol=1e-6)
+    assert memory_report(df)["ratio"] > 1
+
+
+def test_load_table_prints_memory_report(capsys):
+    load_table("pace_features")
+    assert "smaller than default dtypes" in capsys.readouterr().out
+
+
+def test_nullable_int_and_dates():
+    df = pd.DataFrame({"id": [1.0, None], "status": [1, 0], "created_at": ["2021-01-02 03:04:05", "bad"]})
+    apply_schema(df, "users")
+
+    assert df["id"].dtype == "Int32"
+    assert df["created_at"].dtype == "datetime64[s]"
+    assert df["created_at"].isna().tolist() == [False, True]
+
+
+def test_int_overflow_raises():
+    df = pd.DataFrame({"developer_id": [1, 2**40]})
+    with pytest.raises(OverflowError, match="developer_id"):
+        apply_schema(df, "pace_features")
+
+
+def test_float_overflow_raises():
+    df = pd.DataFrame({"study_duration": [1.0, 1e300]})
+    with pytest.raises(OverflowError, match="study_duration"):
+        apply_schema(df, "pace_features")
+
+
+def test_unknown_category_raises():
+    df = pd.DataFrame({"speed_category": ["Fast (< 70%)", "Very Fast"]})
+    with pytest.raises(ValueError, match="Very Fast"):
+        apply_schema(df, "pace_features")
+
+
+def test_read_table_parses_with_compact_dtypes(tmp_path, monkeypatch):
+    path = tmp_path / "pace_features.csv"
+    pd.DataFrame({
+        "developer_id": [1, 2], "journey_id": [3, 4], "completion_speed": [0.5, 1.5],
+        "speed_category": ["Fast (< 70%)", "Slow (> 130%)"], "note": ["a", "b"],
+    }).to_csv(path, index=False)
+
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *a, **k: calls.append(k) or read_csv(*a, **k))
+    df = read_table("pace_features", str(path), usecols=lambda c: c != "note")
+
+    # Metrik dan kategori sudah bertipe saat parsing, bukan dikonversi setelahnya
+    assert calls[-1]["dtype"] == {"completion_speed": np.float32, "speed_category": "category"}
+    assert df["completion_speed"].dtype == np.float32
+    assert df["speed_category"].dtype == TABLES["pace_features"]["dtypes"]["speed_category"]
+    assert df["developer_id"].dtype == np.int32
+    assert "note" not in df.columns
+
+
+@pytest.mark.filterwarnings("ignore:overflow encountered in cast")
+def test_read_table_detects_overflow_after_parsing(tmp_path):
+    path = tmp_path / "pace_features.csv"
+    path.write_text("developer_id,study_duration\n1,inf\n2,1.5\n")
+    assert np.isinf(read_table("pace_features", str(path))["study_duration"].iloc[0])
+
+    path.write_text("developer_id,study_duration\n1,1e300\n")
+    with pytest.raises(OverflowError, match="study_duration"):
+        read_table("pace_features", str(path))
+
+    path.write_text("developer_id,study_duration\n3000000000,1.0\n")
+    with pytest.raises(OverflowError, match="developer_id"):
+        list(read_table("pace_features", str(path), chunksize=1))
+
+
+def test_read_table_parses_dates(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("id,created_at\n1,2021-01-02 03:04:05\n2,\n")
+    df = read_table("users", str(path))
+
+    assert df["created_at"].dtype == "datetime64[s]"
+    assert df["created_at"].isna().tolist() == [False, True]
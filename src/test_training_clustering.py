@@ -0,0 +1,135 @@
+"""
+Test training.clustering: grid paralel, silhouette sampel ber-seed dan
+paket model yang kompatibel dengan clustering_model_production.pkl.
+
+Run: python -m pytest src/test_training_clustering.py
+"""
+
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_blobs
+from sklearn.metrics import silhouette_score
+
+from training import clustering
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_sampled_silhouette_is_seeded():
+    X, labels = make_blobs(n_samples=3000, centers=4, random_state=0)
+
+    first = clustering.score_clusters(X, labels, sample_size=500, seed=7)
+    second = clustering.score_clusters(X, labels, sample_size=500, seed=7)
+
+    assert first == second
+    assert abs(first["silhouette"] - silhouette_score(X, labels)) < 0.05
+
+
+def test_assign_personas_uses_each_cluster_once():
+    centers = pd.DataFrame({
+        "avg_study_hour": [21, 10, 11, 12, 13],
+        "study_consistency_std": [5, 5, 5, 5, 1],
+        "completion_speed": [1.0, 0.2, 1.0, 4.0, 1.0],
+        "avg_exam_score": [80, 95, 40, 90, 80],
+        "submission_fail_rate": [0.1, 0.0, 0.8, 0.1, 0.1],
+        "retry_count": [1, 1, 3, 1, 1],
+    })
+
+    mapping = clustering.assign_personas(centers)
+
+    assert mapping == {0: "The Night Owl", 1: "The Sprinter", 2: "The Struggler",
+                       3: "The Deep Diver", 4: "The Consistent"}
+
+
+def test_run_writes_grid_and_production_model(tmp_path):
+    result = clustering.run(
+        os.path.join(BASE_DIR, "data", "processed", "clustering_features.csv"),
+        models_dir=str(tmp_path), output_dir=str(tmp_path),
+        scalers=["RobustScaler", "StandardScaler"], k_values=[2, 5], mode="minibatch",
+        n_init=2, max_iter=50, silhouette_sample=500, workers=2,
+    )
+
+    grid = pd.read_csv(tmp_path / "clustering_model_selection.csv")
+    assert len(grid) == 4
+    assert grid["selected"].sum() == 1
+    assert grid["silhouette"].notna().all()
+
+    package = joblib.load(tmp_path / "clustering_model_production.pkl")
+    assert set(package) >= {"scaler", "clustering_model", "persona_mapping",
+                            "feature_columns", "outlier_detector", "model_metadata"}
+    assert sorted(package["persona_mapping"]) == [0, 1, 2, 3, 4]
+    assert len(set(package["persona_mapping"].values())) == 5
+    assert package["model_metadata"]["scaler_type"] == result["scaler"]
+
+    X = pd.DataFrame(np.zeros((1, len(package["feature_columns"]))), columns=package["feature_columns"])
+    assert package["outlier_detector"].predict(X).shape == (1,)
+    assert (tmp_path / "clustering_results.csv").exists()
+
+
+def make_package(seed=0):
+    from sklearn.cluster import KMeans
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    X, _ = make_blobs(n_samples=600, centers=3, n_features=2, cluster_std=0.5, random_state=seed)
+    X = pd.DataFrame(X, columns=["a", "b"])
+    scaler = StandardScaler().fit(X)
+    model = KMeans(n_clusters=3, n_init=5, random_state=0).fit(scaler.transform(X))
+    package = {
+        "scaler": scaler, "clustering_model": model, "feature_columns": ["a", "b"],
+        "persona_mapping": {0: "The Sprinter", 1: "The Night Owl", 2: "The Struggler"},
+        "outlier_detector": IsolationForest(contamination=0.01, random_state=0).fit(X),
+        "model_metadata": {},
+    }
+    return package, X
+
+
+def test_online_update_keeps_personas_and_tracks_drift():
+    from sklearn.cluster import MiniBatchKMeans
+    from training.online_clustering import update_model
+
+    package, X = make_package()
+    old_centers = package["clustering_model"].cluster_centers_.copy()
+    mapping = dict(package["persona_mapping"])
+
+    report = update_model(package, X.sample(200, random_state=1), batch_size=64)
+
+    assert isinstance(package["clustering_model"], MiniBatchKMeans)
+    assert package["persona_mapping"] == mapping
+    assert report["used"] + report["outliers"] == 200
+    assert report["max_drift"] < 0.05
+    np.testing.assert_allclose(package["clustering_model"].cluster_centers_, old_centers, atol=0.1)
+
+    # Update kedua melanjutkan state partial_fit yang sama
+    shifted = X + 0.3
+    report = update_model(package, shifted, batch_size=64)
+    assert report["max_drift"] > 0
+    assert len(package["model_metadata"]["online_updates"]) == 2
+
+
+def test_match_centroids_follows_permutation():
+    from training.online_clustering import match_centroids
+
+    old = np.array([[0.0, 0.0], [5.0, 5.0], [10.0, 0.0]])
+    new = old[[2, 0, 1]] + 0.1
+
+    assert match_centroids(old, new).tolist() == [1, 2, 0]
+
+
+def test_online_run_saves_atomically(tmp_path):
+    from training import online_clustering
+
+    package, X = make_package()
+    model_path = tmp_path / "clustering_model_production.pkl"
+    joblib.dump(package, model_path)
+    X.to_csv(tmp_path / "new.csv", index=False)
+
+    online_clustering.run(str(tmp_path / "new.csv"), str(model_path), dry_run=True)
+    assert "online_updates" not in joblib.load(model_path)["model_metadata"]
+
+    online_clustering.run(str(tmp_path / "new.csv"), str(model_path))
+    assert len(joblib.load(model_path)["model_metadata"]["online_updates"]) == 1
+    assert sorted(os.listdir(tmp_path)) == ["clustering_model_production.pkl", "new.csv"]
@@ -0,0 +1,131 @@
+"""
+Test training.pace: artifact harus bisa dimuat PaceService seperti
+pace_classifier.pkl dari notebook 07, dengan metadata training.
+
+Run: python -m pytest src/test_training_pace.py
+"""
+
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import services
+from features.labeling import assign_pace_labels, pace_labels
+from training import pace
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+
+
+def test_training_writes_artifact_with_metadata(tmp_path, monkeypatch):
+    output = tmp_path / "pace_classifier.pkl"
+    pace.run(os.path.join(PROCESSED_DIR, "pace_features.csv"),
+             os.path.join(PROCESSED_DIR, "pace_analysis_results.csv"),
+             str(output), n_estimators=20, n_jobs=2, cv=3, compact_path=str(tmp_path / "pace_rules.json"))
+
+    package = joblib.load(output)
+    assert set(package) >= {"model", "scaler", "label_encoder", "feature_columns", "pace_mapping"}
+    assert list(package["label_encoder"].classes_) == ["consistent learner", "fast learner", "reflective learner"]
+
+    metadata = package["model_metadata"]
+    assert metadata["test_accuracy"] > 0.9
+    assert set(metadata["data_sha256"]) == {"pace_features.csv", "pace_analysis_results.csv"}
+    assert metadata["training_time_s"] > 0
+    assert set(metadata["latency"]) == {"sklearn", "compiled", "compact"}
+    assert metadata["latency"]["compiled"]["single"]["p50_ms"] > 0
+    assert sorted(os.listdir(tmp_path)) == ["pace_classifier.pkl", "pace_rules.json"]
+
+    rules = json.loads((tmp_path / "pace_rules.json").read_text())
+    assert rules["source"] == "rules"
+    assert rules["metadata"]["accuracy"] == 1.0
+    assert rules["metadata"]["agreement_with_forest"] > 0.95
+    assert rules["metadata"]["size_bytes"] * 10 < rules["metadata"]["forest_size_bytes"]
+
+    monkeypatch.setattr(services, "MODELS_DIR", str(tmp_path))
+    service = services.PaceService()
+    assert service.load_model()
+    assert service.predict({"completion_speed": 0.3, "study_consistency_std": 5.0, "avg_study_hour": 14.0,
+                            "completed_modules": 50, "total_modules_viewed": 60})["label"] == "fast learner"
+
+
+def test_dataset_uses_shared_labels():
+    df = pace.load_dataset(os.path.join(PROCESSED_DIR, "pace_features.csv"),
+                           os.path.join(PROCESSED_DIR, "pace_analysis_results.csv"))
+
+    assert len(df) == len(pd.read_csv(os.path.join(PROCESSED_DIR, "pace_features.csv")))
+    assert df["pace_label"].tolist() == assign_pace_labels(df).tolist()
+    assert df[pace.SCORE_COLUMNS].notna().all().all()
+
+
+def test_compiled_rules_match_labeling_exactly():
+    classes = ["consistent learner", "fast learner", "reflective learner"]
+    forest = pace.compile_rules(classes)
+
+    speeds = np.array([0.0, 0.3, np.nextafter(0.55, 0), 0.55, np.nextafter(0.55, 1), 1.0,
+                       np.nextafter(1.5, 0), 1.5, np.nextafter(1.5, 2), 3.0, -1.0, 1e9])
+    speeds = np.concatenate([speeds, np.random.default_rng(0).uniform(0, 3, 2000)])
+    X = np.zeros((len(speeds), len(pace.FEATURE_COLUMNS)))
+    X[:, pace.FEATURE_COLUMNS.index("completion_speed")] = speeds
+
+    assert forest.predict(X).tolist() == pace_labels(speeds).tolist()
+
+
+def test_tree_compact_model(tmp_path):
+    df = pace.load_dataset(os.path.join(PROCESSED_DIR, "pace_features.csv"),
+                           os.path.join(PROCESSED_DIR, "pace_analysis_results.csv"))
+    package, split = pace.train(df, n_estimators=10, n_jobs=1, cv=2)
+    forest, artifact = pace.build_compact(package, split, "tree", max_depth=2)
+
+    assert artifact["source"] == "tree"
+    assert artifact["metadata"]["n_nodes"] <= 7
+    assert artifact["metadata"]["accuracy"] > 0.95
+    assert set(forest.classes_) == set(package["label_encoder"].classes_)
+
+
+def test_pace_service_rules_engine(tmp_path, monkeypatch):
+    forest = pace.compile_rules(["consistent learner", "fast learner", "reflective learner"])
+    pace.write_json_atomic({"format_version": pace.COMPACT_FORMAT_VERSION, "source": "rules",
+                            "feature_columns": pace.FEATURE_COLUMNS, "forest": forest.to_dict()},
+                           str(tmp_path / "pace_rules.json"))
+    monkeypatch.setattr(services, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(services, "PACE_MODEL", "rules")
+
+    service = services.PaceService()
+    assert service.load_model()
+    assert service.scaler is None
+
+    rows = [{"completion_speed": speed, "study_consistency_std": 5.0, "avg_study_hour": 14.0,
+             "completed_modules": 50, "total_modules_viewed": 60} for speed in (0.3, 0.55, 1.5, 2.0)]
+    labels = ["fast learner", "consistent learner", "consistent learner", "reflective learner"]
+    assert [service.predict(row)["label"] for row in rows] == labels
+    assert [result["label"] for result in service.predict_batch(rows)] == labels
+
+    # Confidence sama dengan fallback rule-based, bukan proba one-hot 1.0
+    expected = [services.PaceService.RULE_CONFIDENCE[label] for label in labels]
+    assert [service.predict(row)["confidence"] for row in rows] == expected
+    assert [result["confidence"] for result in service.predict_batch(rows)] == expected
+
+
+def test_pace_service_rules_engine_falls_back_to_forest(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(BASE_DIR, "models", "pace_classifier.pkl"), tmp_path)
+    monkeypatch.setattr(services, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(services, "PACE_MODEL", "rules")
+
+    service = services.PaceService()
+    assert service.load_model()
+    assert service.scaler is not None
+    # Fallback ke pkl tetap memakai forest terkompilasi
+    assert service._forest is not None and service._forest.n_trees > 1
+
+
+def test_rules_model_keeps_compiled_persona_forest(monkeypatch):
+    monkeypatch.setattr(services, "PACE_MODEL", "rules")
+
+    persona = services.PersonaService()
+    assert persona.load_model()
+    assert persona._forest is not None
+    assert persona._outliers is not None
@@ -0,0 +1,6 @@
+"""
+Training model dari data processed tanpa Jupyter (pengganti notebook 03-07).
+
+Setiap modul punya CLI sendiri, dijalankan dari folder src:
+    python -m training.clustering
+"""
@@ -0,0 +1,297 @@
+"""
+Model selection clustering (pengganti notebooks/03_model1_clustering_ADVANCED.ipynb).
+
+Langkah sama dengan notebook: seleksi fitur (korelasi > 0.8, variance < 0.01),
+buang outlier dengan IsolationForest, lalu grid scaler x K. Bedanya:
+- setiap kombinasi (scaler, K) dijalankan di process pool terpisah;
+- mode "minibatch" memakai MiniBatchKMeans untuk data besar;
+- silhouette dihitung pada sampel acak dengan seed tetap (O(sample^2), bukan
+  O(n^2)); Calinski-Harabasz tetap dihitung penuh karena sudah O(n).
+
+Scaler terbaik = silhouette tertinggi di seluruh grid (seperti notebook), lalu
+model final dilatih dengan K=5 (kebutuhan bisnis 5 persona) dan cluster
+dipetakan ke persona berdasarkan pusat cluster. Hasil grid ditulis ke
+data/processed/clustering_model_selection.csv dan model ke
+models/clustering_model_production.pkl (atomik).
+
+Run (dari folder src):
+    python -m training.clustering
+    python -m training.clustering --mode minibatch --silhouette-sample 5000 --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.ensemble import IsolationForest
+from sklearn.metrics import calinski_harabasz_score, silhouette_score
+from sklearn.preprocessing import PowerTransformer, RobustScaler, StandardScaler
+
+from features.schema import load_table
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+
+FEATURE_COLUMNS = [
+    "avg_study_hour", "study_consistency_std", "completion_speed",
+    "avg_exam_score", "submission_fail_rate", "retry_count",
+]
+
+SCALERS = {
+    "PowerTransformer": lambda: PowerTransformer(method="yeo-johnson", standardize=True),
+    "RobustScaler": RobustScaler,
+    "StandardScaler": StandardScaler,
+}
+
+CORRELATION_THRESHOLD = 0.8
+MIN_VARIANCE = 0.01
+OUTLIER_CONTAMINATION = 0.05
+FINAL_K = 5
+DEFAULT_SILHOUETTE_SAMPLE = 10_000
+
+
+# ============================================================
+# FEATURE SELECTION & OUTLIER (sama dengan notebook)
+# ============================================================
+
+def select_features(X: pd.DataFrame):
+    """Buang fitur kedua dari pasangan berkorelasi tinggi dan fitur ber-variance rendah"""
+    corr = X.corr().to_numpy()
+    columns = list(X.columns)
+    dropped = []
+    for i in range(len(columns)):
+        for j in range(i + 1, len(columns)):
+            if abs(corr[i, j]) > CORRELATION_THRESHOLD and columns[j] not in dropped:
+                dropped.append(columns[j])
+    X = X.drop(columns=dropped)
+
+    variance = X.var()
+    low_variance = variance[variance < MIN_VARIANCE].index.tolist()
+    return X.drop(columns=low_variance), dropped + low_variance
+
+
+def remove_outliers(X: pd.DataFrame, seed: int = 42):
+    detector = IsolationForest(contamination=OUTLIER_CONTAMINATION, random_state=seed)
+    inliers = detector.fit_predict(X) == 1
+    return inliers, detector
+
+
+# ============================================================
+# GRID
+# ============================================================
+
+def make_model(k: int, mode: str, n_init: int, max_iter: int, seed: int):
+    if mode == "minibatch":
+        return MiniBatchKMeans(n_clusters=k, init="k-means++", n_init=n_init, max_iter=max_iter,
+                               batch_size=4096, random_state=seed)
+    return KMeans(n_clusters=k, init="k-means++", n_init=n_init, max_iter=max_iter, random_state=seed)
+
+
+def score_clusters(X: np.ndarray, labels: np.ndarray, sample_size: Optional[int], seed: int) -> dict:
+    """Silhouette (sampel acak ber-seed jika n > sample_size) dan Calinski-Harabasz"""
+    if len(np.unique(labels)) < 2:
+        return {"silhouette": np.nan, "calinski_harabasz": np.nan}
+    sample = sample_size if sample_size and len(X) > sample_size else None
+    return {
+        "silhouette": float(silhouette_score(X, labels, sample_size=sample, random_state=seed)),
+        "calinski_harabasz": float(calinski_harabasz_score(X, labels)),
+    }
+
+
+def _fit_candidate(task: dict) -> dict:
+    """Satu sel grid; dijalankan di worker process"""
+    started = time.perf_counter()
+    model = make_model(task["k"], task["mode"], task["n_init"], task["max_iter"], task["seed"])
+    labels = model.fit_predict(task["X"])
+    fitted = time.perf_counter()
+    scores = score_clusters(task["X"], labels, task["silhouette_sample"], task["seed"])
+
+    return {
+        "scaler": task["scaler"],
+        "k": task["k"],
+        "inertia": float(model.inertia_),
+        **scores,
+        "fit_s": round(fitted - started, 3),
+        "score_s": round(time.perf_counter() - fitted, 3),
+    }
+
+
+def run_grid(X: pd.DataFrame, scalers: List[str], k_values: List[int], mode: str = "kmeans",
+             n_init: int = 50, max_iter: int = 500, silhouette_sample: Optional[int] = DEFAULT_SILHOUETTE_SAMPLE,
+             seed: int = 42, workers: Optional[int] = None) -> pd.DataFrame:
+    """Evaluasi semua kombinasi scaler x K secara paralel; satu baris per kombinasi"""
+    tasks = []
+    for name in scalers:
+        X_scaled = SCALERS[name]().fit_transform(X)
+        for k in k_values:
+            tasks.append({
+                "scaler": name, "k": k, "X": X_scaled, "mode": mode, "n_init": n_init,
+                "max_iter": max_iter, "silhouette_sample": silhouette_sample, "seed": seed,
+            })
+
+    if workers == 1:
+        rows = [_fit_candidate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_fit_candidate, tasks))
+
+    for row in rows:
+        print(f"   {row['scaler']:<17} K={row['k']}: Silhouette={row['silhouette']:.4f}, "
+              f"CH={row['calinski_harabasz']:.2f} ({row['fit_s'] + row['score_s']:.2f}s)")
+    return pd.DataFrame(rows)
+
+
+def best_scaler(grid: pd.DataFrame) -> str:
+    """Scaler dengan silhouette tertinggi di seluruh K"""
+    return grid.loc[grid["silhouette"].idxmax(), "scaler"]
+
+
+# ============================================================
+# PERSONA MAPPING (sama dengan notebook)
+# ============================================================
+
+def assign_personas(centers: pd.DataFrame) -> Dict[int, str]:
+    """
+    Petakan setiap cluster ke satu persona berdasarkan pusat cluster (skala
+    asli). Persona dipilih berurutan; cluster yang sudah dipakai tidak dipilih lagi.
+    """
+    means = centers.mean()
+
+    criteria = [
+        ("The Night Owl", lambda c: c["avg_study_hour"] + (100 if c["avg_study_hour"] >= 19 else 0)),
+        ("The Sprinter", lambda c: (means["completion_speed"] - c["completion_speed"]) * 10 + c["avg_exam_score"]),
+        ("The Struggler", lambda c: c["submission_fail_rate"] * 50 + (100 - c["avg_exam_score"]) / 2
+                                    + c["retry_count"] * 5),
+        ("The Deep Diver", lambda c: c["completion_speed"] * 5 + c["avg_exam_score"]),
+        ("The Consistent", lambda c: -c["study_consistency_std"]),
+    ]
+
+    mapping = {}
+    for persona, score in criteria:
+        candidates = [c for c in centers.index if c not in mapping]
+        if not candidates:
+            break
+        best = max(candidates, key=lambda c: score(centers.loc[c]))
+        mapping[int(best)] = persona
+
+    for c in centers.index:
+        mapping.setdefault(int(c), "The Consistent")
+    return mapping
+
+
+def train_final(X: pd.DataFrame, scaler_name: str, k: int = FINAL_K, mode: str = "kmeans",
+                n_init: int = 100, max_iter: int = 1000, silhouette_sample: Optional[int] = DEFAULT_SILHOUETTE_SAMPLE,
+                seed: int = 42):
+    scaler = SCALERS[scaler_name]()
+    X_scaled = scaler.fit_transform(X)
+    model = make_model(k, mode, n_init, max_iter, seed)
+    labels = model.fit_predict(X_scaled)
+
+    centers = pd.DataFrame(scaler.inverse_transform(model.cluster_centers_), columns=X.columns)
+    return scaler, model, labels, centers, score_clusters(X_scaled, labels, silhouette_sample, seed)
+
+
+def dump_atomic(obj, path: str):
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def run(input_path: str = os.path.join(PROCESSED_DIR, "clustering_features.csv"),
+        models_dir: str = MODELS_DIR, output_dir: str = PROCESSED_DIR,
+        scalers: Optional[List[str]] = None, k_values: Optional[List[int]] = None,
+        mode: str = "kmeans", n_init: int = 50, max_iter: int = 500,
+        silhouette_sample: Optional[int] = DEFAULT_SILHOUETTE_SAMPLE, final_k: int = FINAL_K,
+        seed: int = 42, workers: Optional[int] = None) -> dict:
+    started = time.perf_counter()
+    df = load_table("clustering_features", input_path, compact_floats=False)
+
+    X, dropped = select_features(df[FEATURE_COLUMNS])
+    inliers, detector = remove_outliers(X, seed)
+    X_clean = X[inliers].reset_index(drop=True)
+    df_clean = df[inliers].reset_index(drop=True)
+    print(f"[OK] {len(X_clean)}/{len(X)} samples after outlier removal, features: {list(X_clean.columns)}")
+
+    grid = run_grid(X_clean, scalers or list(SCALERS), k_values or list(range(2, 8)), mode,
+                    n_init, max_iter, silhouette_sample, seed, workers)
+    scaler_name = best_scaler(grid)
+    grid_s = time.perf_counter() - started
+    print(f"[OK] Grid of {len(grid)} models in {grid_s:.2f}s, best scaler: {scaler_name}")
+
+    # Model final memakai n_init/max_iter notebook (2x grid)
+    scaler, model, labels, centers, scores = train_final(
+        X_clean, scaler_name, final_k, mode, n_init * 2, max_iter * 2, silhouette_sample, seed
+    )
+    mapping = assign_personas(centers)
+
+    production_model = {
+        "scaler": scaler,
+        "clustering_model": model,
+        "persona_mapping": mapping,
+        "feature_columns": list(X_clean.columns),
+        "outlier_detector": detector,
+        "model_metadata": {
+            "scaler_type": scaler_name,
+            "n_clusters": final_k,
+            "silhouette_score": scores["silhouette"],
+            "calinski_harabasz": scores["calinski_harabasz"],
+            "features_dropped": dropped,
+            "outliers_removed": int((~inliers).sum()),
+            "n_samples": len(X_clean),
+            "mode": mode,
+            "silhouette_sample": silhouette_sample,
+            "seed": seed,
+        },
+    }
+
+    os.makedirs(models_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(models_dir, "clustering_model_production.pkl")
+    dump_atomic(production_model, model_path)
+
+    grid_path = os.path.join(output_dir, "clustering_model_selection.csv")
+    grid.assign(selected=(grid["scaler"] == scaler_name) & (grid["k"] == final_k)).to_csv(grid_path, index=False)
+
+    df_clean["cluster"] = labels
+    df_clean["persona"] = df_clean["cluster"].map(mapping)
+    df_clean[["developer_id", "cluster", "persona"] + list(X_clean.columns)].to_csv(
+        os.path.join(output_dir, "clustering_results.csv"), index=False
+    )
+
+    print(f"[OK] Saved {model_path} (K={final_k}, silhouette={scores['silhouette']:.4f}, "
+          f"CH={scores['calinski_harabasz']:.2f}) in {time.perf_counter() - started:.2f}s")
+    return {"grid": grid, "scaler": scaler_name, "model_path": model_path, "persona_mapping": mapping}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid scaler x K untuk model clustering persona")
+    parser.add_argument("--input", default=os.path.join(PROCESSED_DIR, "clustering_features.csv"))
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--output-dir", default=PROCESSED_DIR)
+    parser.add_argument("--scalers", nargs="+", choices=list(SCALERS), default=list(SCALERS))
+    parser.add_argument("--k-min", type=int, default=2)
+    parser.add_argument("--k-max", type=int, default=7)
+    parser.add_argument("--mode", choices=["kmeans", "minibatch"], default="kmeans")
+    parser.add_argument("--n-init", type=int, default=50)
+    parser.add_argument("--max-iter", type=int, default=500)
+    parser.add_argument("--silhouette-sample", type=int, default=DEFAULT_SILHOUETTE_SAMPLE,
+                        help="0 = silhouette penuh O(n^2)")
+    parser.add_argument("--final-k", type=int, default=FINAL_K)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="Default: jumlah CPU")
+    args = parser.parse_args()
+
+    run(args.input, args.models_dir, args.output_dir, args.scalers, list(range(args.k_min, args.k_max + 1)),
+        args.mode, args.n_init, args.max_iter, args.silhouette_sample or None, args.final_k,
+        args.seed, args.workers)
+
+
+if __name__ == "__main__":
+    main()
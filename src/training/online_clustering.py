@@ -0,0 +1,158 @@
+"""
+Update online cluster persona (tanpa refit penuh notebook 03 / training.clustering).
+
+Baris fitur baru di-scale dengan scaler yang tersimpan, disaring dengan
+outlier detector yang sama, lalu dimasukkan ke MiniBatchKMeans.partial_fit.
+Saat model tersimpan masih KMeans biasa, MiniBatchKMeans dimulai dari
+centroid lama: partial_fit pertama menerima setiap centroid lama sebagai satu
+titik berbobot jumlah anggota cluster-nya, sehingga update berikutnya berupa
+rata-rata berjalan (data lama tidak "terlupa" oleh batch pertama).
+
+Setelah update, centroid baru dicocokkan ke centroid lama (Hungarian, jarak
+terkecil) agar persona_mapping tetap stabil, dan pergeseran setiap centroid
+dicatat di model_metadata["online_updates"]. Pergeseran dinyatakan relatif
+terhadap jarak ke centroid lama terdekat lainnya: rasio mendekati 0.5 berarti
+centroid sudah bergerak setengah jalan ke persona tetangga, tanda distribusi
+berubah dan sebaiknya jalankan training.clustering penuh.
+
+Run (dari folder src):
+    python -m training.online_clustering --input ../data/processed/new_features.csv
+"""
+
+import argparse
+import os
+import time
+from typing import Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import MiniBatchKMeans
+
+from features.schema import load_table
+
+from .clustering import MODELS_DIR, dump_atomic
+
+MODEL_PATH = os.path.join(MODELS_DIR, "clustering_model_production.pkl")
+
+# Rasio pergeseran centroid (terhadap jarak ke centroid tetangga) untuk peringatan
+DRIFT_WARN = 0.25
+DEFAULT_BATCH_SIZE = 1024
+
+
+def _to_online(model, seed: int) -> MiniBatchKMeans:
+    """Model yang sudah MiniBatchKMeans dipakai apa adanya (state partial_fit tersimpan)"""
+    if isinstance(model, MiniBatchKMeans):
+        return model
+    return MiniBatchKMeans(n_clusters=model.n_clusters, init=model.cluster_centers_, n_init=1,
+                           reassignment_ratio=0.0, random_state=seed)
+
+
+def _prior(model, n_samples: Optional[int]):
+    """Centroid lama sebagai titik berbobot (jumlah anggota cluster saat training)"""
+    k = model.n_clusters
+    labels = getattr(model, "labels_", None)
+    if labels is not None:
+        counts = np.bincount(labels, minlength=k).astype(np.float64)
+    else:
+        counts = np.full(k, (n_samples or k) / k, dtype=np.float64)
+    return model.cluster_centers_.copy(), np.maximum(counts, 1.0)
+
+
+def match_centroids(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """match[i] = index centroid baru yang paling sesuai dengan centroid lama i"""
+    cost = np.linalg.norm(old[:, None, :] - new[None, :, :], axis=2)
+    rows, cols = linear_sum_assignment(cost)
+    match = np.empty(len(old), dtype=int)
+    match[rows] = cols
+    return match
+
+
+def update_model(package: dict, X: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE,
+                 seed: int = 42) -> dict:
+    """
+    Terapkan baris fitur baru ke paket clustering_model_production (in-place).
+
+    Returns:
+        ringkasan update: jumlah baris dipakai/dibuang dan pergeseran centroid
+    """
+    columns = package["feature_columns"]
+    model = package["clustering_model"]
+    metadata = package.setdefault("model_metadata", {})
+
+    X = X[columns].replace([np.inf, -np.inf], np.nan).dropna()
+    n_input = len(X)
+    detector = package.get("outlier_detector")
+    if detector is not None and n_input:
+        X = X[detector.predict(X) == 1]
+
+    old_centers = model.cluster_centers_.copy()
+    report = {"rows": n_input, "used": len(X), "outliers": n_input - len(X)}
+    if len(X) == 0:
+        report.update({"drift": [0.0] * len(old_centers), "max_drift": 0.0})
+        return report
+
+    X_scaled = package["scaler"].transform(X)
+    online = _to_online(model, seed)
+    first = not hasattr(online, "cluster_centers_")
+
+    for start in range(0, len(X_scaled), batch_size):
+        batch = X_scaled[start:start + batch_size]
+        weights = np.ones(len(batch))
+        if first:
+            centers, counts = _prior(model, metadata.get("n_samples"))
+            batch = np.vstack([centers, batch])
+            weights = np.concatenate([counts, weights])
+            first = False
+        online.partial_fit(batch, sample_weight=weights)
+
+    # Persona mengikuti centroid lama yang paling dekat
+    match = match_centroids(old_centers, online.cluster_centers_)
+    mapping = package["persona_mapping"]
+    package["persona_mapping"] = {int(match[old]): mapping[old] for old in mapping}
+    package["clustering_model"] = online
+
+    distances = np.linalg.norm(old_centers[:, None, :] - old_centers[None, :, :], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    drift = np.linalg.norm(online.cluster_centers_[match] - old_centers, axis=1) / distances.min(axis=1)
+    report.update({"drift": [round(float(d), 6) for d in drift], "max_drift": float(drift.max())})
+
+    metadata["model_type"] = "MiniBatchKMeans"
+    metadata.setdefault("online_updates", []).append({"at": time.time(), **report})
+    return report
+
+
+def run(input_path: str, model_path: str = MODEL_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+        seed: int = 42, dry_run: bool = False) -> dict:
+    package = joblib.load(model_path)
+    report = update_model(package, load_table("clustering_features", input_path, compact_floats=False),
+                          batch_size, seed)
+
+    print(f"[OK] Online update: {report['used']}/{report['rows']} rows used "
+          f"({report['outliers']} outliers), max centroid drift {report['max_drift']:.4f}")
+    for cluster, persona in sorted(package["persona_mapping"].items()):
+        print(f"   Cluster {cluster} -> {persona}")
+    if report["max_drift"] > DRIFT_WARN:
+        print(f"[WARN] Centroid drift above {DRIFT_WARN}; consider a full retrain (python -m training.clustering)")
+
+    if not dry_run and report["used"]:
+        dump_atomic(package, model_path)
+        print(f"[OK] Saved {model_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update cluster persona dengan baris fitur baru (partial_fit)")
+    parser.add_argument("--input", required=True, help="CSV dengan kolom feature_columns model")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dry-run", action="store_true", help="Hitung drift tanpa menyimpan model")
+    args = parser.parse_args()
+
+    run(args.input, args.model, args.batch_size, args.seed, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
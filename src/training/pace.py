@@ -0,0 +1,383 @@
+"""
+Training pace classifier (pengganti notebooks/07_model3_pace_classification.ipynb).
+
+Langkah sama dengan notebook: gabung pace_features.csv dengan skor dari
+pace_analysis_results.csv, label dari features.labeling (aturan yang juga
+dipakai fallback API), split 80/20 stratified, StandardScaler lalu
+RandomForestClassifier. Random forest dilatih dengan n_jobs dan fold
+cross-validation dijalankan paralel.
+
+Artifact sama dengan notebook (model, scaler, label_encoder, pace_mapping,
+feature_columns, model_type) ditambah metadata: waktu training, sha256 data
+input dan hasil benchmark latency inference (sklearn dan CompiledForest yang
+dipakai API). File ditulis atomik.
+
+Selain forest, dibuat model ringkas models/pace_rules.json: satu tree kecil
+dalam format CompiledForest.to_dict yang bisa dipakai PaceService dengan
+PACE_MODEL=rules. Sumbernya:
+- "rules": kompilasi eksak threshold features.labeling (completion_speed
+  < 0.55 / > 1.5), label training memang berasal dari aturan ini;
+- "tree": DecisionTreeClassifier dangkal yang di-fit dari data training.
+Akurasi terhadap label dan kesesuaian dengan forest pada test set dicatat
+di metadata JSON.
+
+Run (dari folder src):
+    python -m training.pace
+    python -m training.pace --n-jobs 4 --output ../models/pace_classifier.pkl
+    python -m training.pace --compact tree --compact-depth 3
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import cross_val_score, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from features import labeling
+from features.labeling import assign_pace_labels
+from features.schema import load_table
+
+from .clustering import MODELS_DIR, PROCESSED_DIR, dump_atomic
+
+# CompiledForest ada di src/api (bukan package)
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+FEATURE_COLUMNS = [
+    "completion_speed", "study_consistency_std", "avg_study_hour",
+    "completed_modules", "total_modules_viewed",
+]
+SCORE_COLUMNS = ["fast_score", "consistent_score", "reflective_score"]
+COMPACT_FORMAT_VERSION = 1
+
+RF_PARAMS = {
+    "max_depth": 10,
+    "min_samples_split": 5,
+    "min_samples_leaf": 2,
+    "class_weight": "balanced",
+}
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_dataset(features_path: str, analysis_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    pace_features + skor pace_analysis_results (jika ada) + pace_label.
+    Metrik tetap float64 (compact_floats=False) agar label dan model sama
+    dengan hasil notebook; ID dan kategori memakai dtype ringkas.
+    """
+    df = load_table("pace_features", features_path, compact_floats=False)
+    if analysis_path and os.path.exists(analysis_path):
+        scores = load_table("pace_analysis_results", analysis_path, compact_floats=False,
+                            usecols=["developer_id", "journey_id"] + SCORE_COLUMNS)
+        df = df.merge(scores, on=["developer_id", "journey_id"], how="left")
+    for col in SCORE_COLUMNS:
+        df[col] = df[col].fillna(0) if col in df.columns else 0
+
+    df["pace_label"] = assign_pace_labels(df)
+    return df
+
+
+def _percentiles_ms(samples) -> dict:
+    samples = np.asarray(samples) * 1000
+    return {"p50_ms": round(float(np.percentile(samples, 50)), 4),
+            "p99_ms": round(float(np.percentile(samples, 99)), 4)}
+
+
+def benchmark_latency(model, scaler, X: pd.DataFrame, single_runs: int = 200, batch_rows: int = 1000,
+                      compact=None) -> dict:
+    """
+    Latency predict_proba satu baris dan satu batch, untuk sklearn dan CompiledForest.
+    Model ringkas (jika ada) diukur dengan nama "compact" pada fitur mentah.
+    """
+    X_raw = X.to_numpy(dtype=np.float64)
+    X_scaled = scaler.transform(X)
+
+    engines = {"sklearn": (model.predict_proba, X_scaled)}
+    try:
+        from forest import CompiledForest
+        engines["compiled"] = (CompiledForest.from_sklearn(model).predict_proba, X_scaled)
+    except ImportError:
+        pass
+    if compact is not None:
+        engines["compact"] = (compact.predict_proba, X_raw)
+
+    results = {}
+    for name, (predict_proba, X_input) in engines.items():
+        rows = X_input[np.arange(single_runs) % len(X_input)]
+        batch = X_input[np.arange(batch_rows) % len(X_input)]
+
+        single = []
+        for row in rows:
+            started = time.perf_counter()
+            predict_proba(row[None, :])
+            single.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        predict_proba(batch)
+        batch_s = time.perf_counter() - started
+
+        results[name] = {
+            "single": _percentiles_ms(single),
+            "batch_rows": batch_rows,
+            "batch_ms": round(batch_s * 1000, 3),
+            "batch_rows_per_s": round(batch_rows / batch_s) if batch_s > 0 else None,
+        }
+    return results
+
+
+def train(df: pd.DataFrame, n_estimators: int = 100, n_jobs: int = -1, cv: int = 5, seed: int = 42):
+    """Mengembalikan (artifact dict, split) - split = (X_train, X_test, y_train, y_test) tanpa scaling"""
+    X = df[FEATURE_COLUMNS].copy()
+    X = X.fillna(X.median())
+
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(df["pace_label"])
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=y)
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    started = time.perf_counter()
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=seed, n_jobs=n_jobs, **RF_PARAMS)
+    model.fit(X_train_scaled, y_train)
+    fit_s = time.perf_counter() - started
+
+    # Paralel di level fold; forest di dalam fold single-thread agar tidak oversubscribe
+    started = time.perf_counter()
+    cv_model = RandomForestClassifier(n_estimators=n_estimators, random_state=seed, n_jobs=1, **RF_PARAMS)
+    cv_scores = cross_val_score(cv_model, X_train_scaled, y_train, cv=cv, n_jobs=n_jobs)
+    cv_s = time.perf_counter() - started
+
+    train_acc = accuracy_score(y_train, model.predict(X_train_scaled))
+    test_acc = accuracy_score(y_test, model.predict(X_test_scaled))
+
+    return {
+        "model": model,
+        "scaler": scaler,
+        "label_encoder": label_encoder,
+        "pace_mapping": {i: label for i, label in enumerate(label_encoder.classes_)},
+        "feature_columns": FEATURE_COLUMNS,
+        "model_type": "classification",
+        "model_metadata": {
+            "algorithm": "RandomForestClassifier",
+            "n_estimators": n_estimators,
+            "training_accuracy": train_acc,
+            "test_accuracy": test_acc,
+            "cv_score_mean": float(cv_scores.mean()),
+            "cv_score_std": float(cv_scores.std()),
+            "n_classes": len(label_encoder.classes_),
+            "training_samples": len(X_train),
+            "fit_time_s": round(fit_s, 3),
+            "cv_time_s": round(cv_s, 3),
+            "n_jobs": n_jobs,
+            "seed": seed,
+        },
+    }, (X_train, X_test, y_train, y_test)
+
+
+# ============================================================
+# MODEL RINGKAS (PACE_MODEL=rules)
+# ============================================================
+
+def compile_rules(classes) -> "CompiledForest":
+    """
+    Aturan features.labeling sebagai satu tree 5 node pada fitur mentah:
+    speed < FAST -> fast, speed > REFLECTIVE -> reflective, sisanya consistent.
+    Traversal tree memakai x <= threshold, sehingga "< 0.55" menjadi
+    "<= float64 terbesar di bawah 0.55" dan perbandingan dilakukan di float64.
+    """
+    from forest import CompiledForest
+
+    classes = list(classes)
+    speed = FEATURE_COLUMNS.index("completion_speed")
+
+    def leaf(label):
+        value = [0.0] * len(classes)
+        value[classes.index(label)] = 1.0
+        return value
+
+    return CompiledForest(
+        feature=[speed, 0, speed, 0, 0],
+        threshold=[np.nextafter(labeling.PACE_FAST_MAX_SPEED, -np.inf), -2.0,
+                   labeling.PACE_REFLECTIVE_MIN_SPEED, -2.0, -2.0],
+        left=[1, 1, 3, 3, 4],
+        right=[2, 1, 4, 3, 4],
+        value=[leaf("fast learner"), leaf("fast learner"), leaf(labeling.PACE_DEFAULT),
+               leaf(labeling.PACE_DEFAULT), leaf("reflective learner")],
+        roots=[0],
+        depths=[2],
+        classes=classes,
+        n_features=len(FEATURE_COLUMNS),
+        float32_inputs=False,
+    )
+
+
+def fit_compact_tree(X_train: pd.DataFrame, y_train: np.ndarray, classes, max_depth: int = 2,
+                     seed: int = 42) -> "CompiledForest":
+    """Tree dangkal di-fit dari data training (fitur mentah, tanpa scaler)"""
+    from forest import CompiledForest
+
+    tree = DecisionTreeClassifier(max_depth=max_depth, random_state=seed).fit(X_train.to_numpy(), y_train)
+    forest = CompiledForest.from_sklearn(tree)
+    forest.classes_ = np.asarray(classes)[tree.classes_]
+    return forest
+
+
+def build_compact(package: dict, split, source: str = "rules", max_depth: int = 2, seed: int = 42):
+    """
+    Mengembalikan (CompiledForest, artifact JSON). Metadata artifact berisi akurasi
+    terhadap label dan kesesuaian dengan forest di test set.
+    """
+    X_train, X_test, y_train, y_test = split
+    classes = package["label_encoder"].classes_
+
+    if source == "rules":
+        compact = compile_rules(classes)
+    else:
+        compact = fit_compact_tree(X_train, y_train, classes, max_depth, seed)
+
+    predicted = compact.predict(X_test.to_numpy())
+    forest_predicted = package["label_encoder"].inverse_transform(
+        package["model"].predict(package["scaler"].transform(X_test))
+    )
+
+    return compact, {
+        "format_version": COMPACT_FORMAT_VERSION,
+        "source": source,
+        "feature_columns": FEATURE_COLUMNS,
+        "forest": compact.to_dict(),
+        "metadata": {
+            "test_samples": len(X_test),
+            "accuracy": float((predicted == classes[y_test]).mean()),
+            "forest_accuracy": float((forest_predicted == classes[y_test]).mean()),
+            "agreement_with_forest": float((predicted == forest_predicted).mean()),
+            "n_nodes": len(compact.left),
+            "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+    }
+
+
+def measure_load_time(load, path: str, runs: int = 5) -> float:
+    """Waktu load artifact tercepat dari beberapa percobaan (ms)"""
+    best = np.inf
+    for _ in range(runs):
+        started = time.perf_counter()
+        load(path)
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+def _load_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json_atomic(data: dict, path: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run(features_path: str = os.path.join(PROCESSED_DIR, "pace_features.csv"),
+        analysis_path: str = os.path.join(PROCESSED_DIR, "pace_analysis_results.csv"),
+        output_path: str = os.path.join(MODELS_DIR, "pace_classifier.pkl"),
+        n_estimators: int = 100, n_jobs: int = -1, cv: int = 5, seed: int = 42,
+        benchmark: bool = True, compact: Optional[str] = "rules",
+        compact_path: str = os.path.join(MODELS_DIR, "pace_rules.json"), compact_depth: int = 2) -> dict:
+    started = time.perf_counter()
+    df = load_dataset(features_path, analysis_path)
+    package, split = train(df, n_estimators, n_jobs, cv, seed)
+    X_test = split[1]
+    metadata = package["model_metadata"]
+
+    metadata["training_time_s"] = round(time.perf_counter() - started, 3)
+    metadata["data_sha256"] = {
+        os.path.basename(path): file_sha256(path)
+        for path in (features_path, analysis_path) if path and os.path.exists(path)
+    }
+    metadata["trained_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    metadata["sklearn_version"] = sklearn.__version__
+    compact_model = None
+    if compact:
+        compact_model, compact_artifact = build_compact(package, split, compact, compact_depth, seed)
+    if benchmark:
+        metadata["latency"] = benchmark_latency(package["model"], package["scaler"], X_test,
+                                                compact=compact_model)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    dump_atomic(package, output_path)
+
+    print(f"[OK] Pace classifier trained in {metadata['training_time_s']:.2f}s "
+          f"(fit {metadata['fit_time_s']:.2f}s, {cv}-fold CV {metadata['cv_time_s']:.2f}s)")
+    print(f"   Test accuracy {metadata['test_accuracy']:.4f}, "
+          f"CV {metadata['cv_score_mean']:.4f} (+/- {metadata['cv_score_std'] * 2:.4f})")
+    for engine, result in metadata.get("latency", {}).items():
+        print(f"   {engine:<8} single p50 {result['single']['p50_ms']:.3f}ms, "
+              f"p99 {result['single']['p99_ms']:.3f}ms, batch {result['batch_rows']} rows {result['batch_ms']:.2f}ms")
+    print(f"[OK] Saved {output_path}")
+
+    if compact_model is not None:
+        info = compact_artifact["metadata"]
+        if "latency" in metadata:
+            info["latency"] = metadata["latency"]["compact"]
+        os.makedirs(os.path.dirname(os.path.abspath(compact_path)), exist_ok=True)
+        write_json_atomic(compact_artifact, compact_path)
+        info["size_bytes"] = os.path.getsize(compact_path)
+        info["load_ms"] = measure_load_time(_load_json, compact_path)
+        info["forest_size_bytes"] = os.path.getsize(output_path)
+        info["forest_load_ms"] = measure_load_time(joblib.load, output_path)
+        write_json_atomic(compact_artifact, compact_path)
+
+        print(f"[OK] Saved {compact_path} ({compact}, {info['n_nodes']} nodes)")
+        print(f"   Accuracy {info['accuracy']:.4f} (forest {info['forest_accuracy']:.4f}), "
+              f"agreement with forest {info['agreement_with_forest']:.4f}")
+        print(f"   Size {info['size_bytes']} vs {info['forest_size_bytes']} bytes, "
+              f"load {info['load_ms']:.3f}ms vs {info['forest_load_ms']:.3f}ms")
+    return package
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training pace classifier (RandomForest)")
+    parser.add_argument("--features", default=os.path.join(PROCESSED_DIR, "pace_features.csv"))
+    parser.add_argument("--analysis", default=os.path.join(PROCESSED_DIR, "pace_analysis_results.csv"))
+    parser.add_argument("--output", default=os.path.join(MODELS_DIR, "pace_classifier.pkl"))
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="-1 = semua CPU")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-benchmark", action="store_true")
+    parser.add_argument("--compact", choices=["rules", "tree", "none"], default="rules",
+                        help="Sumber model ringkas pace_rules.json")
+    parser.add_argument("--compact-output", default=os.path.join(MODELS_DIR, "pace_rules.json"))
+    parser.add_argument("--compact-depth", type=int, default=2, help="Kedalaman tree untuk --compact tree")
+    args = parser.parse_args()
+
+    run(args.features, args.analysis, args.output, args.n_estimators, args.n_jobs, args.cv,
+        args.seed, not args.no_benchmark, None if args.compact == "none" else args.compact,
+        args.compact_output, args.compact_depth)
+
+
+if __name__ == "__main__":
+    main()